@@ -72,6 +72,7 @@ export async function POST(req: NextRequest) {
       estimated_duration,
       success_probability,
       source_repo: rawSourceRepo,
+      instruction_graph,
     } = body;
 
     if (!rule_set_id || !assignment_plan) {
@@ -271,6 +272,7 @@ export async function POST(req: NextRequest) {
         execution_id,
         rule_set_id,
         assignment_plan: normalizedAssignmentPlan,
+        instruction_graph: Array.isArray(instruction_graph) ? instruction_graph : undefined,
       })
         .then(({ result }) => {
           applyTemporalExecutionResult({
@@ -8,12 +8,23 @@ export interface TemporalAssignment {
   estimated_cost: number
   estimated_duration: number
   status?: string
+  dependencies?: string[]
 }
 
+export interface TemporalExecutionInstructionNode {
+  id: string
+  dependencies?: string[]
+}
+
+export type TemporalLatencyProfile = "none" | "fixed" | "realistic"
+
 export interface TemporalExecutionPayload {
   execution_id: string
   rule_set_id: string
   assignment_plan: TemporalAssignment[]
+  instruction_graph?: TemporalExecutionInstructionNode[]
+  max_parallelism?: number
+  latency_profile?: TemporalLatencyProfile
 }
 
 export interface TemporalExecutionTaskResult {
@@ -24,6 +35,7 @@ export interface TemporalExecutionTaskResult {
   actual_cost: number
   estimated_duration: number
   actual_duration: number
+  latency_profile?: TemporalLatencyProfile
 }
 
 export interface TemporalExecutionResult {
@@ -33,6 +45,9 @@ export interface TemporalExecutionResult {
   tasks: TemporalExecutionTaskResult[]
   actual_cost: number
   actual_duration: number
+  critical_path_duration?: number
+  max_parallelism?: number
+  latency_profile?: TemporalLatencyProfile
   task_count: number
 }
 
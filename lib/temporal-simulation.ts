@@ -3,6 +3,7 @@ import { spawnSync } from "node:child_process"
 import { existsSync } from "node:fs"
 import net from "node:net"
 import path from "node:path"
+import type { TemporalLatencyProfile } from "@/lib/temporal-execution"
 
 export interface TemporalSimulationInstructionNode {
   id: string
@@ -21,11 +22,16 @@ export interface TemporalSimulationAssignment {
   status?: string
 }
 
+export type TemporalSimulationExecutionMode = "serial" | "pipelined"
+
 export interface TemporalSimulationPayload {
   simulation_id: string
   rule_set_id: string
   instruction_graph: TemporalSimulationInstructionNode[]
   assignment_plan: TemporalSimulationAssignment[]
+  execution_mode?: TemporalSimulationExecutionMode
+  max_in_flight?: number
+  latency_profile?: TemporalLatencyProfile
   artifact_candidates?: Array<{
     type: string
     language?: string
@@ -49,12 +55,15 @@ export interface TemporalSimulationTaskResult {
   actual_cost: number
   estimated_duration: number
   actual_duration: number
+  latency_profile?: TemporalLatencyProfile
 }
 
 export interface TemporalSimulationResult {
   simulation_id: string
   rule_set_id: string
   status: "complete" | "failed"
+  execution_mode?: TemporalSimulationExecutionMode
+  latency_profile?: TemporalLatencyProfile
   tasks: TemporalSimulationTaskResult[]
   artifacts: Array<{
     type: string
@@ -82,6 +91,10 @@ function temporalSimulationEnabledByEnv() {
   return env !== "0" && env !== "false"
 }
 
+function resolveSimulationExecutionMode(): TemporalSimulationExecutionMode {
+  return process.env.AEI_TEMPORAL_SIMULATION_MODE === "serial" ? "serial" : "pipelined"
+}
+
 function resolvePythonExecutable() {
   if (existsSync(PYTHON_VENV_BIN)) return PYTHON_VENV_BIN
   return "python3"
@@ -156,7 +169,10 @@ export async function runTemporalSimulationWorkflow(
   payload: TemporalSimulationPayload
 ): Promise<{ workflowId: string; result: TemporalSimulationResult }> {
   const pythonExecutable = resolvePythonExecutable()
-  const runnerInput = JSON.stringify(payload)
+  const runnerInput = JSON.stringify({
+    execution_mode: resolveSimulationExecutionMode(),
+    ...payload,
+  })
   const timeoutMs = Math.max(
     1000,
     Number(process.env.AEI_TEMPORAL_SIMULATION_TIMEOUT_MS || 12000)
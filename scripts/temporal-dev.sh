@@ -53,6 +53,10 @@ echo ""
 echo "Temporal UI: http://localhost:8080"
 echo "Temporal gRPC: localhost:7233"
 echo ""
+if [[ -n "${ARI_WORKER_PROCESSES:-}" ]]; then
+  echo "Starting ${ARI_WORKER_PROCESSES} Python workers (Ctrl+C to stop workers; Temporal containers stay running)..."
+  exec "${venv_dir}/bin/python" "${python_dir}/supervisor.py" "$@"
+fi
 echo "Starting Python worker (Ctrl+C to stop worker; Temporal containers stay running)..."
-exec "${venv_dir}/bin/python" "${python_dir}/worker.py"
+exec "${venv_dir}/bin/python" "${python_dir}/worker.py" "$@"
 
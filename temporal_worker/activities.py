@@ -0,0 +1,2503 @@
+import asyncio
+import codecs
+import contextvars
+import csv
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib import error as urllib_error
+from urllib import request as urllib_request
+
+from temporalio import activity
+
+from llm_cache import build_cache as build_llm_cache
+from llm_cache import cache_enabled as llm_cache_enabled
+from llm_cache import cache_key as llm_cache_key
+from llm_client import build_llm_client
+from llm_client import estimate_cost_usd as estimate_llm_cost_usd
+from llm_client import is_retryable_error as is_retryable_llm_error
+from telemetry import (
+    LLM_CALL_LATENCY_METRIC,
+    MIGRATION_ROWS_PER_SECOND_METRIC,
+    record_activity_histogram,
+)
+
+# Activity implementations. Workflows import this module as a sandbox
+# passthrough, so it is loaded once per worker process; keep import-time work
+# to definitions only.
+
+# OpenAI with OpenRouter configuration (v1 API)
+# Note: Import lazily to avoid Temporal sandbox issues
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# MiniMax M2.5 is available on this account
+DEFAULT_MODEL = "minimax/minimax-m2.5"
+ENV_LOCAL_PATH = Path("/Users/ari_mac_mini/Desktop/ari/.env.local")
+
+# Resolved on first use rather than at import; assign "" to force the
+# offline fallbacks (the benchmark suite does).
+OPENROUTER_API_KEY: str | None = None
+
+
+def _openrouter_api_key() -> str:
+    global OPENROUTER_API_KEY
+    if OPENROUTER_API_KEY is None:
+        # Try to load from .env.local if not set in environment
+        if not os.environ.get("OPENROUTER_KEY") and ENV_LOCAL_PATH.exists():
+            with open(ENV_LOCAL_PATH) as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("OPENROUTER_KEY="):
+                        os.environ["OPENROUTER_KEY"] = line.split("=", 1)[1]
+                        break
+        OPENROUTER_API_KEY = os.environ.get("OPENROUTER_KEY", os.environ.get("OPENROUTER_API_KEY", ""))
+    return OPENROUTER_API_KEY
+
+
+# Lazy client initialization
+_llm_client = None
+
+def _get_llm_client():
+    global _llm_client
+    if _llm_client is None and _openrouter_api_key():
+        _llm_client = build_llm_client(_openrouter_api_key(), OPENROUTER_BASE_URL)
+    return _llm_client
+
+
+def llm_client_stats() -> dict[str, Any] | None:
+    """The shared LLM client's process-wide counters, or None if no call built it."""
+    return _llm_client.stats() if _llm_client is not None else None
+
+# Opt-in response cache (ARI_LLM_CACHE=1). Cache hit/miss and client
+# queue/retry counts are tracked per activity through a context var so
+# concurrent activities don't mix them.
+_llm_cache = None
+_llm_call_stats: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "llm_call_stats", default=None
+)
+
+
+def _get_llm_cache():
+    global _llm_cache
+    if _llm_cache is None and llm_cache_enabled():
+        _llm_cache = build_llm_cache()
+    return _llm_cache
+
+
+def _count_llm_cache(outcome: str) -> None:
+    stats = _llm_call_stats.get()
+    if stats is not None:
+        cache_stats = stats.setdefault("cache", {})
+        cache_stats[outcome] = cache_stats.get(outcome, 0) + 1
+
+
+def _count_llm_usage(model: str, usage: dict[str, int]) -> None:
+    stats = _llm_call_stats.get()
+    if stats is None:
+        return
+    prompt_tokens = int(usage.get("prompt_tokens", 0))
+    completion_tokens = int(usage.get("completion_tokens", 0))
+    totals = stats.setdefault("usage", {})
+    totals["calls"] = totals.get("calls", 0) + 1
+    totals["prompt_tokens"] = totals.get("prompt_tokens", 0) + prompt_tokens
+    totals["completion_tokens"] = totals.get("completion_tokens", 0) + completion_tokens
+    totals["estimated_cost_usd"] = totals.get("estimated_cost_usd", 0.0) + estimate_llm_cost_usd(
+        model, prompt_tokens, completion_tokens
+    )
+
+
+# Blocks whose LLM calls stream and heartbeat; only these get a heartbeat_timeout.
+DOGFOOD_STREAMING_BLOCKS = {"B3", "B4"}
+DEFAULT_BLOCK_HEARTBEAT_TIMEOUT_SECONDS = 30
+# While a block is not streaming (simulated work, waiting for an LLM slot or
+# rate-limit token, retry backoff) it heartbeats on this timer. While a call
+# streams, only received chunks heartbeat, so a hung stream stops heartbeating;
+# the client's stream idle timeout (shorter than the heartbeat timeout)
+# normally abandons and retries it first.
+BLOCK_HEARTBEAT_INTERVAL_SECONDS = 5.0
+
+# Streaming progress of the current block's LLM call; sent as heartbeat
+# details, which `run_dogfood.py status` reads from the pending activity.
+_block_progress: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "block_progress", default=None
+)
+
+
+def _send_block_heartbeat(progress: dict[str, Any]) -> None:
+    progress["elapsed_seconds"] = round(time.monotonic() - progress["started_monotonic"], 2)
+    if activity.in_activity():
+        activity.heartbeat({k: v for k, v in progress.items() if k != "started_monotonic"})
+
+
+async def _heartbeat_block_progress(progress: dict[str, Any]) -> None:
+    while True:
+        if progress.get("phase") != "streaming":
+            _send_block_heartbeat(progress)
+        await asyncio.sleep(BLOCK_HEARTBEAT_INTERVAL_SECONDS)
+
+
+async def call_llm(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = 4000,
+    stream: bool = False,
+) -> str:
+    """Call LLM via OpenRouter.
+
+    With stream=True inside a block activity, each received chunk updates
+    the block's progress with the token count so far and heartbeats it.
+    Provider errors are raised once the client's own retries are used up,
+    so the activity's retry policy sees them.
+    """
+    client = _get_llm_client()
+    if not client:
+        return f"[MOCK LLM - No API Key] {prompt[:200]}..."
+
+    cache = _get_llm_cache()
+    key = llm_cache_key(model, prompt, max_tokens) if cache else ""
+    if cache:
+        try:
+            cached = await cache.get(key)
+        except sqlite3.Error as e:
+            print(f"[Worker] LLM cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            _count_llm_cache("hits")
+            return cached
+        _count_llm_cache("misses")
+
+    stats = _llm_call_stats.get()
+    client_stats = stats.setdefault("client", {}) if stats is not None else None
+    messages = [{"role": "user", "content": prompt}]
+    call_started = time.monotonic()
+    outcome = "error"
+    usage: dict[str, int] = {}
+    try:
+        if stream:
+            progress = _block_progress.get()
+
+            async def on_delta(tokens: int, _text: str) -> None:
+                if progress is not None:
+                    progress["tokens"] = tokens
+                    _send_block_heartbeat(progress)
+
+            def on_attempt(streaming: bool) -> None:
+                if progress is not None:
+                    progress["phase"] = "streaming" if streaming else "working"
+
+            content = await client.stream_chat_completion(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                on_delta=on_delta,
+                stats=client_stats,
+                usage=usage,
+                on_attempt=on_attempt,
+            )
+        else:
+            response = await client.create_chat_completion(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                stats=client_stats,
+            )
+            content = response.choices[0].message.content
+            if response.usage is not None:
+                usage["prompt_tokens"] = int(response.usage.prompt_tokens or 0)
+                usage["completion_tokens"] = int(response.usage.completion_tokens or 0)
+        outcome = "ok"
+        _count_llm_usage(model, usage)
+    finally:
+        record_activity_histogram(
+            LLM_CALL_LATENCY_METRIC,
+            time.monotonic() - call_started,
+            {"model": model, "stream": stream, "outcome": outcome},
+        )
+
+    if cache and content:
+        try:
+            await cache.put(key, model, content)
+        except sqlite3.Error as e:
+            print(f"[Worker] LLM cache write failed: {e}")
+    return content
+
+ALLOWED_ARTIFACT_TYPES = {
+    "code",
+    "html",
+    "json",
+    "sql",
+    "config",
+    "test",
+    "markdown",
+    "svg",
+    "dockerfile",
+    "yaml",
+}
+
+
+# Dogfood B1-B8 Block Agent Implementations
+# These implement the actual agent logic for each block
+
+AGENT_DESCRIPTIONS = {
+    "B1": {
+        "agent": "planner",
+        "name": "Scope Lock",
+        "description": "Create explicit slice goal + in-scope/out-of-scope + success criteria",
+        "input_fields": ["feature_file", "roadmap_task"],
+        "output_fields": ["slice_goal", "in_scope", "out_of_scope", "success_criteria"],
+    },
+    "B2": {
+        "agent": "planner", 
+        "name": "Dependency Check",
+        "description": "Check dependencies/blocks - ready/blocked decision",
+        "input_fields": ["dependencies"],
+        "output_fields": ["dependency_status", "blockers", "ready"],
+    },
+    "B3": {
+        "agent": "architect",
+        "name": "Design Pass",
+        "description": "Create file-by-file implementation plan + contracts",
+        "input_fields": ["acceptance_criteria", "current_code"],
+        "output_fields": ["implementation_plan", "file_contracts", "design_notes"],
+    },
+    "B4": {
+        "agent": "implementer",
+        "name": "Implement Pass",
+        "description": "Write focused code/doc changes",
+        "input_fields": ["implementation_plan"],
+        "output_fields": ["changed_files", "code_diff", "implementation_notes"],
+    },
+    "B5": {
+        "agent": "tester",
+        "name": "Verify Pass",
+        "description": "Run tests, validate acceptance criteria - pass/fail + evidence",
+        "input_fields": ["changed_files", "acceptance_criteria"],
+        "output_fields": ["verification_result", "test_results", "evidence_paths", "passed"],
+    },
+    "B6": {
+        "agent": "reviewer",
+        "name": "Review Pass",
+        "description": "Review diff + tests - findings + required fixes",
+        "input_fields": ["diff", "tests"],
+        "output_fields": ["findings", "required_fixes", "approved"],
+    },
+    "B7": {
+        "agent": "docs-agent",
+        "name": "Docs Sync",
+        "description": "Update progress log + parity updates",
+        "input_fields": ["final_diff", "task_file"],
+        "output_fields": ["progress_log_updated", "parity_status", "docs_changed"],
+    },
+    "B8": {
+        "agent": "lead",
+        "name": "Ship Decision",
+        "description": "Make done/iterate/split decision based on B5-B7",
+        "input_fields": ["verification_results", "review_findings", "docs_status"],
+        "output_fields": ["decision", "next_actions"],
+    },
+}
+
+
+DEFAULT_B5_BASE_URL = "http://localhost:3000"
+DEFAULT_B5_PROBE_ENDPOINTS: list[dict[str, Any]] = [
+    {"name": "app", "path": "/", "required": True},
+    {"name": "executions_api", "path": "/api/executions"},
+]
+DEFAULT_B5_PROBE_REPEATS = 5
+DEFAULT_B5_PROBE_TIMEOUT_SECONDS = 5.0
+
+
+def _resolve_probe_endpoints(
+    raw_endpoints: list[Any],
+    base_url: str,
+    default_budget_ms: Any,
+) -> list[dict[str, Any]]:
+    """Normalize B5 probe specs (URL/path strings or dicts) against base_url."""
+    endpoints = []
+    for index, raw in enumerate(raw_endpoints):
+        spec = {"path": raw} if isinstance(raw, str) else raw
+        if not isinstance(spec, dict):
+            raise ValueError(f"Unsupported probe endpoint spec at index {index}: {raw!r}")
+        target = str(spec.get("url") or spec.get("path") or "/")
+        url = target if "://" in target else f"{base_url}/{target.lstrip('/')}"
+        budget = spec.get("p95_budget_ms", default_budget_ms)
+        endpoints.append(
+            {
+                "name": str(spec.get("name") or target),
+                "url": url,
+                "method": str(spec.get("method") or "GET").upper(),
+                "expected_status": spec.get("expected_status"),
+                "required": bool(spec.get("required", False)),
+                "budget_ms": float(budget) if budget is not None else None,
+            }
+        )
+    return endpoints
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile; callers pass a non-empty sorted list.
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def _run_http_probes(
+    endpoints: list[dict[str, Any]],
+    repeats: int,
+    timeout_seconds: float,
+) -> list[dict[str, Any]]:
+    """Probe every endpoint concurrently, each `repeats` times in sequence.
+
+    Repeats stay sequential per endpoint so one endpoint's samples don't
+    contend with each other; latency is measured to the last body byte.
+    """
+    import httpx
+
+    async def probe(client: Any, endpoint: dict[str, Any]) -> dict[str, Any]:
+        latencies: list[float] = []
+        status_codes: dict[str, int] = {}
+        sizes: list[int] = []
+        errors: list[str] = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            try:
+                response = await client.request(endpoint["method"], endpoint["url"])
+                body = response.content
+            except httpx.HTTPError as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+            expected = endpoint["expected_status"]
+            if (expected is not None and response.status_code != int(expected)) or (
+                expected is None and response.status_code >= 400
+            ):
+                errors.append(f"HTTP {response.status_code}")
+                continue
+            latencies.append(elapsed_ms)
+            sizes.append(len(body))
+
+        ordered = sorted(latencies)
+        latency_ms = (
+            {
+                "p50": round(_percentile(ordered, 0.50), 1),
+                "p95": round(_percentile(ordered, 0.95), 1),
+                "max": round(ordered[-1], 1),
+            }
+            if ordered
+            else {"p50": None, "p95": None, "max": None}
+        )
+        budget = endpoint["budget_ms"]
+        return {
+            "name": endpoint["name"],
+            "url": endpoint["url"],
+            "method": endpoint["method"],
+            "required": endpoint["required"],
+            "samples": repeats,
+            "ok_count": len(latencies),
+            "error_count": len(errors),
+            "status_codes": status_codes,
+            "latency_ms": latency_ms,
+            "payload_bytes": {"min": min(sizes), "max": max(sizes)} if sizes else None,
+            "budget_ms": budget,
+            "budget_exceeded": bool(budget is not None and ordered and latency_ms["p95"] > budget),
+            "errors": errors[:3],
+        }
+
+    async with httpx.AsyncClient(timeout=timeout_seconds, follow_redirects=True) as client:
+        return list(await asyncio.gather(*(probe(client, endpoint) for endpoint in endpoints)))
+
+
+async def _generate_block_output(block: str, block_input: dict, agent_info: dict) -> dict:
+    """Generate appropriate output for each Block type."""
+    
+    # For now, we'll mix LLM with fallback to mock
+    # In production, each block would call the LLM
+    
+    if block == "B1":  # Scope Lock - Planner creates slice goal
+        # Get input from roadmap task or feature file
+        roadmap_task = block_input.get("roadmap_task", "New feature")
+        feature_file = block_input.get("feature_file", "docs/tasks/feature-XX.md")
+        
+        # Analyze the task and create scope
+        task_lower = roadmap_task.lower()
+        
+        # Determine scope based on task type
+        if "bug" in task_lower or "fix" in task_lower:
+            in_scope = ["Fix the bug", "Add test for regression"]
+            out_of_scope = ["Refactoring", "New features"]
+        elif "feature" in task_lower:
+            in_scope = ["Implement feature", "Add tests", "Update docs"]
+            out_of_scope = ["Performance optimization", "Breaking changes"]
+        else:
+            in_scope = ["Core implementation"]
+            out_of_scope = ["Advanced features"]
+        
+        # Generate success criteria
+        success_criteria = [
+            "Code compiles without errors",
+            "Tests pass",
+            "No console errors",
+            "Build succeeds",
+        ]
+        
+        return {
+            "slice_goal": roadmap_task,
+            "in_scope": in_scope,
+            "out_of_scope": out_of_scope,
+            "success_criteria": success_criteria,
+            "feature_file_updated": feature_file,
+            "scope_locked": True,
+            "estimated_effort": "medium",
+        }
+    
+    elif block == "B2":  # Dependency Check - Planner checks dependencies
+        dependencies = block_input.get("dependencies", [])
+        
+        # If no dependencies provided, check common ones
+        if not dependencies:
+            dependencies = [
+                {"name": "node_modules", "status": "ready"},
+                {"name": "npm packages", "status": "ready"},
+                {"name": "TypeScript types", "status": "ready"},
+                {"name": "Build tools", "status": "ready"},
+            ]
+        
+        blockers = [d for d in dependencies if isinstance(d, dict) and d.get("status") == "blocked"]
+        ready_deps = [d for d in dependencies if isinstance(d, dict) and d.get("status") == "ready"]
+        
+        # Check if package.json exists
+        import os
+        pkg_json_exists = os.path.exists("/Users/ari_mac_mini/Desktop/ari/package.json")
+        
+        if pkg_json_exists:
+            dependencies.append({"name": "package.json", "status": "ready", "note": "Project initialized"})
+        
+        return {
+            "dependency_status": "ready" if not blockers else "blocked",
+            "blockers": blockers,
+            "ready_deps": ready_deps,
+            "ready": len(blockers) == 0,
+            "dependency_notes": f"All {len(ready_deps)} dependencies resolved" if not blockers else f"{len(blockers)} blockers found",
+            "dependencies_checked": len(dependencies),
+        }
+    
+    elif block == "B3":  # Design Pass - Generate real implementation plan with LLM
+        roadmap_task = block_input.get("roadmap_task", "New feature")
+        feature_file = block_input.get("feature_file", "docs/tasks/feature-XX.md")
+        
+        # Debug: print key status
+        api_key = _openrouter_api_key()
+        print(f"[B3] API Key available: {bool(api_key)}")
+        print(f"[B3] Key prefix: {api_key[:10] if api_key else 'None'}")
+        
+        # Try to read the feature file for context
+        feature_context = ""
+        try:
+            feature_path = f"/Users/ari_mac_mini/Desktop/ari/{feature_file}"
+            if os.path.exists(feature_path):
+                with open(feature_path, 'r') as f:
+                    feature_context = f.read()[:2000]
+        except:
+            pass
+        
+        # Generate real implementation plan using LLM
+        implementation_plan = []
+        
+        if api_key:
+            try:
+                prompt = f"""You are an architect designing an implementation plan for a feature.
+
+Task: {roadmap_task}
+Feature File: {feature_file}
+
+{feature_context}
+
+Generate a detailed implementation plan as JSON. Include:
+- "files": array of {{"file": "relative/path", "action": "create|modify", "description": "what this file does"}}
+- "design_notes": string describing the approach
+
+Return ONLY valid JSON, no explanation."""
+
+                llm_response = await call_llm(prompt, max_tokens=2000, stream=True)
+                
+                # Try to parse the LLM response
+                try:
+                    # Extract JSON from response if wrapped in markdown
+                    if "```json" in llm_response:
+                        start = llm_response.find("```json") + 7
+                        end = llm_response.find("```", start)
+                        llm_response = llm_response[start:end]
+                    elif "```" in llm_response:
+                        start = llm_response.find("```") + 3
+                        end = llm_response.find("```", start)
+                        llm_response = llm_response[start:end]
+                    
+                    result = json.loads(llm_response)
+                    implementation_plan = result.get("files", [])
+                    design_notes = result.get("design_notes", "Generated with LLM")
+                except (json.JSONDecodeError, Exception) as e:
+                    design_notes = f"LLM response: {llm_response[:300]}"
+            except Exception as e:
+                # Transient errors already retried by the client go to the
+                # activity's retry policy; a rejected request falls back below.
+                if is_retryable_llm_error(e):
+                    raise
+                design_notes = f"LLM error: {e}"
+        
+        # Fallback if no LLM or failed
+        if not implementation_plan:
+            implementation_plan = [
+                {"file": f"lib/{roadmap_task.lower().replace(' ', '-')}.ts", "action": "create", "description": "Main implementation"},
+                {"file": f"components/{roadmap_task.lower().replace(' ', '-')}.tsx", "action": "create", "description": "UI component"},
+            ]
+            design_notes = "Mock plan - LLM not available"
+        
+        return {
+            "implementation_plan": implementation_plan,
+            "file_contracts": [
+                {"file": item["file"], "interface": "TBD", "exports": []} 
+                for item in implementation_plan if isinstance(item, dict)
+            ],
+            "design_notes": design_notes if 'design_notes' in locals() else "Generated",
+        }
+    
+    elif block == "B4":  # Implement Pass - Actually write code files
+        plan = block_input.get("implementation_plan", [])
+        workspace_path = block_input.get("workspace_path", "/Users/ari_mac_mini/Desktop/ari")
+        roadmap_task = block_input.get("roadmap_task", "feature")
+        
+        implemented_files = []
+        implementation_notes = []
+        
+        # If we have a plan, use LLM to generate code
+        if plan and _openrouter_api_key():
+            import asyncio
+            try:
+                plan_text = json.dumps(plan, indent=2)
+                prompt = f"""You are an expert React/Next.js developer. Generate code for this implementation plan.
+
+Task: {roadmap_task}
+Workspace: {workspace_path}
+
+Implementation Plan:
+{plan_text}
+
+Requirements:
+- Use TypeScript
+- Use Next.js 14+ App Router
+- Use existing UI components from @/components/ui
+- Follow existing code patterns in the workspace
+- Generate complete, working code
+
+Return JSON:
+{{
+  "files": [
+    {{"path": "relative/path/file.tsx", "content": "complete code here"}}
+  ],
+  "notes": ["implementation notes"]
+}}
+
+Generate code for ALL files in the plan. Each file should be complete and functional."""
+
+                llm_response = await call_llm(prompt, max_tokens=4000, stream=True)
+                
+                # Try to parse the LLM response as JSON
+                try:
+                    # Extract JSON from markdown if present
+                    response_clean = llm_response
+                    if "```json" in llm_response:
+                        start = llm_response.find("```json") + 7
+                        end = llm_response.find("```", start)
+                        response_clean = llm_response[start:end]
+                    elif "```" in llm_response:
+                        start = llm_response.find("```") + 3
+                        end = llm_response.find("```", start)
+                        response_clean = llm_response[start:end]
+                    
+                    result = json.loads(response_clean)
+                    for f in result.get("files", []):
+                        file_path = f.get("path", "")
+                        content = f.get("content", "")
+                        if file_path and content:
+                            # Ensure path is relative to workspace
+                            if not file_path.startswith('/'):
+                                full_path = workspace_path + "/" + file_path
+                            else:
+                                full_path = file_path
+                            
+                            try:
+                                import pathlib
+                                pathlib.Path(full_path).parent.mkdir(parents=True, exist_ok=True)
+                                with open(full_path, 'w') as fp:
+                                    fp.write(content)
+                                implemented_files.append(file_path)
+                                implementation_notes.append(f"Created: {file_path}")
+                            except Exception as e:
+                                implementation_notes.append(f"Error writing {file_path}: {e}")
+                    
+                    implementation_notes.extend(result.get("notes", []))
+                except (json.JSONDecodeError, Exception) as e:
+                    implementation_notes.append(f"Parse error: {e}. Response: {llm_response[:200]}")
+            except Exception as e:
+                if is_retryable_llm_error(e):
+                    raise
+                implementation_notes.append(f"LLM error: {e}")
+        
+        # Fallback to mock if no files implemented
+        if not implemented_files and plan:
+            for item in plan:
+                if not isinstance(item, dict):
+                    continue
+                file_path = item.get("file", "")
+                action = item.get("action", "create")
+                description = item.get("description", "")
+                if file_path:
+                    implemented_files.append(file_path)
+                    if action == "create":
+                        implementation_notes.append(f"Would create: {file_path} - {description}")
+                    else:
+                        implementation_notes.append(f"Would modify: {file_path} - {description}")
+        
+        return {
+            "changed_files": implemented_files,
+            "code_diff": f"# {len(implemented_files)} files would be changed\n" + "\n".join(implementation_notes),
+            "implementation_notes": f"Implementation plan for {len(implemented_files)} files",
+            "files_created": len([p for p in plan if isinstance(p, dict) and p.get("action") == "create"]) if plan else 0,
+            "files_modified": len([p for p in plan if isinstance(p, dict) and p.get("action") == "modify"]) if plan else 0,
+            "workspace": workspace_path,
+            "status": "implemented_dry_run",
+        }
+    
+    elif block == "B5":  # Verify Pass - Bug Hunter Mode
+        acceptance_criteria = block_input.get("acceptance_criteria", [])
+        base_url = str(block_input.get("base_url") or DEFAULT_B5_BASE_URL).rstrip("/")
+        endpoints = _resolve_probe_endpoints(
+            block_input.get("probe_endpoints") or DEFAULT_B5_PROBE_ENDPOINTS,
+            base_url,
+            block_input.get("latency_budget_ms"),
+        )
+        probe_results = await _run_http_probes(
+            endpoints,
+            repeats=max(1, int(block_input.get("probe_repeats", DEFAULT_B5_PROBE_REPEATS))),
+            timeout_seconds=float(
+                block_input.get("probe_timeout_seconds", DEFAULT_B5_PROBE_TIMEOUT_SECONDS)
+            ),
+        )
+
+        bugs_found = []
+        for probe in probe_results:
+            if probe["ok_count"] == 0:
+                if probe["required"]:
+                    bugs_found.append({
+                        "severity": "error",
+                        "type": "app_not_running",
+                        "message": f"{probe['name']} not reachable at {probe['url']}: {probe['errors'][:1]}",
+                        "location": probe["url"],
+                    })
+                else:
+                    bugs_found.append({
+                        "severity": "warning",
+                        "type": "api_check",
+                        "message": f"{probe['name']} check failed: {probe['errors'][:1]}",
+                        "location": probe["url"],
+                    })
+                continue
+            bugs_found.append({
+                "severity": "info",
+                "type": "health_check" if probe["required"] else "api_check",
+                "message": (
+                    f"{probe['name']} responding: p50={probe['latency_ms']['p50']}ms "
+                    f"p95={probe['latency_ms']['p95']}ms max={probe['latency_ms']['max']}ms"
+                ),
+                "location": probe["url"],
+            })
+            if probe["budget_exceeded"]:
+                bugs_found.append({
+                    "severity": "error",
+                    "type": "latency_budget",
+                    "message": (
+                        f"{probe['name']} p95 {probe['latency_ms']['p95']}ms exceeds "
+                        f"budget {probe['budget_ms']}ms"
+                    ),
+                    "location": probe["url"],
+                })
+
+        # Determine pass/fail based on bugs
+        has_errors = any(b.get("severity") == "error" for b in bugs_found)
+        failed_probes = len([
+            probe for probe in probe_results
+            if probe["budget_exceeded"] or (probe["required"] and probe["ok_count"] == 0)
+        ])
+        app_running = any(probe["required"] and probe["ok_count"] > 0 for probe in probe_results)
+        
+        return {
+            "verification_result": "fail" if has_errors else "pass",
+            "test_results": {
+                "total": len(probe_results),
+                "passed": len(probe_results) - failed_probes,
+                "failed": failed_probes,
+                "skipped": 0,
+            },
+            "evidence_paths": [base_url],
+            "passed": not has_errors,
+            "acceptance_met": [f"✓ {c}" for c in acceptance_criteria] if not has_errors else [],
+            "bugs_found": bugs_found,
+            "bug_hunt_summary": f"Found {len(bugs_found)} issue(s) - {'PASS' if not has_errors else 'FAIL'}",
+            "app_status": "running" if app_running else "not_running",
+            "probe_results": probe_results,
+        }
+    
+    elif block == "B6":  # Review Pass - Code Review with analysis
+        diff = block_input.get("diff", "")
+        changed_files = block_input.get("changed_files", [])
+        
+        findings = []
+        
+        # Analyze the diff/code for common issues
+        if not diff:
+            findings.append({"severity": "info", "message": "No diff provided - review based on changed files"})
+        
+        # Check for common code issues
+        if diff:
+            if "console.log" in diff or "console.error" in diff:
+                findings.append({"severity": "warning", "message": "Console statements found in code", "type": "console"})
+            if "TODO" in diff or "FIXME" in diff:
+                findings.append({"severity": "info", "message": "TODOs/FIXMEs found in code", "type": "todo"})
+            if "password" in diff or "secret" in diff:
+                findings.append({"severity": "error", "message": "Potential secret/password in code", "type": "security"})
+            if "import" not in diff and len(changed_files) > 0:
+                findings.append({"severity": "warning", "message": "No imports found - verify module structure", "type": "structure"})
+        
+        # Check each changed file
+        for f in changed_files:
+            if isinstance(f, str):
+                if f.endswith(".test.tsx") or f.endswith(".test.ts"):
+                    findings.append({"severity": "info", "message": f"Test file included: {f}", "type": "test_coverage"})
+                if f.endswith(".css") or f.endswith(".scss"):
+                    findings.append({"severity": "info", "message": f"Styles included: {f}", "type": "styles"})
+        
+        # Determine approval
+        has_errors = any(f.get("severity") == "error" for f in findings)
+        
+        return {
+            "findings": findings,
+            "required_fixes": [f for f in findings if f.get("severity") == "error"],
+            "approved": not has_errors,
+            "review_notes": f"Reviewed {len(changed_files)} file(s), found {len(findings)} issue(s)",
+            "files_reviewed": changed_files,
+            "summary": "APPROVED" if not has_errors else "CHANGES REQUESTED",
+        }
+    
+    elif block == "B7":  # Docs Sync - Update documentation
+        final_diff = block_input.get("final_diff", "")
+        task_file = block_input.get("task_file", "docs/tasks/feature-XX.md")
+        changed_files = block_input.get("changed_files", [])
+        
+        docs_changed = []
+        
+        # Update feature task file (would be automatic in production)
+        if task_file:
+            docs_changed.append(task_file)
+        
+        # Update dogfood status (would regenerate)
+        docs_changed.append("docs/tasks/dogfood-status.md")
+        
+        # Update project roadmap if provided
+        docs_changed.append("docs/tasks/project-roadmap.md")
+        
+        # Add onboarding doc if this is a new feature
+        onboarding_doc = "docs/on-boarding/feature-XX-onboarding.md"
+        docs_changed.append(onboarding_doc)
+        
+        # Add architecture doc
+        arch_doc = "docs/architecture/feature-XX-architecture.md"
+        docs_changed.append(arch_doc)
+        
+        return {
+            "progress_log_updated": True,
+            "parity_status": "synced",
+            "docs_changed": docs_changed,
+            "parity_notes": f"Updated {len(docs_changed)} documentation files",
+            "task_file_updated": task_file,
+            "status": "docs_synced",
+        }
+    
+    elif block == "B8":  # Ship Decision
+        verification = block_input.get("verification_results", {})
+        review = block_input.get("review_findings", {})
+        verification_passed = bool(
+            verification.get("passed")
+            or block_input.get("passed")
+            or block_input.get("verification_result") == "pass"
+        )
+        review_passed = bool(
+            review.get("approved")
+            or block_input.get("approved")
+            or block_input.get("review_status") == "pass"
+        )
+        pr_loop_passed = bool(block_input.get("pr_loop_passed", True))
+
+        if verification_passed and review_passed and pr_loop_passed:
+            decision = "done"
+            next_actions = ["Merge to main", "Update status to complete"]
+        elif review.get("required_fixes") or not review_passed or not pr_loop_passed:
+            decision = "iterate"
+            next_actions = ["Fix issues in B6 findings", "Re-run PR loop and B5"]
+        else:
+            decision = "split"
+            next_actions = ["Break into smaller slices", "Re-plan in B1"]
+        return {
+            "decision": decision,
+            "next_actions": next_actions,
+            "summary": f"Decision: {decision.upper()}",
+            "ready_to_ship": decision == "done",
+            "verification_passed": verification_passed,
+            "review_passed": review_passed,
+            "pr_loop_passed": pr_loop_passed,
+        }
+    
+    return {}
+
+
+LATENCY_PROFILES = ("none", "fixed", "realistic")
+DEFAULT_LATENCY_PROFILE = "fixed"
+# Nominal per-call delays of the demo activities. `fixed` sleeps exactly this,
+# `realistic` samples a log-normal around it, `none` skips the sleep.
+SIMULATED_LATENCY_SECONDS = {
+    "dogfood_block": 0.5,
+    "simulation_artifact": 0.05,
+    "extract": 0.1,
+    "transform_record": 0.03,
+    "load_record": 0.03,
+    "validate": 0.05,
+    "report": 0.02,
+}
+REALISTIC_LATENCY_SIGMA = 0.5
+REALISTIC_LATENCY_MAX_FACTOR = 5.0
+
+# Worker-wide default; a workflow payload's latency_profile overrides it.
+_worker_latency_profile = os.environ.get("ARI_LATENCY_PROFILE", "").strip().lower()
+if _worker_latency_profile not in LATENCY_PROFILES:
+    _worker_latency_profile = DEFAULT_LATENCY_PROFILE
+
+
+def worker_latency_profile() -> str:
+    return _worker_latency_profile
+
+
+def set_worker_latency_profile(profile: str) -> None:
+    global _worker_latency_profile
+    _worker_latency_profile = profile
+
+
+def _resolve_latency_profile(payload: Any) -> str:
+    requested = payload.get("latency_profile") if isinstance(payload, dict) else None
+    profile = str(requested or "").strip().lower()
+    return profile if profile in LATENCY_PROFILES else _worker_latency_profile
+
+
+def _simulated_latency_seconds(profile: str, nominal_seconds: float) -> float:
+    if profile == "none" or nominal_seconds <= 0:
+        return 0.0
+    if profile == "realistic":
+        sampled = random.lognormvariate(math.log(nominal_seconds), REALISTIC_LATENCY_SIGMA)
+        return min(sampled, nominal_seconds * REALISTIC_LATENCY_MAX_FACTOR)
+    return nominal_seconds
+
+
+def _reported_latency_profile(results: list[Any]) -> str | None:
+    for result in results:
+        if isinstance(result, dict) and result.get("latency_profile"):
+            return str(result["latency_profile"])
+    return None
+
+
+@activity.defn
+async def execute_assignment_activity(assignment: dict[str, Any]) -> dict[str, Any]:
+    estimated_duration = float(assignment.get("estimated_duration", 0) or 0)
+    latency_profile = _resolve_latency_profile(assignment)
+    # Keep dogfood runtime predictable while still exercising Temporal activity execution.
+    simulated_duration = _simulated_latency_seconds(
+        latency_profile, max(0.05, min(estimated_duration, 2.0))
+    )
+    await asyncio.sleep(simulated_duration)
+    estimated_cost = float(assignment.get("estimated_cost", 0) or 0)
+    return {
+        "id": str(assignment.get("id", "unknown-task")),
+        "assigned_agent_id_or_pool": str(
+            assignment.get("assigned_agent_id_or_pool", "unassigned")
+        ),
+        "status": "complete",
+        "estimated_cost": estimated_cost,
+        "actual_cost": estimated_cost,
+        "estimated_duration": estimated_duration,
+        "actual_duration": simulated_duration,
+        "latency_profile": latency_profile,
+    }
+
+
+@activity.defn
+async def generate_simulation_artifact_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    await asyncio.sleep(
+        _simulated_latency_seconds(
+            _resolve_latency_profile(payload), SIMULATED_LATENCY_SECONDS["simulation_artifact"]
+        )
+    )
+    candidate = (
+        payload.get("artifact_candidate")
+        if isinstance(payload.get("artifact_candidate"), dict)
+        else {}
+    )
+    assignment = payload.get("assignment") if isinstance(payload.get("assignment"), dict) else {}
+    task_id = str(assignment.get("id") or "unknown-task")
+    artifact_type = str(candidate.get("type") or "code")
+    if artifact_type not in ALLOWED_ARTIFACT_TYPES:
+        artifact_type = "code"
+    language = (
+        str(candidate.get("language"))
+        if isinstance(candidate.get("language"), str)
+        else "unknown"
+    )
+    content = (
+        str(candidate.get("content"))
+        if isinstance(candidate.get("content"), str)
+        else f"# generated artifact for {task_id}\n"
+    )
+    metadata = candidate.get("metadata") if isinstance(candidate.get("metadata"), dict) else {}
+    created_at = datetime.now(timezone.utc).isoformat()
+    version_id = str(metadata.get("version_id") or f"sim-{task_id}-{uuid.uuid4().hex[:8]}")
+    size = int(metadata.get("size") or len(content.encode("utf-8")))
+    lines = int(metadata.get("lines") or len(content.splitlines()))
+    return {
+        "type": artifact_type,
+        "language": language,
+        "content": content,
+        "metadata": {
+            "size": size,
+            "lines": lines,
+            "created_at": str(metadata.get("created_at") or created_at),
+            "version_id": version_id,
+            "language": language,
+        },
+    }
+
+
+def _activity_attempt_timing() -> dict[str, Any]:
+    """Server-side schedule/start times and attempt number of the running activity."""
+    if not activity.in_activity():
+        return {}
+    info = activity.info()
+    return {
+        "attempt": info.attempt,
+        "first_scheduled_at": info.scheduled_time.isoformat(),
+        "attempt_scheduled_at": info.current_attempt_scheduled_time.isoformat(),
+        "started_at": info.started_time.isoformat(),
+    }
+
+
+@activity.defn
+async def execute_dogfood_block_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Execute a B1-B8 block using the appropriate agent.
+    
+    Each block has a specific agent that performs the defined work:
+    - B1: Planner - Scope Lock
+    - B2: Planner - Dependency Check  
+    - B3: Architect - Design Pass
+    - B4: Implementer - Implement Pass
+    - B5: Tester - Verify Pass
+    - B6: Reviewer - Review Pass
+    - B7: Docs Agent - Docs Sync
+    - B8: Lead - Ship Decision
+    """
+    block = str(payload.get("block", "unknown"))
+    block_input = payload.get("input", {})
+    
+    if block not in AGENT_DESCRIPTIONS:
+        return {
+            "block": block,
+            "status": "error",
+            "error": f"Unknown block: {block}",
+            "input": block_input,
+        }
+    
+    agent_info = AGENT_DESCRIPTIONS[block]
+    agent_name = agent_info["agent"]
+    block_name = agent_info["name"]
+    
+    progress: dict[str, Any] = {
+        "block": block,
+        "phase": "working",
+        "tokens": 0,
+        "elapsed_seconds": 0.0,
+        "started_monotonic": time.monotonic(),
+    }
+    progress_token = _block_progress.set(progress)
+    heartbeat_task = (
+        asyncio.create_task(_heartbeat_block_progress(progress)) if activity.in_activity() else None
+    )
+    llm_stats: dict[str, Any] = {
+        "cache": {"hits": 0, "misses": 0},
+        "client": {},
+        "usage": {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "estimated_cost_usd": 0.0},
+    }
+    stats_token = _llm_call_stats.set(llm_stats)
+    latency_profile = _resolve_latency_profile(payload)
+    try:
+        # Simulate agent work (in real implementation, this would call the LLM)
+        await asyncio.sleep(
+            _simulated_latency_seconds(latency_profile, SIMULATED_LATENCY_SECONDS["dogfood_block"])
+        )
+        # Generate output based on Block type
+        output = await _generate_block_output(block, block_input, agent_info)
+    finally:
+        if heartbeat_task is not None:
+            heartbeat_task.cancel()
+        _block_progress.reset(progress_token)
+        _llm_call_stats.reset(stats_token)
+    
+    return {
+        "block": block,
+        "agent": agent_name,
+        "block_name": block_name,
+        "status": "complete",
+        "description": agent_info["description"],
+        "input": block_input,
+        "output": output,
+        "llm_cache": {"enabled": _get_llm_cache() is not None, **llm_stats["cache"]},
+        "llm_client": llm_stats["client"],
+        "llm_usage": llm_stats["usage"],
+        "timing": _activity_attempt_timing(),
+        "latency_profile": latency_profile,
+    }
+
+
+DEFAULT_PR_LOOP_COMMAND_TIMEOUT_SECONDS = 120
+PR_LOOP_HEARTBEAT_INTERVAL_SECONDS = 5.0
+PR_LOOP_DRAIN_GRACE_SECONDS = 5.0
+
+
+def _parse_cmd_json(stdout: str) -> dict[str, Any] | None:
+    if not stdout:
+        return None
+    try:
+        return json.loads(stdout)
+    except Exception:
+        lines = [line for line in stdout.splitlines() if line.strip()]
+        for line in reversed(lines):
+            try:
+                return json.loads(line)
+            except Exception:
+                continue
+    return None
+
+
+async def _run_cmd_json(
+    cmd: list[str],
+    cwd: str,
+    timeout_seconds: float = DEFAULT_PR_LOOP_COMMAND_TIMEOUT_SECONDS,
+) -> dict[str, Any]:
+    """Run a command without blocking the worker loop, streaming its output.
+
+    The process is killed on timeout or when the calling activity is
+    cancelled. While it runs, the activity heartbeats with the stdout byte
+    count so far (heartbeats are also what deliver cancellation).
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout_chunks: list[bytes] = []
+    stderr_chunks: list[bytes] = []
+
+    async def drain(stream: asyncio.StreamReader, sink: list[bytes]) -> None:
+        # Read in blocks rather than lines: review JSON can be one very long line.
+        while chunk := await stream.read(STREAM_READ_BLOCK_BYTES):
+            sink.append(chunk)
+
+    async def heartbeat() -> None:
+        while True:
+            if activity.in_activity():
+                activity.heartbeat(
+                    {
+                        "command": cmd[:2],
+                        "stdout_bytes": sum(len(chunk) for chunk in stdout_chunks),
+                    }
+                )
+            await asyncio.sleep(PR_LOOP_HEARTBEAT_INTERVAL_SECONDS)
+
+    drains = [
+        asyncio.create_task(drain(process.stdout, stdout_chunks)),
+        asyncio.create_task(drain(process.stderr, stderr_chunks)),
+    ]
+    heartbeat_task = asyncio.create_task(heartbeat())
+    timed_out = False
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout_seconds)
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        heartbeat_task.cancel()
+
+        async def reap() -> None:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            # Pipes hit EOF once the process exits; the grace period only
+            # matters if a grandchild inherited them.
+            _, pending = await asyncio.wait(drains, timeout=PR_LOOP_DRAIN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+
+        # Reaping must finish even if we're cancelled mid-cleanup.
+        reaper = asyncio.ensure_future(reap())
+        try:
+            await asyncio.shield(reaper)
+        except asyncio.CancelledError:
+            await reaper
+            raise
+
+    stdout = b"".join(stdout_chunks).decode("utf-8", errors="replace").strip()
+    stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace").strip()
+    if timed_out:
+        stderr = (stderr + "\n" if stderr else "") + f"Timed out after {timeout_seconds}s"
+    return {
+        "returncode": int(process.returncode),
+        "stdout": stdout,
+        "stderr": stderr,
+        "json": _parse_cmd_json(stdout),
+        "timed_out": timed_out,
+    }
+
+
+async def _git_head_sha(repo_root: str) -> str:
+    result = await _run_cmd_json(["git", "rev-parse", "HEAD"], cwd=repo_root, timeout_seconds=30)
+    if result["returncode"] != 0:
+        return ""
+    return result["stdout"]
+
+
+@activity.defn
+async def run_pr_agent_loop_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    repo_root = str(payload.get("repo_root") or ".")
+    pr_loop = payload.get("pr_loop") if isinstance(payload.get("pr_loop"), dict) else {}
+    if not bool(pr_loop.get("enabled", False)):
+        return {"status": "skipped", "reason": "pr_loop_disabled"}
+
+    head_sha = str(pr_loop.get("head_sha") or await _git_head_sha(repo_root))
+    max_rounds = max(0, int(pr_loop.get("max_remediation_rounds", 2)))
+    required_checks = [str(v) for v in pr_loop.get("required_checks", []) if str(v).strip()]
+    enable_remediation = bool(pr_loop.get("enable_remediation", False))
+    command_timeout = float(
+        pr_loop.get("command_timeout_seconds", DEFAULT_PR_LOOP_COMMAND_TIMEOUT_SECONDS)
+    )
+    # Risk gate and review only need head_sha, so by default they run side by
+    # side; a failing gate cancels the review.
+    concurrent_review = bool(pr_loop.get("concurrent_review", True))
+
+    rounds: list[dict[str, Any]] = []
+    for round_idx in range(max_rounds + 1):
+        risk_cmd = ["node", "scripts/risk-policy-gate.mjs", "--head-sha", head_sha]
+        for check in required_checks:
+            risk_cmd.extend(["--required-check", check])
+        review_cmd = ["node", "scripts/local-review-agent.mjs", "--head-sha", head_sha]
+        review_task = (
+            asyncio.create_task(_run_cmd_json(review_cmd, cwd=repo_root, timeout_seconds=command_timeout))
+            if concurrent_review
+            else None
+        )
+        try:
+            risk_result = await _run_cmd_json(risk_cmd, cwd=repo_root, timeout_seconds=command_timeout)
+        except BaseException:
+            if review_task is not None:
+                review_task.cancel()
+            raise
+        round_record: dict[str, Any] = {
+            "round": round_idx,
+            "head_sha": head_sha,
+            "risk_gate": risk_result,
+        }
+        if risk_result["returncode"] != 0:
+            if review_task is not None:
+                review_task.cancel()
+                await asyncio.gather(review_task, return_exceptions=True)
+            round_record["status"] = "risk_gate_failed"
+            rounds.append(round_record)
+            return {
+                "status": "fail",
+                "failure_phase": "risk_gate",
+                "head_sha": head_sha,
+                "rounds": rounds,
+            }
+
+        review_result = (
+            await review_task
+            if review_task is not None
+            else await _run_cmd_json(review_cmd, cwd=repo_root, timeout_seconds=command_timeout)
+        )
+        round_record["review"] = review_result
+        review_json = review_result.get("json") if isinstance(review_result.get("json"), dict) else {}
+        actionable = review_json.get("actionable_findings")
+        actionable_count = len(actionable) if isinstance(actionable, list) else 0
+        stale_head = bool(review_json.get("stale_head"))
+        round_record["actionable_findings"] = actionable_count
+        round_record["stale_head"] = stale_head
+
+        if review_result["returncode"] == 0 and actionable_count == 0 and not stale_head:
+            round_record["status"] = "review_clean"
+            rounds.append(round_record)
+            return {
+                "status": "complete",
+                "head_sha": head_sha,
+                "rounds": rounds,
+                "review_status": "pass",
+                "pr_loop_passed": True,
+            }
+
+        if stale_head:
+            round_record["status"] = "stale_review_head"
+            rounds.append(round_record)
+            return {
+                "status": "fail",
+                "failure_phase": "review_stale_sha",
+                "head_sha": head_sha,
+                "rounds": rounds,
+            }
+
+        if not enable_remediation or round_idx >= max_rounds:
+            round_record["status"] = "review_failed_no_remediation"
+            rounds.append(round_record)
+            return {
+                "status": "fail",
+                "failure_phase": "review_findings",
+                "head_sha": head_sha,
+                "rounds": rounds,
+                "pr_loop_passed": False,
+            }
+
+        remediation_result = await _run_cmd_json(
+            [
+                "node",
+                "scripts/remediation-agent.mjs",
+                "--head-sha",
+                head_sha,
+                "--findings-json",
+                json.dumps(review_json or {}),
+                "--apply",
+            ],
+            cwd=repo_root,
+            timeout_seconds=command_timeout,
+        )
+        round_record["remediation"] = remediation_result
+        if remediation_result["returncode"] != 0:
+            round_record["status"] = "remediation_failed"
+            rounds.append(round_record)
+            return {
+                "status": "fail",
+                "failure_phase": "remediation",
+                "head_sha": head_sha,
+                "rounds": rounds,
+                "pr_loop_passed": False,
+            }
+
+        remediation_json = (
+            remediation_result.get("json") if isinstance(remediation_result.get("json"), dict) else {}
+        )
+        head_sha = str(remediation_json.get("commit_sha") or await _git_head_sha(repo_root))
+        round_record["status"] = "remediated"
+        round_record["new_head_sha"] = head_sha
+        rounds.append(round_record)
+
+    return {
+        "status": "fail",
+        "failure_phase": "max_rounds_exhausted",
+        "head_sha": head_sha,
+        "rounds": rounds,
+        "pr_loop_passed": False,
+    }
+
+
+def _sanitize_filename_component(value: str) -> str:
+    cleaned = re.sub(r"[^a-zA-Z0-9._-]+", "-", value).strip("-")
+    return cleaned or "unknown"
+
+
+def _resolve_safe_output_dir(repo_root: str, output_dir: str) -> Path:
+    root = Path(repo_root).resolve()
+    output = (root / output_dir).resolve()
+    if root != output and root not in output.parents:
+        raise ValueError("Refusing to write outside repo_root")
+    return output
+
+
+def _resolve_safe_input_path(repo_root: str, source_path: str) -> Path:
+    root = Path(repo_root).resolve()
+    candidate = (root / source_path).resolve()
+    if root != candidate and root not in candidate.parents:
+        raise ValueError("Refusing to read outside repo_root")
+    return candidate
+
+
+def _normalize_source_record(raw: dict[str, Any], index: int) -> dict[str, Any]:
+    source_id = str(raw.get("source_id", "")).strip()
+    source_identifier = source_id or f"row-{index + 1}"
+    full_name = str(raw.get("full_name", "")).strip()
+    email = str(raw.get("email", "")).strip().lower()
+    created_at = str(raw.get("created_at", "")).strip()
+    return {
+        "source_id": source_id or source_identifier,
+        "source_identifier": source_identifier,
+        "full_name": full_name,
+        "email": email,
+        "created_at": created_at,
+        "active": bool(raw.get("active", True)),
+    }
+
+
+def _build_connector_source_records(payload: dict[str, Any]) -> tuple[list[dict[str, Any]], str]:
+    connector = (
+        payload.get("source_connector")
+        if isinstance(payload.get("source_connector"), dict)
+        else {}
+    )
+    endpoint = str(connector.get("endpoint", "")).strip()
+    token_env = str(connector.get("token_env", "")).strip()
+    use_mock = bool(connector.get("use_mock", True))
+    mock_records = connector.get("mock_records")
+    allow_http = bool(connector.get("allow_http", False))
+    timeout_seconds = int(connector.get("timeout_seconds", 10))
+
+    if not endpoint:
+        raise ValueError("source_connector.endpoint is required for connector mode")
+    if not endpoint.startswith("https://"):
+        if not (allow_http and endpoint.startswith("http://")):
+            raise ValueError("source_connector.endpoint must use https:// (or set allow_http=true for local dev)")
+    if not token_env:
+        raise ValueError("source_connector.token_env is required for connector mode")
+    token = (os.environ.get(token_env) or "").strip()
+    if not token:
+        raise ValueError(
+            f"source_connector token env is missing or empty: {token_env}"
+        )
+    if len(token) < 8:
+        raise ValueError("source_connector token is too short")
+
+    records: list[dict[str, Any]]
+    if use_mock:
+        if not isinstance(mock_records, list):
+            raise ValueError("source_connector.mock_records must be an array for mock connector mode")
+        records = [item for item in mock_records if isinstance(item, dict)]
+    else:
+        req = urllib_request.Request(
+            endpoint,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json",
+            },
+            method="GET",
+        )
+        try:
+            with urllib_request.urlopen(req, timeout=max(1, timeout_seconds)) as response:
+                body = response.read().decode("utf-8")
+        except urllib_error.HTTPError as exc:
+            raise ValueError(f"Connector request failed with HTTP {exc.code}") from exc
+        except urllib_error.URLError as exc:
+            raise ValueError(f"Connector request failed: {exc.reason}") from exc
+        parsed = json.loads(body)
+        if isinstance(parsed, dict):
+            candidate = parsed.get("records")
+            if not isinstance(candidate, list):
+                raise ValueError("Connector response object must contain records array")
+            records = [item for item in candidate if isinstance(item, dict)]
+        elif isinstance(parsed, list):
+            records = [item for item in parsed if isinstance(item, dict)]
+        else:
+            raise ValueError("Connector response must be JSON array or object with records array")
+
+    normalized = [
+        _normalize_source_record(item, index)
+        for index, item in enumerate(records)
+        if isinstance(item, dict)
+    ]
+    return normalized, f"connector:{endpoint}"
+
+
+@activity.defn
+def generate_change_bundle_stub_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    workflow_id = _sanitize_filename_component(str(payload.get("workflow_id", "unknown")))
+    repo_root = str(payload.get("repo_root", "."))
+    output_dir = str(payload.get("output_dir", "screehshots_evidence"))
+    docs_parity_evidence_path = str(payload.get("docs_parity_evidence_path", ""))
+
+    output_path = _resolve_safe_output_dir(repo_root, output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    bundle_json_path = output_path / f"self-bootstrap-bundle-{workflow_id}.json"
+    bundle_patch_path = output_path / f"self-bootstrap-bundle-{workflow_id}.patch"
+
+    bundle = {
+        "workflow_id": workflow_id,
+        "repo_root": repo_root,
+        "status": "stubbed",
+        "merge_ready": True,
+        "note": "This is a deterministic stub bundle; applying/merging is out-of-scope for F03-MH-09 slice 1.",
+        "docs_parity_evidence_path": docs_parity_evidence_path,
+        "diff_summary": {
+            "files_changed": 0,
+            "insertions": 0,
+            "deletions": 0,
+            "note": "No actual code changes generated in this stub.",
+        },
+        "artifacts": {
+            "bundle_json": str(bundle_json_path),
+            "bundle_patch": str(bundle_patch_path),
+        },
+    }
+
+    bundle_json_path.write_text(json.dumps(bundle, indent=2) + "\n", encoding="utf-8")
+    bundle_patch_path.write_text(
+        "\n".join(
+            [
+                "# Self-bootstrap bundle stub (no-op)",
+                "# This file intentionally contains no patch hunks.",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    return {
+        "status": "complete",
+        "workflow_id": workflow_id,
+        "bundle_json_path": str(bundle_json_path),
+        "bundle_patch_path": str(bundle_patch_path),
+        "diff_summary": bundle["diff_summary"],
+    }
+
+
+def _default_migration_source_records() -> list[dict[str, Any]]:
+    return [
+        {
+            "source_id": "mx-001",
+            "full_name": "Alex Rivera",
+            "email": "alex.rivera@example.com",
+            "created_at": "2026-01-15T10:00:00Z",
+            "active": True,
+        },
+        {
+            "source_id": "mx-002",
+            "full_name": "Sam Jordan",
+            "email": "sam.jordan@example.com",
+            "created_at": "2026-01-20T12:30:00Z",
+            "active": True,
+        },
+        {
+            "source_id": "mx-003",
+            "full_name": "Morgan Lee",
+            "email": "morgan.lee@example.com",
+            "created_at": "2026-01-28T08:45:00Z",
+            "active": False,
+        },
+    ]
+
+
+def _resolve_source_file(repo_root: str, source_path: str) -> Path:
+    input_path = _resolve_safe_input_path(repo_root, source_path)
+    if not input_path.exists():
+        raise ValueError(f"source_path does not exist: {source_path}")
+    if not input_path.is_file():
+        raise ValueError(f"source_path is not a file: {source_path}")
+    return input_path
+
+
+def _normalize_extracted_records(
+    records: list[Any], start_index: int
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Normalize raw rows; start_index keeps row-N identifiers stable across chunks."""
+    normalized_records: list[dict[str, Any]] = []
+    extraction_errors: list[str] = []
+    for offset, raw in enumerate(records):
+        if not isinstance(raw, dict):
+            continue
+        index = start_index + offset
+        source_id = str(raw.get("source_id", "")).strip()
+        source_identifier = source_id or f"row-{index + 1}"
+        if not str(raw.get("full_name", "")).strip():
+            extraction_errors.append(f"{source_identifier}: missing full_name")
+        if not str(raw.get("email", "")).strip():
+            extraction_errors.append(f"{source_identifier}: missing email")
+        normalized_records.append(_normalize_source_record(raw, index))
+    return normalized_records, extraction_errors
+
+
+STREAM_READ_BLOCK_BYTES = 64 * 1024
+DEFAULT_EXTRACT_CHUNK_SIZE = 1000
+
+
+def _read_csv_chunk(
+    input_path: Path, cursor: dict[str, Any], chunk_size: int
+) -> tuple[list[Any], dict[str, Any], bool]:
+    """Read up to chunk_size CSV rows starting at cursor["byte_offset"].
+
+    Lines are pulled from the file handle one at a time, so the byte offset
+    after the last row is exact even when quoted fields span several lines.
+    """
+    byte_offset = int(cursor.get("byte_offset", 0))
+    fieldnames = cursor.get("fieldnames") if isinstance(cursor.get("fieldnames"), list) else None
+    consumed = byte_offset
+
+    with input_path.open("rb") as handle:
+        handle.seek(byte_offset)
+
+        def lines():
+            nonlocal consumed
+            for raw_line in iter(handle.readline, b""):
+                consumed += len(raw_line)
+                yield raw_line.decode("utf-8")
+
+        line_source = lines()
+        if fieldnames is None:
+            fieldnames = next(csv.reader(line_source), [])
+        reader = csv.DictReader(line_source, fieldnames=fieldnames)
+        rows: list[Any] = []
+        for row in reader:
+            rows.append(dict(row))
+            if len(rows) >= chunk_size:
+                break
+        done = consumed >= os.fstat(handle.fileno()).st_size
+
+    next_cursor = {
+        "byte_offset": consumed,
+        "row_index": int(cursor.get("row_index", 0)) + len(rows),
+        "fieldnames": fieldnames,
+    }
+    return rows, next_cursor, done
+
+
+_JSON_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_JSON_STRING_SPECIAL = re.compile(rb'["\\]')
+_JSON_NON_WHITESPACE = re.compile(rb"[^ \t\r\n]")
+
+
+def _locate_json_records_start(handle: Any) -> int | None:
+    """Return the byte offset just past the records array's opening bracket.
+
+    For an object source this is the top-level "records" key, the one batch
+    mode reads: the scan tracks nesting depth and strings, so a "records" key
+    inside a nested object (or text inside a string) is skipped.
+    """
+    head = handle.read(STREAM_READ_BLOCK_BYTES)
+    stripped = head.lstrip()
+    if stripped.startswith(b"\xef\xbb\xbf"):
+        stripped = stripped[3:].lstrip()
+    if stripped.startswith(b"["):
+        return head.find(b"[") + 1
+    if not stripped.startswith(b"{"):
+        raise ValueError("Unsupported JSON structure for source_path.")
+
+    block_start = head.find(b"{") + 1
+    block = head[block_start:]
+    depth = 1
+    in_string = escaped = False
+    # Leading bytes of the current top-level string, enough to recognise the key.
+    string_head = bytearray()
+    # "key": a top-level string just closed; "value": `"records":` was just read.
+    pending: str | None = None
+    while block:
+        i = 0
+        while i < len(block):
+            if escaped:
+                escaped = False
+                if depth == 1 and len(string_head) <= len("records"):
+                    string_head += block[i : i + 1]
+                i += 1
+                continue
+            if in_string:
+                match = _JSON_STRING_SPECIAL.search(block, i)
+                stop = match.start() if match else len(block)
+                if depth == 1 and len(string_head) <= len("records"):
+                    string_head += block[i : min(stop, i + 16)]
+                if match is None:
+                    break
+                i = match.end()
+                if match.group() == b"\\":
+                    escaped = True
+                    continue
+                in_string = False
+                if depth == 1:
+                    pending = "key" if bytes(string_head) == b"records" else None
+                continue
+            if pending is not None:
+                match = _JSON_NON_WHITESPACE.search(block, i)
+                if match is None:
+                    break
+                i = match.start()
+                if pending == "key" and block[i : i + 1] == b":":
+                    pending = "value"
+                    i += 1
+                    continue
+                if pending == "value" and block[i : i + 1] == b"[":
+                    return block_start + i + 1
+                pending = None
+            match = _JSON_STRUCTURAL.search(block, i)
+            if match is None:
+                break
+            i = match.end()
+            char = match.group()
+            if char == b'"':
+                in_string = True
+                string_head.clear()
+            elif char in (b"{", b"["):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return None
+        block_start += len(block)
+        block = handle.read(STREAM_READ_BLOCK_BYTES)
+    return None
+
+
+def _read_json_chunk(
+    input_path: Path, cursor: dict[str, Any], chunk_size: int
+) -> tuple[list[Any], dict[str, Any], bool, list[str]]:
+    """Incrementally decode up to chunk_size elements of the source JSON array.
+
+    Accepts a top-level array or an object with a "records" array. The
+    cursor stores the byte offset of the next unread element.
+    """
+    errors: list[str] = []
+    decoder = json.JSONDecoder()
+    with input_path.open("rb") as handle:
+        if "byte_offset" in cursor:
+            byte_offset = int(cursor["byte_offset"])
+        else:
+            located = _locate_json_records_start(handle)
+            if located is None:
+                errors.append("JSON object is missing records array; defaulting to empty.")
+                return [], {"byte_offset": 0, "row_index": 0}, True, errors
+            byte_offset = located
+        handle.seek(byte_offset)
+
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        eof = False
+        consumed = byte_offset
+        rows: list[Any] = []
+        done = False
+        while len(rows) < chunk_size:
+            stripped = buffer.lstrip(" \t\r\n,")
+            consumed += len(buffer[: len(buffer) - len(stripped)].encode("utf-8"))
+            buffer = stripped
+            if buffer.startswith("]"):
+                done = True
+                break
+            value: Any = None
+            end = -1
+            if buffer:
+                try:
+                    value, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    end = -1
+            if end < 0 or (end == len(buffer) and not eof):
+                if eof:
+                    if not buffer:
+                        done = True
+                        break
+                    raise ValueError(
+                        f"Malformed JSON array in source_path near byte {consumed}."
+                    )
+                block = handle.read(STREAM_READ_BLOCK_BYTES)
+                eof = not block
+                buffer += text_decoder.decode(block, final=eof)
+                continue
+            rows.append(value)
+            consumed += len(buffer[:end].encode("utf-8"))
+            buffer = buffer[end:]
+
+    next_cursor = {
+        "byte_offset": consumed,
+        "row_index": int(cursor.get("row_index", 0)) + len(rows),
+    }
+    return rows, next_cursor, done, errors
+
+
+@activity.defn
+async def extract_mendix_records_chunk_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """Extract one fixed-size chunk of a file source, resuming from payload["cursor"].
+
+    Only the chunk is held in memory; the returned next_cursor is passed back
+    in to continue, so multi-GB exports stream with bounded worker memory.
+    """
+    repo_root = str(payload.get("repo_root", "."))
+    source_path_value = str(payload.get("source_path") or "").strip()
+    if not source_path_value:
+        raise ValueError("source_path is required for streaming extraction")
+    source_format_override = str(payload.get("source_format", "")).strip().lower()
+    chunk_size = max(1, int(payload.get("extract_chunk_size", DEFAULT_EXTRACT_CHUNK_SIZE)))
+    cursor = payload.get("cursor") if isinstance(payload.get("cursor"), dict) else {}
+
+    input_path = _resolve_source_file(repo_root, source_path_value)
+    detected_format = source_format_override or input_path.suffix.lower().lstrip(".")
+    extraction_errors: list[str] = []
+    if detected_format == "csv":
+        rows, next_cursor, done = await asyncio.to_thread(
+            _read_csv_chunk, input_path, cursor, chunk_size
+        )
+    elif detected_format == "json":
+        rows, next_cursor, done, extraction_errors = await asyncio.to_thread(
+            _read_json_chunk, input_path, cursor, chunk_size
+        )
+    else:
+        raise ValueError(
+            f"Unsupported source file format: {detected_format}. Use .json or .csv."
+        )
+
+    normalized_records, normalize_errors = _normalize_extracted_records(
+        rows, int(cursor.get("row_index", 0))
+    )
+    extraction_errors.extend(normalize_errors)
+    result = {
+        "records": normalized_records,
+        "count": len(normalized_records),
+        "source_system": f"file:{input_path.name}",
+        "errors": extraction_errors,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "done": done,
+    }
+    if bool(payload.get("checksums", False)):
+        result["checksums"] = {"keys": _source_key_checksum(normalized_records)}
+    return result
+
+
+@activity.defn
+async def extract_mendix_records_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    await asyncio.sleep(
+        _simulated_latency_seconds(_resolve_latency_profile(payload), SIMULATED_LATENCY_SECONDS["extract"])
+    )
+    repo_root = str(payload.get("repo_root", "."))
+    source_path_value = payload.get("source_path")
+    source_format_override = str(payload.get("source_format", "")).strip().lower()
+    source_mode = str(payload.get("source_mode", "inline")).strip().lower()
+    source = payload.get("source") if isinstance(payload.get("source"), dict) else {}
+    extraction_errors: list[str] = []
+
+    records: list[dict[str, Any]] | None = None
+    source_system = str(source.get("system", "mendix_stub"))
+
+    if source_mode == "connector":
+        records, source_system = _build_connector_source_records(payload)
+    elif isinstance(source_path_value, str) and source_path_value.strip():
+        input_path = _resolve_source_file(repo_root, source_path_value.strip())
+        detected_format = source_format_override or input_path.suffix.lower().lstrip(".")
+        raw = input_path.read_text(encoding="utf-8")
+        source_system = f"file:{input_path.name}"
+        if detected_format == "json":
+            parsed = json.loads(raw)
+            if isinstance(parsed, dict):
+                candidate = parsed.get("records")
+                if isinstance(candidate, list):
+                    records = [item for item in candidate if isinstance(item, dict)]
+                else:
+                    extraction_errors.append("JSON object is missing records array; defaulting to empty.")
+                    records = []
+            elif isinstance(parsed, list):
+                records = [item for item in parsed if isinstance(item, dict)]
+            else:
+                raise ValueError("Unsupported JSON structure for source_path.")
+        elif detected_format == "csv":
+            reader = csv.DictReader(raw.splitlines())
+            records = [dict(row) for row in reader]
+        else:
+            raise ValueError(
+                f"Unsupported source file format: {detected_format}. Use .json or .csv."
+            )
+    else:
+        in_memory_records = source.get("records")
+        if isinstance(in_memory_records, list):
+            records = [item for item in in_memory_records if isinstance(item, dict)]
+        else:
+            records = _default_migration_source_records()
+
+    normalized_records, normalize_errors = _normalize_extracted_records(records, 0)
+    extraction_errors.extend(normalize_errors)
+
+    result = {
+        "records": normalized_records,
+        "count": len(normalized_records),
+        "source_system": source_system,
+        "errors": extraction_errors,
+    }
+    if bool(payload.get("checksums", False)):
+        result["checksums"] = {"keys": _source_key_checksum(normalized_records)}
+    return result
+
+
+def _transform_source_record(record: dict[str, Any]) -> dict[str, Any]:
+    full_name = str(record.get("full_name", "")).strip()
+    parts = [part for part in full_name.split(" ") if part]
+    first_name = parts[0] if parts else ""
+    last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
+    return {
+        "source_identifier": str(record.get("source_identifier") or record.get("source_id", "")),
+        "target_id": str(record.get("source_id", "")),
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": str(record.get("email", "")).strip().lower(),
+        "created_at": str(record.get("created_at", "")),
+        "is_active": bool(record.get("active", True)),
+    }
+
+
+@activity.defn
+async def transform_record_activity(record: dict[str, Any]) -> dict[str, Any]:
+    # The argument is the record itself, so only the worker-wide profile applies.
+    await asyncio.sleep(
+        _simulated_latency_seconds(_worker_latency_profile, SIMULATED_LATENCY_SECONDS["transform_record"])
+    )
+    return _transform_source_record(record)
+
+
+@activity.defn
+async def transform_records_batch_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """Transform a chunk of records in one activity; row errors are reported, not raised.
+
+    With `incremental` set, rows whose transformed content hash matches the
+    row already in the load target are returned under `unchanged` instead of
+    `records`, so they never reach the load step.
+    With `checksums` set, the result carries row checksums of the keys and
+    transformed rows, plus the target's copy of any unchanged rows.
+    """
+    await asyncio.sleep(
+        _simulated_latency_seconds(
+            _resolve_latency_profile(payload), SIMULATED_LATENCY_SECONDS["transform_record"]
+        )
+    )
+    records = payload.get("records") if isinstance(payload.get("records"), list) else []
+    transformed: list[dict[str, Any]] = []
+    failures: list[dict[str, Any]] = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        try:
+            transformed.append(_transform_source_record(record))
+        except Exception as error:
+            failures.append(
+                {
+                    "source_identifier": str(
+                        record.get("source_identifier") or record.get("source_id", "")
+                    ),
+                    "error": str(error),
+                }
+            )
+
+    with_checksums = bool(payload.get("checksums", False))
+    repo_root = str(payload.get("repo_root", "."))
+    target_config = payload.get("load_target") if isinstance(payload.get("load_target"), dict) else {}
+    key_checksum = empty_row_checksum()
+    row_checksum = empty_row_checksum()
+    if with_checksums:
+        for record in transformed:
+            target_id = str(record.get("target_id", ""))
+            _add_to_row_checksum(key_checksum, target_id)
+            _add_to_row_checksum(row_checksum, target_id, _record_content_hash(record))
+
+    unchanged: list[dict[str, Any]] = []
+    if transformed and bool(payload.get("incremental", False)):
+        target = _resolve_load_target(repo_root, target_config)
+        hashes = {
+            str(record.get("target_id", "")): _record_content_hash(record) for record in transformed
+        }
+        known = await asyncio.to_thread(target.content_hashes, list(hashes))
+        changed: list[dict[str, Any]] = []
+        for record in transformed:
+            target_id = str(record.get("target_id", ""))
+            if target_id and known.get(target_id) == hashes[target_id]:
+                unchanged.append(
+                    {
+                        "source_identifier": str(record.get("source_identifier", "")),
+                        "target_id": target_id,
+                    }
+                )
+            else:
+                changed.append(record)
+        transformed = changed
+
+    result: dict[str, Any] = {"records": transformed, "failures": failures, "unchanged": unchanged}
+    if with_checksums:
+        target_checksum = empty_row_checksum()
+        if unchanged:
+            # Unchanged rows skip the load step, so their target side is read here.
+            stored = await asyncio.to_thread(
+                target.content_hashes, [row["target_id"] for row in unchanged]
+            )
+            for target_id, content_hash in stored.items():
+                _add_to_row_checksum(target_checksum, target_id, content_hash)
+        result["checksums"] = {"keys": key_checksum, "rows": row_checksum, "target": target_checksum}
+    return result
+
+
+@activity.defn
+async def load_record_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    await asyncio.sleep(
+        _simulated_latency_seconds(_resolve_latency_profile(payload), SIMULATED_LATENCY_SECONDS["load_record"])
+    )
+    record = payload.get("record") if isinstance(payload.get("record"), dict) else {}
+    dry_run = bool(payload.get("dry_run", True))
+    source_identifier = str(record.get("source_identifier", ""))
+    target_id = str(record.get("target_id", "unknown"))
+    if dry_run:
+        return {
+            "source_identifier": source_identifier,
+            "target_id": target_id,
+            "status": "dry_run_skipped",
+            "write_performed": False,
+        }
+    return {
+        "source_identifier": source_identifier,
+        "target_id": target_id,
+        "status": "loaded",
+        "write_performed": True,
+    }
+
+
+def _load_idempotency_key(target_id: str) -> str:
+    return hashlib.sha256(target_id.encode("utf-8")).hexdigest()
+
+
+def _record_content_hash(record: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# Row checksums: every row lands in one of CHECKSUM_BUCKETS buckets by a hash
+# of its key, and each bucket keeps [row count, sum of row hashes mod 2**64].
+# Sums are order-independent and merge by addition, so digests from any mix
+# of extract chunks, transform batches and load batches compare bucket by
+# bucket, and a mismatch points at the few rows of one bucket.
+CHECKSUM_BUCKETS = 32
+_CHECKSUM_MODULUS = 1 << 64
+
+
+def empty_row_checksum() -> list[list[Any]]:
+    return [[0, "0"] for _ in range(CHECKSUM_BUCKETS)]
+
+
+def _checksum_bucket(key: str) -> int:
+    return int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % CHECKSUM_BUCKETS
+
+
+def _add_to_row_checksum(checksum: list[list[Any]], key: str, content_hash: str = "") -> None:
+    """Add one row; with no content_hash only the key is covered."""
+    row_hash = int(hashlib.sha256(f"{key}\0{content_hash}".encode("utf-8")).hexdigest()[:16], 16)
+    bucket = checksum[_checksum_bucket(key)]
+    bucket[0] += 1
+    bucket[1] = format((int(bucket[1], 16) + row_hash) % _CHECKSUM_MODULUS, "x")
+
+
+def merge_row_checksums(*checksums: Any) -> list[list[Any]]:
+    """Sum row checksums; anything that is not a checksum is ignored."""
+    merged = empty_row_checksum()
+    for checksum in checksums:
+        if not isinstance(checksum, list) or len(checksum) != CHECKSUM_BUCKETS:
+            continue
+        for bucket, (count, total) in zip(merged, checksum):
+            bucket[0] += int(count)
+            bucket[1] = format((int(bucket[1], 16) + int(str(total), 16)) % _CHECKSUM_MODULUS, "x")
+    return merged
+
+
+def _mismatched_buckets(expected: list[list[Any]], actual: list[list[Any]]) -> list[dict[str, Any]]:
+    return [
+        {"bucket": index, "expected_count": want[0], "actual_count": got[0]}
+        for index, (want, got) in enumerate(zip(expected, actual))
+        if want[0] != got[0] or want[1] != got[1]
+    ]
+
+
+def _source_key_checksum(records: list[dict[str, Any]]) -> list[list[Any]]:
+    checksum = empty_row_checksum()
+    for record in records:
+        _add_to_row_checksum(checksum, str(record.get("source_id", "")))
+    return checksum
+
+
+class SqliteLoadTarget:
+    """Local SQLite load target; one transaction per batch, keyed by idempotency key.
+
+    Each row stores the content hash of its record, so incremental reruns
+    probe the target itself by primary key to find rows that are unchanged.
+    """
+
+    def __init__(self, db_path: Path, table: str) -> None:
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid load target table name: {table}")
+        self.db_path = db_path
+        self.table = table
+
+    def _ensure_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "idempotency_key TEXT PRIMARY KEY, "
+            "target_id TEXT NOT NULL, "
+            "source_identifier TEXT NOT NULL, "
+            "record_json TEXT NOT NULL, "
+            "content_hash TEXT, "
+            "loaded_at TEXT NOT NULL)"
+        )
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        if "content_hash" not in columns:
+            # Tables created before content hashes; their rows are hashed on read.
+            conn.execute(f"ALTER TABLE {self.table} ADD COLUMN content_hash TEXT")
+
+    def content_hashes(self, target_ids: list[str]) -> dict[str, str]:
+        """Return target_id -> content hash for the ids present in the target."""
+        if not target_ids or not self.db_path.exists():
+            return {}
+        found: dict[str, str] = {}
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table,)
+            ).fetchone():
+                return {}
+            with conn:
+                self._ensure_table(conn)
+            keys = [_load_idempotency_key(target_id) for target_id in target_ids]
+            for start in range(0, len(keys), 500):
+                window = keys[start : start + 500]
+                placeholders = ",".join("?" for _ in window)
+                for target_id, content_hash, record_json in conn.execute(
+                    f"SELECT target_id, content_hash, "
+                    f"CASE WHEN content_hash IS NULL THEN record_json END FROM {self.table} "
+                    f"WHERE idempotency_key IN ({placeholders})",
+                    window,
+                ):
+                    found[target_id] = content_hash or hashlib.sha256(
+                        record_json.encode("utf-8")
+                    ).hexdigest()
+        finally:
+            conn.close()
+        return found
+
+    def write_batch(self, rows: list[dict[str, Any]]) -> set[str]:
+        """Upsert rows, returning the idempotency keys that were written or changed."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                self._ensure_table(conn)
+                keys = [row["idempotency_key"] for row in rows]
+                existing: dict[str, str] = {}
+                for start in range(0, len(keys), 500):
+                    window = keys[start : start + 500]
+                    placeholders = ",".join("?" for _ in window)
+                    existing.update(
+                        conn.execute(
+                            f"SELECT idempotency_key, record_json FROM {self.table} "
+                            f"WHERE idempotency_key IN ({placeholders})",
+                            window,
+                        )
+                    )
+                loaded_at = datetime.now(timezone.utc).isoformat()
+                pending = []
+                for row in rows:
+                    record_json = json.dumps(row["record"], sort_keys=True)
+                    # A retried batch finds its rows already present with the same
+                    # JSON and writes nothing; a changed source row is updated.
+                    if existing.get(row["idempotency_key"]) == record_json:
+                        continue
+                    pending.append(
+                        (
+                            row["idempotency_key"],
+                            row["target_id"],
+                            row["source_identifier"],
+                            record_json,
+                            hashlib.sha256(record_json.encode("utf-8")).hexdigest(),
+                            loaded_at,
+                        )
+                    )
+                conn.executemany(
+                    f"INSERT INTO {self.table} "
+                    "(idempotency_key, target_id, source_identifier, record_json, content_hash, loaded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (idempotency_key) DO UPDATE SET "
+                    "source_identifier = excluded.source_identifier, "
+                    "record_json = excluded.record_json, "
+                    "content_hash = excluded.content_hash, loaded_at = excluded.loaded_at",
+                    pending,
+                )
+        finally:
+            conn.close()
+        return {item[0] for item in pending}
+
+
+MIGRATION_LOAD_TARGETS = {"sqlite": SqliteLoadTarget}
+
+
+def _resolve_load_target(repo_root: str, config: dict[str, Any]) -> SqliteLoadTarget:
+    kind = str(config.get("kind", "sqlite")).strip().lower()
+    target_cls = MIGRATION_LOAD_TARGETS.get(kind)
+    if target_cls is None:
+        raise ValueError(f"Unsupported load target kind: {kind}")
+    db_path = _resolve_safe_input_path(
+        repo_root, str(config.get("path") or ".ari/migration-target.sqlite")
+    )
+    return target_cls(db_path, str(config.get("table") or "migrated_records"))
+
+
+@activity.defn
+async def load_records_batch_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """Bulk-load a batch of transformed records in one round trip to the load target.
+
+    Rows are keyed by a SHA-256 of target_id, so a retried batch never
+    writes a row twice; rows already present with the same content report
+    write_performed=False.
+    """
+    records = payload.get("records") if isinstance(payload.get("records"), list) else []
+    dry_run = bool(payload.get("dry_run", True))
+    repo_root = str(payload.get("repo_root", "."))
+    target_config = payload.get("load_target") if isinstance(payload.get("load_target"), dict) else {}
+
+    results: list[dict[str, Any]] = []
+    rows: list[dict[str, Any]] = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        source_identifier = str(record.get("source_identifier", ""))
+        target_id = str(record.get("target_id", "")).strip()
+        if not target_id:
+            results.append(
+                {
+                    "source_identifier": source_identifier,
+                    "target_id": "",
+                    "status": "failed",
+                    "write_performed": False,
+                    "error": "missing target_id",
+                }
+            )
+            continue
+        rows.append(
+            {
+                "idempotency_key": _load_idempotency_key(target_id),
+                "target_id": target_id,
+                "source_identifier": source_identifier,
+                "record": record,
+            }
+        )
+
+    written: set[str] = set()
+    target_checksum: list[list[Any]] | None = None
+    load_started = time.monotonic()
+    if rows and not dry_run:
+        target = _resolve_load_target(repo_root, target_config)
+        written = await asyncio.to_thread(target.write_batch, rows)
+        if bool(payload.get("checksums", False)):
+            # Checksum what the target now holds, not what was sent to it.
+            stored = await asyncio.to_thread(
+                target.content_hashes, [row["target_id"] for row in rows]
+            )
+            target_checksum = empty_row_checksum()
+            for target_id, content_hash in stored.items():
+                _add_to_row_checksum(target_checksum, target_id, content_hash)
+    elif bool(payload.get("checksums", False)):
+        # Dry runs write nothing; the load stage's own view of the rows stands in.
+        target_checksum = empty_row_checksum()
+        for row in rows:
+            _add_to_row_checksum(target_checksum, row["target_id"], _record_content_hash(row["record"]))
+    load_seconds = time.monotonic() - load_started
+    if rows and load_seconds > 0:
+        record_activity_histogram(
+            MIGRATION_ROWS_PER_SECOND_METRIC, len(rows) / load_seconds, {"dry_run": dry_run}
+        )
+
+    for row in rows:
+        results.append(
+            {
+                "source_identifier": row["source_identifier"],
+                "target_id": row["target_id"],
+                "idempotency_key": row["idempotency_key"],
+                "status": "dry_run_skipped" if dry_run else "loaded",
+                "write_performed": row["idempotency_key"] in written,
+            }
+        )
+
+    return {
+        "results": results,
+        "loaded_count": len([item for item in results if item["status"] == "loaded"]),
+        "skipped_count": len([item for item in results if item["status"] == "dry_run_skipped"]),
+        "failed_count": len([item for item in results if item["status"] == "failed"]),
+        "written_count": len(written),
+        **({"checksums": {"target": target_checksum}} if target_checksum is not None else {}),
+    }
+
+
+@activity.defn
+async def validate_migration_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    latency_profile = _resolve_latency_profile(payload)
+    await asyncio.sleep(
+        _simulated_latency_seconds(latency_profile, SIMULATED_LATENCY_SECONDS["validate"])
+    )
+    extracted_count = int(payload.get("extracted_count", 0))
+    transformed_count = int(payload.get("transformed_count", 0))
+    loaded_count = int(payload.get("loaded_count", 0))
+    transformed_records = (
+        payload.get("transformed_records")
+        if isinstance(payload.get("transformed_records"), list)
+        else []
+    )
+    sample_verify_count = int(payload.get("sample_verify_count", 2))
+    sample_verify_count = max(1, min(sample_verify_count, 10))
+    sampled = transformed_records[:sample_verify_count]
+    sampled_ids = [
+        str(item.get("target_id"))
+        for item in sampled
+        if isinstance(item, dict) and item.get("target_id")
+    ]
+    result = {
+        "row_count_match": extracted_count == transformed_count,
+        "extracted_count": extracted_count,
+        "transformed_count": transformed_count,
+        "loaded_count": loaded_count,
+        "sample_verified_count": len(sampled_ids),
+        "sample_verified_ids": sampled_ids,
+        "latency_profile": latency_profile,
+    }
+    if str(payload.get("validation_mode", "")).strip().lower() == "checksum":
+        result.update(_validate_row_checksums(payload))
+    return result
+
+
+MAX_NARROWED_MISMATCH_ROWS = 100
+
+
+def _iter_source_file_records(input_path: Path, source_format: str) -> Any:
+    """Yield normalized records from a file source, one chunk in memory at a time."""
+    cursor: dict[str, Any] = {}
+    while True:
+        if source_format == "csv":
+            rows, next_cursor, done = _read_csv_chunk(input_path, cursor, DEFAULT_EXTRACT_CHUNK_SIZE)
+        else:
+            rows, next_cursor, done, _ = _read_json_chunk(
+                input_path, cursor, DEFAULT_EXTRACT_CHUNK_SIZE
+            )
+        records, _ = _normalize_extracted_records(rows, int(cursor.get("row_index", 0)))
+        yield from records
+        if done or not rows:
+            return
+        cursor = next_cursor
+
+
+NARROWING_HEARTBEAT_EVERY_ROWS = 1000
+
+
+@activity.defn
+def narrow_checksum_mismatches_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """Re-read the source rows of mismatched checksum buckets and check each in the target.
+
+    This rescans the whole source file, so it runs as its own activity with
+    heartbeats rather than inside validate_migration_activity. Rows are
+    reported as transform_failed, missing_in_target, content_mismatch or
+    duplicate_key, at most MAX_NARROWED_MISMATCH_ROWS of them.
+    """
+    buckets = {int(bucket) for bucket in payload.get("buckets", []) if str(bucket).isdigit()}
+    repo_root = str(payload.get("repo_root", "."))
+    source_path_value = str(payload.get("source_path") or "").strip()
+    if not source_path_value or str(payload.get("source_mode", "")).strip().lower() == "connector":
+        return {
+            "checksum_mismatched_rows": [],
+            "checksum_narrowing_skipped": "row narrowing needs a file source (source_path)",
+        }
+    input_path = _resolve_source_file(repo_root, source_path_value)
+    source_format = (
+        str(payload.get("source_format", "")).strip().lower()
+        or input_path.suffix.lower().lstrip(".")
+    )
+    dry_run = bool(payload.get("dry_run", True))
+    target_config = payload.get("load_target") if isinstance(payload.get("load_target"), dict) else {}
+    target = _resolve_load_target(repo_root, target_config)
+
+    expected: dict[str, str | None] = {}
+    source_identifiers: dict[str, str] = {}
+    duplicates: list[str] = []
+    for scanned, record in enumerate(_iter_source_file_records(input_path, source_format), start=1):
+        if scanned % NARROWING_HEARTBEAT_EVERY_ROWS == 0 and activity.in_activity():
+            activity.heartbeat({"rows_scanned": scanned})
+        source_id = str(record.get("source_id", ""))
+        if _checksum_bucket(source_id) not in buckets:
+            continue
+        if source_id in source_identifiers:
+            duplicates.append(source_id)
+            continue
+        source_identifiers[source_id] = str(record.get("source_identifier", ""))
+        try:
+            expected[source_id] = _record_content_hash(_transform_source_record(record))
+        except Exception:
+            expected[source_id] = None
+
+    stored = {} if dry_run else target.content_hashes([key for key, value in expected.items() if value])
+    # Two source rows with one key load as a single target row.
+    rows: list[dict[str, Any]] = [
+        {
+            "source_identifier": source_identifiers[source_id],
+            "target_id": source_id,
+            "bucket": _checksum_bucket(source_id),
+            "issue": "duplicate_key",
+        }
+        for source_id in dict.fromkeys(duplicates)
+    ][:MAX_NARROWED_MISMATCH_ROWS]
+    for source_id, content_hash in expected.items():
+        if content_hash is None:
+            issue = "transform_failed"
+        elif dry_run:
+            continue
+        elif source_id not in stored:
+            issue = "missing_in_target"
+        elif stored[source_id] != content_hash:
+            issue = "content_mismatch"
+        else:
+            continue
+        if len(rows) >= MAX_NARROWED_MISMATCH_ROWS:
+            break
+        rows.append(
+            {
+                "source_identifier": source_identifiers[source_id],
+                "target_id": source_id,
+                "bucket": _checksum_bucket(source_id),
+                "issue": issue,
+            }
+        )
+    return {"checksum_mismatched_rows": rows}
+
+
+def _validate_row_checksums(payload: dict[str, Any]) -> dict[str, Any]:
+    """Compare stage checksums bucket by bucket.
+
+    Extract and transform are compared on keys (every extracted row was
+    transformed), transform and target on row content (every transformed
+    row is in the target as transformed). A comparison whose first stage
+    has no checksum, e.g. extract or transform on a resumed run, is left
+    out; with nothing compared, or no rows covered, checksum_match is False.
+    Mismatched buckets are narrowed to rows by narrow_checksum_mismatches_activity.
+    """
+    checksums = payload.get("checksums") if isinstance(payload.get("checksums"), dict) else {}
+    comparisons: dict[str, list[dict[str, Any]]] = {}
+    if checksums.get("extract_keys") is not None:
+        comparisons["extract_vs_transform"] = _mismatched_buckets(
+            merge_row_checksums(checksums.get("extract_keys")),
+            merge_row_checksums(checksums.get("transform_keys")),
+        )
+    rows_covered = 0
+    if checksums.get("transform_rows") is not None:
+        comparisons["transform_vs_target"] = _mismatched_buckets(
+            merge_row_checksums(checksums.get("transform_rows")),
+            merge_row_checksums(checksums.get("target")),
+        )
+        rows_covered = sum(
+            int(count) for count, _ in merge_row_checksums(checksums.get("transform_rows"))
+        )
+    buckets = sorted({item["bucket"] for mismatches in comparisons.values() for item in mismatches})
+    result: dict[str, Any] = {
+        "validation_mode": "checksum",
+        "checksum_match": bool(comparisons) and rows_covered > 0 and not buckets,
+        "checksum_rows_covered": rows_covered,
+        "checksum_compared": sorted(comparisons),
+        "checksum_mismatched_buckets": comparisons,
+        "checksum_mismatched_bucket_ids": buckets,
+    }
+    if not comparisons:
+        result["checksum_unverified_reason"] = "no stage checksums to compare (resumed run?)"
+    elif rows_covered == 0:
+        result["checksum_unverified_reason"] = "no rows covered by the checksums"
+    return result
+
+
+@activity.defn
+def write_migration_audit_part_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    """Write one streamed chunk's audit rows as JSONL next to the report.
+
+    Parts are named by continue-as-new generation and chunk (`part`) within it.
+    """
+    migration_id = _sanitize_filename_component(str(payload.get("migration_id", "unknown")))
+    generation = int(payload.get("generation", 0))
+    part = int(payload.get("part", 0))
+    repo_root = str(payload.get("repo_root", "."))
+    output_dir = str(payload.get("output_dir", "screehshots_evidence"))
+    rows = payload.get("record_audit_rows") if isinstance(payload.get("record_audit_rows"), list) else []
+    output_path = _resolve_safe_output_dir(repo_root, output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    part_path = output_path / f"migration-audit-{migration_id}-part-{generation:04d}-{part:05d}.jsonl"
+    part_path.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows if isinstance(row, dict)),
+        encoding="utf-8",
+    )
+    return {"path": str(part_path), "row_count": len(rows)}
+
+
+@activity.defn
+def write_migration_report_activity(payload: dict[str, Any]) -> dict[str, Any]:
+    time.sleep(
+        _simulated_latency_seconds(_resolve_latency_profile(payload), SIMULATED_LATENCY_SECONDS["report"])
+    )
+    migration_id = _sanitize_filename_component(str(payload.get("migration_id", "unknown")))
+    repo_root = str(payload.get("repo_root", "."))
+    output_dir = str(payload.get("output_dir", "screehshots_evidence"))
+    output_path = _resolve_safe_output_dir(repo_root, output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    report = dict(payload)
+    audit_part_paths = report.pop("audit_part_paths", None) or []
+    if audit_part_paths:
+        record_audit_rows = list(report.get("record_audit_rows") or [])
+        for part in audit_part_paths:
+            part_path = _resolve_safe_input_path(repo_root, str(part))
+            with part_path.open(encoding="utf-8") as handle:
+                record_audit_rows.extend(json.loads(line) for line in handle if line.strip())
+        report["record_audit_rows"] = record_audit_rows
+    report_path = output_path / f"migration-report-{migration_id}.json"
+    report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return {"report_path": str(report_path)}
+
+
+# Activities are split into pools, each polled on its own task queue, so a
+# burst of slow LLM calls can't hold the slots cheap activities need.
+# Workflows and the light pool share the base queue; the others append a
+# suffix to it (ari-smoke-llm, ari-smoke-io).
+ACTIVITY_POOLS = {
+    "llm": [
+        execute_dogfood_block_activity,
+    ],
+    "io": [
+        run_pr_agent_loop_activity,
+        generate_change_bundle_stub_activity,
+        extract_mendix_records_activity,
+        extract_mendix_records_chunk_activity,
+        load_record_activity,
+        load_records_batch_activity,
+        narrow_checksum_mismatches_activity,
+        write_migration_audit_part_activity,
+        write_migration_report_activity,
+    ],
+    "light": [
+        execute_assignment_activity,
+        generate_simulation_artifact_activity,
+        transform_record_activity,
+        transform_records_batch_activity,
+        validate_migration_activity,
+    ],
+}
+ACTIVITIES = [fn for pool in ACTIVITY_POOLS.values() for fn in pool]
+_ACTIVITY_POOL_BY_NAME = {fn.__name__: pool for pool, fns in ACTIVITY_POOLS.items() for fn in fns}
+
+
+def pool_task_queue(task_queue: str, pool: str) -> str:
+    return task_queue if pool == "light" else f"{task_queue}-{pool}"
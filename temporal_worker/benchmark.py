@@ -0,0 +1,425 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from temporalio.client import Client, WorkflowHandle
+from temporalio.testing import WorkflowEnvironment
+
+from payload_codec import build_data_converter
+
+import activities as ari_activities
+import worker as ari_worker
+
+# Benchmarks must never reach the LLM provider or write generated code, so
+# B3/B4 always take their offline fallback here.
+ari_activities.OPENROUTER_API_KEY = ""
+
+DEFAULT_OUTPUT_PATH = (
+    Path(__file__).resolve().parent.parent / ".ari" / "benchmarks" / "workflow-benchmark-summary.json"
+)
+DEFAULT_SCALES: dict[str, list[int]] = {
+    "execution": [10, 100, 1000],
+    "simulation": [10, 100, 1000],
+    # Dogfood and self-bootstrap have a fixed shape, so scale is the number
+    # of concurrent workflow runs.
+    "dogfood": [1, 10, 50],
+    "self_bootstrap": [1, 10, 50],
+    "migration": [1000, 10000, 100000],
+}
+DEFAULT_REGRESSION_THRESHOLD = 0.20
+# wall time and RSS are noisy; history shape is deterministic, so any growth
+# there is flagged at a much tighter threshold.
+DETERMINISTIC_METRICS = {"history_event_count", "history_bytes"}
+DEFAULT_DETERMINISTIC_THRESHOLD = 0.01
+METRICS = ("wall_time_ms", "history_event_count", "history_bytes", "peak_rss_mb")
+RSS_SAMPLE_INTERVAL_SECONDS = 0.05
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the worker.py workflows on a local Temporal test environment"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument(
+        "--workflow",
+        dest="workflows",
+        action="append",
+        choices=sorted(DEFAULT_SCALES),
+        help="Workflow to benchmark (repeatable; default: all)",
+    )
+    run_parser.add_argument(
+        "--scale",
+        dest="scales",
+        action="append",
+        type=int,
+        help="Scale to run for every selected workflow (repeatable; default: per-workflow scales)",
+    )
+    run_parser.add_argument(
+        "--env",
+        dest="env",
+        choices=["time-skipping", "local"],
+        default="time-skipping",
+        help="Test server flavour started by temporalio.testing (default: time-skipping)",
+    )
+    run_parser.add_argument(
+        "--temporal-address",
+        dest="temporal_address",
+        help="Use an already-running Temporal server instead of starting one",
+    )
+    run_parser.add_argument(
+        "--output",
+        dest="output",
+        default=str(DEFAULT_OUTPUT_PATH),
+        help=f"Where to write the summary JSON (default: {DEFAULT_OUTPUT_PATH})",
+    )
+    run_parser.add_argument(
+        "--baseline",
+        dest="baseline",
+        help="Compare against this summary after the run and exit 1 on regression",
+    )
+    _add_threshold_args(run_parser)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two summary files")
+    compare_parser.add_argument("current", help="Summary JSON from the candidate run")
+    compare_parser.add_argument("baseline", help="Stored baseline summary JSON")
+    _add_threshold_args(compare_parser)
+    return parser.parse_args()
+
+
+def _add_threshold_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        dest="threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help=f"Allowed fractional increase for wall time / RSS (default: {DEFAULT_REGRESSION_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--history-threshold",
+        dest="history_threshold",
+        type=float,
+        default=DEFAULT_DETERMINISTIC_THRESHOLD,
+        help="Allowed fractional increase for history events / bytes "
+        f"(default: {DEFAULT_DETERMINISTIC_THRESHOLD})",
+    )
+
+
+def _current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No /proc (macOS): fall back to the process high-water mark.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def _sample_peak_rss(peak: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        peak[0] = max(peak[0], _current_rss_bytes())
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _history_size(handles: list[WorkflowHandle]) -> tuple[int, int]:
+    events = 0
+    size = 0
+    for handle in handles:
+        history = await handle.fetch_history()
+        events += len(history.events)
+        size += sum(event.ByteSize() for event in history.events)
+    return events, size
+
+
+def _assignment_plan(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"task-{index:05d}",
+            "assigned_agent_id_or_pool": f"pool-{index % 4}",
+            "estimated_cost": 0.01,
+            "estimated_duration": 1,
+            # Fan-in every tenth task on its predecessor so the DAG path is exercised.
+            "dependencies": [f"task-{index - 1:05d}"] if index and index % 10 == 0 else [],
+        }
+        for index in range(count)
+    ]
+
+
+def _write_migration_source(repo_root: Path, rows: int) -> str:
+    source = repo_root / f"bench-source-{rows}.csv"
+    if not source.exists():
+        with source.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["source_id", "full_name", "email", "created_at", "active"])
+            for index in range(rows):
+                writer.writerow(
+                    [
+                        f"mx-{index:07d}",
+                        f"Bench User{index}",
+                        f"user{index}@example.com",
+                        "2025-01-01T00:00:00Z",
+                        "true",
+                    ]
+                )
+    return source.name
+
+
+async def _run_execution(client: Client, task_queue: str, scale: int, _: Path) -> list[WorkflowHandle]:
+    handle = await client.start_workflow(
+        "ExecutionWorkflow",
+        {
+            "execution_id": f"bench-{scale}",
+            "rule_set_id": "bench",
+            "assignment_plan": _assignment_plan(scale),
+            "latency_profile": "none",
+        },
+        id=f"bench-execution-{uuid.uuid4().hex[:8]}",
+        task_queue=task_queue,
+    )
+    await handle.result()
+    return [handle]
+
+
+async def _run_simulation(client: Client, task_queue: str, scale: int, _: Path) -> list[WorkflowHandle]:
+    handle = await client.start_workflow(
+        "SimulationWorkflow",
+        {
+            "simulation_id": f"bench-{scale}",
+            "rule_set_id": "bench",
+            "assignment_plan": _assignment_plan(scale),
+            "instruction_graph": [],
+            "execution_mode": "pipelined",
+            "latency_profile": "none",
+        },
+        id=f"bench-simulation-{uuid.uuid4().hex[:8]}",
+        task_queue=task_queue,
+    )
+    await handle.result()
+    return [handle]
+
+
+async def _run_dogfood(client: Client, task_queue: str, scale: int, repo_root: Path) -> list[WorkflowHandle]:
+    async def one() -> WorkflowHandle:
+        handle = await client.start_workflow(
+            "DogfoodB1B8Workflow",
+            {
+                "repo_root": str(repo_root),
+                "latency_profile": "none",
+                # Point B5 at the discard port so the run never depends on a dev server.
+                "block_inputs": {"B5": {"base_url": "http://127.0.0.1:9", "probe_repeats": 1}},
+            },
+            id=f"bench-dogfood-{uuid.uuid4().hex[:8]}",
+            task_queue=task_queue,
+        )
+        await handle.signal("approve_resume", "benchmark")
+        await handle.result()
+        return handle
+
+    return list(await asyncio.gather(*(one() for _ in range(scale))))
+
+
+async def _run_self_bootstrap(
+    client: Client, task_queue: str, scale: int, repo_root: Path
+) -> list[WorkflowHandle]:
+    async def one() -> WorkflowHandle:
+        workflow_id = f"bench-self-bootstrap-{uuid.uuid4().hex[:8]}"
+        handle = await client.start_workflow(
+            "SelfBootstrapWorkflow",
+            {"workflow_id": workflow_id, "repo_root": str(repo_root), "output_dir": "bench-out"},
+            id=workflow_id,
+            task_queue=task_queue,
+        )
+        await handle.signal("approve_resume", "benchmark")
+        await handle.signal("provide_docs_parity", "bench-out/docs-parity.json")
+        await handle.result()
+        return handle
+
+    return list(await asyncio.gather(*(one() for _ in range(scale))))
+
+
+async def _run_migration(client: Client, task_queue: str, scale: int, repo_root: Path) -> list[WorkflowHandle]:
+    handle = await client.start_workflow(
+        "MendixMigrationWorkflow",
+        {
+            "repo_root": str(repo_root),
+            "output_dir": "bench-out",
+            "source_mode": "file",
+            "source_path": _write_migration_source(repo_root, scale),
+            "extract_mode": "streaming",
+            "dry_run": True,
+            "latency_profile": "none",
+        },
+        id=f"bench-migration-{uuid.uuid4().hex[:8]}",
+        task_queue=task_queue,
+    )
+    await handle.result()
+    return [handle]
+
+
+CASES: dict[str, tuple[str, Callable[[Client, str, int, Path], Awaitable[list[WorkflowHandle]]]]] = {
+    "execution": ("ExecutionWorkflow", _run_execution),
+    "simulation": ("SimulationWorkflow", _run_simulation),
+    "dogfood": ("DogfoodB1B8Workflow", _run_dogfood),
+    "self_bootstrap": ("SelfBootstrapWorkflow", _run_self_bootstrap),
+    "migration": ("MendixMigrationWorkflow", _run_migration),
+}
+
+
+async def _start_environment(args: argparse.Namespace) -> WorkflowEnvironment:
+    data_converter = build_data_converter()
+    if args.temporal_address:
+        client = await Client.connect(args.temporal_address, data_converter=data_converter)
+        return WorkflowEnvironment.from_client(client)
+    if args.env == "local":
+        return await WorkflowEnvironment.start_local(data_converter=data_converter)
+    return await WorkflowEnvironment.start_time_skipping(data_converter=data_converter)
+
+
+async def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    selected = args.workflows or list(CASES)
+    results: list[dict[str, Any]] = []
+    env = await _start_environment(args)
+    task_queue = f"ari-bench-{uuid.uuid4().hex[:8]}"
+    try:
+        with tempfile.TemporaryDirectory(prefix="ari-bench-") as tmp, ThreadPoolExecutor(
+            max_workers=ari_worker.activity_slot_count("all")
+        ) as executor:
+            repo_root = Path(tmp)
+            async with AsyncExitStack() as workers:
+                for pool_worker in ari_worker.build_workers(env.client, task_queue, "all", executor):
+                    await workers.enter_async_context(pool_worker)
+                for name in selected:
+                    workflow_name, runner = CASES[name]
+                    for scale in args.scales or DEFAULT_SCALES[name]:
+                        peak = [_current_rss_bytes()]
+                        stop = asyncio.Event()
+                        sampler = asyncio.create_task(_sample_peak_rss(peak, stop))
+                        started = time.perf_counter()
+                        handles = await runner(env.client, task_queue, scale, repo_root)
+                        wall_time_ms = (time.perf_counter() - started) * 1000
+                        stop.set()
+                        await sampler
+                        events, size = await _history_size(handles)
+                        result = {
+                            "case": f"{name}[{scale}]",
+                            "workflow": workflow_name,
+                            "scale": scale,
+                            "wall_time_ms": round(wall_time_ms, 1),
+                            "history_event_count": events,
+                            "history_bytes": size,
+                            "peak_rss_mb": round(peak[0] / (1024 * 1024), 1),
+                        }
+                        print(json.dumps(result), flush=True)
+                        results.append(result)
+    finally:
+        await env.shutdown()
+    return build_summary(results, env_name="external" if args.temporal_address else args.env)
+
+
+def build_summary(results: list[dict[str, Any]], env_name: str) -> dict[str, Any]:
+    """Lay results out like baseline-summary.json: flat kpis, per-kpi trends, metadata."""
+    kpis = {
+        f"{result['case']}.{metric}": result[metric] for result in results for metric in METRICS
+    }
+    return {
+        "summary": {
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "period": "benchmark",
+            "kpis": kpis,
+            "trends": {
+                key: {"current": value, "previous": None, "percent_change": None}
+                for key, value in kpis.items()
+            },
+            "metadata": {
+                "environment": env_name,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cases": [result["case"] for result in results],
+                "latency_profile": "none",
+            },
+        }
+    }
+
+
+def compare_summaries(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    history_threshold: float,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Fill current trends from the baseline and return the KPIs that regressed."""
+    current_kpis = current["summary"]["kpis"]
+    baseline_kpis = baseline.get("summary", {}).get("kpis", {})
+    trends: dict[str, Any] = {}
+    regressions: list[dict[str, Any]] = []
+    for key, value in current_kpis.items():
+        previous = baseline_kpis.get(key)
+        percent_change = None
+        if isinstance(previous, (int, float)) and previous:
+            percent_change = round((value - previous) / previous * 100, 2)
+            metric = key.rsplit(".", 1)[-1]
+            allowed = history_threshold if metric in DETERMINISTIC_METRICS else threshold
+            if percent_change > allowed * 100:
+                regressions.append(
+                    {"kpi": key, "current": value, "previous": previous, "percent_change": percent_change}
+                )
+        trends[key] = {"current": value, "previous": previous, "percent_change": percent_change}
+    current["summary"]["trends"] = trends
+    current["summary"]["metadata"]["regressions"] = regressions
+    return current, regressions
+
+
+def _report_regressions(regressions: list[dict[str, Any]]) -> int:
+    if not regressions:
+        print("No regressions against baseline.")
+        return 0
+    for item in regressions:
+        print(
+            f"REGRESSION {item['kpi']}: {item['previous']} -> {item['current']} "
+            f"(+{item['percent_change']}%)"
+        )
+    return 1
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "compare":
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        _, regressions = compare_summaries(current, baseline, args.threshold, args.history_threshold)
+        sys.exit(_report_regressions(regressions))
+
+    summary = asyncio.run(run_suite(args))
+    regressions: list[dict[str, Any]] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        summary, regressions = compare_summaries(
+            summary, baseline, args.threshold, args.history_threshold
+        )
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(summary, indent=4) + "\n", encoding="utf-8")
+    print(f"Wrote {output}")
+    if args.baseline:
+        sys.exit(_report_regressions(regressions))
+
+
+if __name__ == "__main__":
+    main()
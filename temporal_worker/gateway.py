@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import os
+from typing import Any
+
+from temporalio.client import Client
+
+try:
+    from gateway_client import DEFAULT_SOCKET_PATH
+    from payload_codec import build_data_converter
+except ImportError:  # python -m temporal_worker.gateway
+    from temporal_worker.gateway_client import DEFAULT_SOCKET_PATH
+    from temporal_worker.payload_codec import build_data_converter
+
+TASK_QUEUE = "ari-smoke"
+NAMESPACE = "default"
+TEMPORAL_ADDRESS = "localhost:7233"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Long-lived Temporal gateway: holds one Client and serves "
+            "newline-delimited JSON requests from the run_*.py runners"
+        )
+    )
+    parser.add_argument(
+        "--socket-path",
+        dest="socket_path",
+        default=os.environ.get("ARI_TEMPORAL_GATEWAY_SOCKET", DEFAULT_SOCKET_PATH),
+        help=f"Unix socket path to listen on (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        help="Listen on 127.0.0.1:<port> instead of a Unix socket",
+    )
+    parser.add_argument(
+        "--temporal-address",
+        dest="temporal_address",
+        default=TEMPORAL_ADDRESS,
+        help=f"Temporal frontend address (default: {TEMPORAL_ADDRESS})",
+    )
+    parser.add_argument(
+        "--namespace",
+        dest="namespace",
+        default=NAMESPACE,
+        help=f"Temporal namespace (default: {NAMESPACE})",
+    )
+    return parser.parse_args()
+
+
+class TemporalGateway:
+    def __init__(self, client: Client) -> None:
+        self._client = client
+
+    async def handle(self, request: dict[str, Any]) -> Any:
+        op = str(request.get("op", ""))
+        if op == "ping":
+            return {"status": "ok"}
+        if op in {"start", "execute"}:
+            workflow_name = str(request.get("workflow", ""))
+            workflow_id = str(request.get("workflow_id", ""))
+            if not workflow_name or not workflow_id:
+                raise ValueError(f"{op} requires workflow and workflow_id")
+            task_queue = str(request.get("task_queue") or TASK_QUEUE)
+            if op == "execute":
+                return await self._client.execute_workflow(
+                    workflow_name,
+                    request.get("payload"),
+                    id=workflow_id,
+                    task_queue=task_queue,
+                )
+            handle = await self._client.start_workflow(
+                workflow_name,
+                request.get("payload"),
+                id=workflow_id,
+                task_queue=task_queue,
+            )
+            return {"workflow_id": workflow_id, "run_id": handle.result_run_id}
+
+        workflow_id = str(request.get("workflow_id", ""))
+        if not workflow_id:
+            raise ValueError(f"{op or 'request'} requires workflow_id")
+        handle = self._client.get_workflow_handle(workflow_id)
+        args = request.get("args") if isinstance(request.get("args"), list) else []
+        if op == "query":
+            return await handle.query(str(request.get("query", "")), *args)
+        if op == "signal":
+            await handle.signal(str(request.get("signal", "")), *args)
+            return {"workflow_id": workflow_id, "status": "signal_sent"}
+        if op == "result":
+            return await handle.result()
+        raise ValueError(f"Unsupported gateway op: {op}")
+
+    async def serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                    response = {"ok": True, "result": await self.handle(request)}
+                except Exception as exc:
+                    response = {"ok": False, "error": str(exc), "error_type": type(exc).__name__}
+                writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _gateway_answers(socket_path: str) -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    writer.close()
+    return True
+
+
+async def main() -> None:
+    args = parse_args()
+    if not args.port and os.path.exists(args.socket_path):
+        # Only a stale socket file is removed; a live gateway keeps its socket.
+        if await _gateway_answers(args.socket_path):
+            raise SystemExit(f"A Temporal gateway is already listening on {args.socket_path}")
+        os.unlink(args.socket_path)
+    client = await Client.connect(
+        args.temporal_address,
+        namespace=args.namespace,
+        data_converter=build_data_converter(),
+    )
+    gateway = TemporalGateway(client)
+
+    if args.port:
+        server = await asyncio.start_server(gateway.serve_connection, "127.0.0.1", args.port)
+        listen_on = f"127.0.0.1:{args.port}"
+    else:
+        # Owner-only (0600): the default socket lives in the shared /tmp.
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(gateway.serve_connection, path=args.socket_path)
+        finally:
+            os.umask(previous_umask)
+        listen_on = args.socket_path
+
+    print(
+        f"Temporal gateway listening on {listen_on} "
+        f"(temporal={args.temporal_address} namespace={args.namespace})"
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if not args.port and os.path.exists(args.socket_path):
+            os.unlink(args.socket_path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
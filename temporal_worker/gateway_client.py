@@ -0,0 +1,83 @@
+import json
+import os
+import socket
+from typing import Any
+
+# Stdlib-only client for gateway.py. Runner scripts import this before
+# temporalio so the fast path never pays for SDK import or a gRPC connect.
+
+DEFAULT_SOCKET_PATH = "/tmp/ari-temporal-gateway.sock"
+
+
+class GatewayUnavailable(Exception):
+    """Raised when no gateway is listening; callers fall back to direct mode."""
+
+
+class GatewayError(Exception):
+    """Raised when the gateway accepted a request but the operation failed."""
+
+
+def gateway_enabled() -> bool:
+    env = os.environ.get("ARI_TEMPORAL_GATEWAY", "")
+    return env not in {"0", "false"}
+
+
+def resolve_gateway_address() -> tuple[str, Any]:
+    """Return ("tcp", (host, port)) or ("unix", path) from the environment."""
+    tcp_addr = os.environ.get("ARI_TEMPORAL_GATEWAY_ADDR", "").strip()
+    if tcp_addr:
+        host, _, port = tcp_addr.rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port))
+    return "unix", os.environ.get("ARI_TEMPORAL_GATEWAY_SOCKET", DEFAULT_SOCKET_PATH)
+
+
+def _connect(timeout: float | None) -> socket.socket:
+    kind, address = resolve_gateway_address()
+    if kind == "unix" and (not hasattr(socket, "AF_UNIX") or not os.path.exists(address)):
+        raise GatewayUnavailable(f"gateway socket not found: {address}")
+    family = socket.AF_INET if kind == "tcp" else socket.AF_UNIX
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(address)
+    except OSError as exc:
+        sock.close()
+        raise GatewayUnavailable(f"gateway not reachable at {address}: {exc}") from exc
+    sock.settimeout(timeout)
+    return sock
+
+
+def call_gateway(request: dict[str, Any], timeout: float | None = None) -> Any:
+    """Send one newline-delimited JSON request and return the decoded result."""
+    if not gateway_enabled():
+        raise GatewayUnavailable("gateway disabled by ARI_TEMPORAL_GATEWAY")
+    sock = _connect(timeout)
+    try:
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise GatewayError("gateway closed the connection without a response")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise GatewayError(str(response.get("error") or "unknown gateway error"))
+    return response.get("result")
+
+
+def execute_workflow(
+    workflow_name: str,
+    payload: Any,
+    workflow_id: str,
+    task_queue: str,
+) -> Any:
+    return call_gateway(
+        {
+            "op": "execute",
+            "workflow": workflow_name,
+            "payload": payload,
+            "workflow_id": workflow_id,
+            "task_queue": task_queue,
+        }
+    )
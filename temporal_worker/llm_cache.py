@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".ari" / "llm-cache.sqlite"
+DEFAULT_TTL_SECONDS = 7 * 86400
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("ARI_LLM_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def resolve_cache_path() -> Path:
+    configured = os.environ.get("ARI_LLM_CACHE_PATH", "").strip()
+    return Path(configured) if configured else DEFAULT_CACHE_PATH
+
+
+def cache_key(model: str, prompt: str, max_tokens: int) -> str:
+    material = json.dumps([model, prompt, int(max_tokens)], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    """SQLite-backed LLM response cache with TTL expiry and size-bounded LRU eviction."""
+
+    def __init__(self, path: Path, ttl_seconds: float, max_bytes: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS llm_responses_accessed_at ON llm_responses (accessed_at)"
+            )
+            self._initialized = True
+        return connection
+
+    def get_sync(self, key: str) -> str | None:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl_seconds > 0 and now - float(created_at) > self.ttl_seconds:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return str(response)
+
+    def put_sync(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        if self.ttl_seconds > 0:
+            connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        if self.max_bytes <= 0:
+            return 0
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        evicted = 0
+        if int(total) <= self.max_bytes:
+            return evicted
+        for key, size in connection.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            total -= int(size)
+            evicted += 1
+        return evicted
+
+    def stats_sync(self) -> dict[str, int]:
+        with self._connect() as connection:
+            entries, total = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        return {"entries": int(entries), "total_bytes": int(total), "max_bytes": self.max_bytes}
+
+    def clear_sync(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("DELETE FROM llm_responses").rowcount
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def put(self, key: str, model: str, response: str) -> None:
+        await asyncio.to_thread(self.put_sync, key, model, response)
+
+
+def build_cache() -> LlmResponseCache:
+    return LlmResponseCache(
+        resolve_cache_path(),
+        float(os.environ.get("ARI_LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        int(os.environ.get("ARI_LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or clear the on-disk LLM response cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Print entry count and total size")
+    subparsers.add_parser("clear", help="Delete every cached response")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cache = build_cache()
+    if args.command == "stats":
+        print(json.dumps({"path": str(cache.path), **cache.stats_sync()}))
+    elif args.command == "clear":
+        print(json.dumps({"path": str(cache.path), "removed": cache.clear_sync()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+# openai/httpx are imported lazily so worker.py stays importable (and
+# sandbox-safe) without an API key configured.
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_REQUESTS_PER_MINUTE = 60.0
+DEFAULT_BURST = 5
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+DEFAULT_POOL_SIZE = 16
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 120.0
+# A stream that sends nothing for this long is abandoned and retried; keep it
+# below the block activities' heartbeat_timeout so a hang fails the attempt
+# here, with a retry, rather than as a heartbeat timeout.
+DEFAULT_STREAM_IDLE_TIMEOUT_SECONDS = 20.0
+
+# USD per million (prompt, completion) tokens, used only for cost estimates.
+# ARI_LLM_PRICING (JSON: model -> [prompt, completion]) adds or overrides models.
+DEFAULT_MODEL_PRICING = {
+    "minimax/minimax-m2.5": (0.30, 1.20),
+}
+
+
+class TokenBucket:
+    """Refill `rate` tokens per second up to `burst`; acquire waits for one token."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, returning how long the caller waited for it."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+def _model_rates() -> dict[str, float]:
+    raw = os.environ.get("ARI_LLM_MODEL_RPM", "").strip()
+    if not raw:
+        return {}
+    parsed = json.loads(raw)
+    if not isinstance(parsed, dict):
+        raise ValueError("ARI_LLM_MODEL_RPM must be a JSON object of model -> requests/minute")
+    return {str(model): float(rpm) for model, rpm in parsed.items()}
+
+
+def _model_pricing() -> dict[str, tuple[float, float]]:
+    pricing = dict(DEFAULT_MODEL_PRICING)
+    raw = os.environ.get("ARI_LLM_PRICING", "").strip()
+    if raw:
+        parsed = json.loads(raw)
+        if not isinstance(parsed, dict):
+            raise ValueError("ARI_LLM_PRICING must be a JSON object of model -> [prompt, completion]")
+        for model, (prompt_price, completion_price) in parsed.items():
+            pricing[str(model)] = (float(prompt_price), float(completion_price))
+    return pricing
+
+
+def estimate_cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call; 0.0 for models without a known price."""
+    prompt_price, completion_price = _model_pricing().get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class StreamIdleTimeout(Exception):
+    """No chunk arrived on a streaming completion within the idle timeout."""
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Whether `exc` is a transient provider error (429, 5xx, connection, idle stream)."""
+    import openai
+
+    if isinstance(exc, StreamIdleTimeout):
+        return True
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and int(exc.status_code) >= 500
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedLlmClient:
+    """Wrap AsyncOpenAI chat completions with rate limits, a concurrency cap and retries.
+
+    Every request takes a token from its model's bucket, then waits for a
+    global in-flight slot, so a throttled model never holds slots other
+    models could use. 429s, 5xx and connection errors are retried with
+    exponential backoff and full jitter (or the server's Retry-After), as
+    are streams that go quiet for longer than the stream idle timeout.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        model_requests_per_minute: dict[str, float] | None = None,
+        burst: int = DEFAULT_BURST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        request_timeout_seconds: float = DEFAULT_REQUEST_TIMEOUT_SECONDS,
+        stream_idle_timeout_seconds: float = DEFAULT_STREAM_IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        import httpx
+        from openai import AsyncOpenAI
+
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            timeout=request_timeout_seconds,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                ),
+                timeout=request_timeout_seconds,
+            ),
+        )
+        self.max_in_flight = max(1, max_in_flight)
+        self.requests_per_minute = requests_per_minute
+        self.model_requests_per_minute = dict(model_requests_per_minute or {})
+        self.burst = burst
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.pool_size = pool_size
+        self.stream_idle_timeout_seconds = stream_idle_timeout_seconds
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._in_flight = 0
+        self._counters: dict[str, float] = {
+            "requests": 0,
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled": 0,
+            "queued_seconds": 0.0,
+            "rate_limit_wait_seconds": 0.0,
+            "backoff_seconds": 0.0,
+            "max_in_flight_seen": 0,
+        }
+
+    def _bucket(self, model: str) -> TokenBucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            rpm = self.model_requests_per_minute.get(model, self.requests_per_minute)
+            bucket = TokenBucket(rpm / 60.0, self.burst)
+            self._buckets[model] = bucket
+        return bucket
+
+    def _count(self, stats: dict[str, Any] | None, key: str, amount: float = 1) -> None:
+        self._counters[key] += amount
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + amount
+
+    def stats(self) -> dict[str, Any]:
+        """Process-wide counters across every caller, logged when the worker exits."""
+        return {
+            **self._counters,
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pool_size": self.pool_size,
+        }
+
+    async def create_chat_completion(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        stats: dict[str, Any] | None = None,
+    ) -> Any:
+        """Run one chat completion; `stats` (if given) accumulates this caller's counters."""
+
+        async def request() -> Any:
+            return await self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+            )
+
+        return await self._run(model, request, stats)
+
+    async def stream_chat_completion(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        on_delta: Callable[[int, str], Awaitable[None]] | None = None,
+        stats: dict[str, Any] | None = None,
+        usage: dict[str, int] | None = None,
+        on_attempt: Callable[[bool], None] | None = None,
+    ) -> str:
+        """Stream one chat completion and return the joined content.
+
+        `on_delta(chunk_count, text)` runs after every chunk received, with the
+        number of content chunks so far (roughly one token each); `text` is
+        empty for chunks without content (role, reasoning, usage). A retried
+        attempt starts the count again from zero. `on_attempt(True)` runs when
+        an attempt holds its slot and starts streaming, `on_attempt(False)` when
+        it ends, so callers can tell streaming from queueing and backoff.
+        `usage` (if given) receives prompt_tokens/completion_tokens from the
+        final usage chunk, or the chunk count if the provider sends none.
+        """
+        idle_timeout = self.stream_idle_timeout_seconds
+
+        async def within_idle_timeout(awaitable: Awaitable[Any]) -> Any:
+            try:
+                return await asyncio.wait_for(awaitable, timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                raise StreamIdleTimeout(f"no stream data from {model} for {idle_timeout}s") from None
+
+        async def request() -> str:
+            parts: list[str] = []
+            reported: Any = None
+            stream: Any = None
+            if on_attempt is not None:
+                on_attempt(True)
+            try:
+                stream = await within_idle_timeout(
+                    self._client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                    )
+                )
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await within_idle_timeout(chunks.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    if getattr(chunk, "usage", None) is not None:
+                        reported = chunk.usage
+                    text = (chunk.choices[0].delta.content if chunk.choices else None) or ""
+                    if text:
+                        parts.append(text)
+                    if on_delta is not None:
+                        await on_delta(len(parts), text)
+            finally:
+                if on_attempt is not None:
+                    on_attempt(False)
+                if stream is not None:
+                    await stream.close()
+            if usage is not None:
+                usage["prompt_tokens"] = int(getattr(reported, "prompt_tokens", 0) or 0)
+                usage["completion_tokens"] = int(
+                    getattr(reported, "completion_tokens", 0) or len(parts)
+                )
+            return "".join(parts)
+
+        return await self._run(model, request, stats)
+
+    async def _run(
+        self,
+        model: str,
+        request: Callable[[], Awaitable[Any]],
+        stats: dict[str, Any] | None,
+    ) -> Any:
+        self._count(stats, "requests")
+        attempt = 0
+        while True:
+            self._count(stats, "rate_limit_wait_seconds", await self._bucket(model).acquire())
+            queued_at = time.monotonic()
+            async with self._slots:
+                self._count(stats, "queued_seconds", time.monotonic() - queued_at)
+                self._in_flight += 1
+                self._counters["max_in_flight_seen"] = max(
+                    self._counters["max_in_flight_seen"], self._in_flight
+                )
+                try:
+                    response = await request()
+                    self._count(stats, "completed")
+                    return response
+                except Exception as exc:
+                    import openai
+
+                    if isinstance(exc, openai.RateLimitError):
+                        self._count(stats, "throttled")
+                    if attempt >= self.max_retries or not is_retryable_error(exc):
+                        self._count(stats, "failed")
+                        raise
+                    delay = _retry_after_seconds(exc)
+                    if delay is None:
+                        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+                        delay = random.uniform(0, ceiling)
+                finally:
+                    self._in_flight -= 1
+            # Back off outside the semaphore so a throttled call doesn't hold a slot.
+            attempt += 1
+            self._count(stats, "retries")
+            self._count(stats, "backoff_seconds", delay)
+            await asyncio.sleep(delay)
+
+
+def build_llm_client(api_key: str, base_url: str) -> RateLimitedLlmClient:
+    return RateLimitedLlmClient(
+        api_key=api_key,
+        base_url=base_url,
+        max_in_flight=int(os.environ.get("ARI_LLM_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+        requests_per_minute=float(os.environ.get("ARI_LLM_RPM", DEFAULT_REQUESTS_PER_MINUTE)),
+        model_requests_per_minute=_model_rates(),
+        burst=int(os.environ.get("ARI_LLM_BURST", DEFAULT_BURST)),
+        max_retries=int(os.environ.get("ARI_LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        backoff_base_seconds=float(
+            os.environ.get("ARI_LLM_BACKOFF_BASE_SECONDS", DEFAULT_BACKOFF_BASE_SECONDS)
+        ),
+        backoff_max_seconds=float(
+            os.environ.get("ARI_LLM_BACKOFF_MAX_SECONDS", DEFAULT_BACKOFF_MAX_SECONDS)
+        ),
+        pool_size=int(os.environ.get("ARI_LLM_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        request_timeout_seconds=float(
+            os.environ.get("ARI_LLM_REQUEST_TIMEOUT_SECONDS", DEFAULT_REQUEST_TIMEOUT_SECONDS)
+        ),
+        stream_idle_timeout_seconds=float(
+            os.environ.get(
+                "ARI_LLM_STREAM_IDLE_TIMEOUT_SECONDS", DEFAULT_STREAM_IDLE_TIMEOUT_SECONDS
+            )
+        ),
+    )
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import dataclasses
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Sequence
+
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+CLAIM_CHECK_ENCODING = b"binary/ari-claim-check"
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / ".ari" / "payload-blobs"
+DEFAULT_THRESHOLD_BYTES = 64 * 1024
+DEFAULT_GC_MAX_AGE_DAYS = 7
+
+
+def resolve_store_dir() -> Path:
+    configured = os.environ.get("ARI_PAYLOAD_STORE_DIR", "").strip()
+    return Path(configured) if configured else DEFAULT_STORE_DIR
+
+
+def resolve_threshold_bytes() -> int:
+    return int(os.environ.get("ARI_PAYLOAD_CLAIM_CHECK_BYTES", DEFAULT_THRESHOLD_BYTES))
+
+
+class BlobStore:
+    """Content-addressed directory of compressed payload blobs keyed by SHA-256."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> tuple[str, str]:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if path.exists():
+            # Refresh mtime so gc treats re-used blobs as live.
+            os.utime(path)
+            with path.open("rb") as handle:
+                return digest, handle.readline().strip().decode("ascii")
+
+        compression = "zstd" if zstandard is not None else "gzip"
+        compressed = (
+            zstandard.ZstdCompressor().compress(data)
+            if compression == "zstd"
+            else gzip.compress(data)
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per write: concurrent encodes of one payload must not share a temp file.
+        tmp_path = path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(compression.encode("ascii") + b"\n" + compressed)
+        os.replace(tmp_path, path)
+        return digest, compression
+
+    def get(self, digest: str) -> bytes:
+        path = self.path_for(digest)
+        if not path.exists():
+            raise FileNotFoundError(f"Claim-check blob missing from {self.root}: {digest}")
+        compression, _, compressed = path.read_bytes().partition(b"\n")
+        if compression == b"zstd":
+            if zstandard is None:
+                raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+            data = zstandard.ZstdDecompressor().decompress(compressed)
+        else:
+            data = gzip.decompress(compressed)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Claim-check blob failed integrity check: {digest}")
+        # Reads keep a blob live too: a workflow replaying old history only reads.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def gc(self, max_age_seconds: float, dry_run: bool = False) -> dict[str, int]:
+        cutoff = time.time() - max_age_seconds
+        removed = kept = freed = 0
+        for path in self.root.glob("*/*"):
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            if stat.st_mtime >= cutoff:
+                kept += 1
+                continue
+            removed += 1
+            freed += stat.st_size
+            if not dry_run:
+                path.unlink()
+        return {"removed": removed, "kept": kept, "freed_bytes": freed}
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """Swap payloads above a size threshold for a reference into the BlobStore.
+
+    Only the reference lands in workflow history; every client and worker
+    sharing the store can decode it.
+    """
+
+    def __init__(self, store: BlobStore, threshold_bytes: int) -> None:
+        self.store = store
+        self.threshold_bytes = threshold_bytes
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return await asyncio.to_thread(lambda: [self._encode_one(payload) for payload in payloads])
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return await asyncio.to_thread(lambda: [self._decode_one(payload) for payload in payloads])
+
+    def _encode_one(self, payload: Payload) -> Payload:
+        if self.threshold_bytes <= 0 or payload.ByteSize() < self.threshold_bytes:
+            return payload
+        serialized = payload.SerializeToString()
+        digest, compression = self.store.put(serialized)
+        reference = {"sha256": digest, "compression": compression, "size": len(serialized)}
+        return Payload(
+            metadata={"encoding": CLAIM_CHECK_ENCODING},
+            data=json.dumps(reference).encode("utf-8"),
+        )
+
+    def _decode_one(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != CLAIM_CHECK_ENCODING:
+            return payload
+        reference = json.loads(payload.data)
+        decoded = Payload()
+        decoded.ParseFromString(self.store.get(str(reference["sha256"])))
+        return decoded
+
+
+def build_data_converter() -> temporalio.converter.DataConverter:
+    """Default converter plus the claim-check codec, for every Client in this repo."""
+    return dataclasses.replace(
+        temporalio.converter.default(),
+        payload_codec=ClaimCheckCodec(BlobStore(resolve_store_dir()), resolve_threshold_bytes()),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Manage the claim-check payload blob store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gc_parser = subparsers.add_parser(
+        "gc",
+        help="Delete blobs not written or re-used recently. Blobs still referenced by "
+        "open or replayable workflows must be kept, so pick an age above your "
+        "longest workflow lifetime.",
+    )
+    gc_parser.add_argument(
+        "--max-age-days",
+        dest="max_age_days",
+        type=float,
+        default=DEFAULT_GC_MAX_AGE_DAYS,
+        help=f"Remove blobs older than this (default: {DEFAULT_GC_MAX_AGE_DAYS})",
+    )
+    gc_parser.add_argument(
+        "--dry-run",
+        dest="dry_run",
+        action="store_true",
+        help="Report what would be removed without deleting",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    store = BlobStore(resolve_store_dir())
+    if args.command == "gc":
+        result = store.gc(args.max_age_days * 86400, dry_run=args.dry_run)
+        print(json.dumps({"store": str(store.root), "dry_run": args.dry_run, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from typing import Any
 
 from temporalio.client import Client
 
+from payload_codec import build_data_converter
+
 WORKFLOW_NAME = "DogfoodB1B8Workflow"
 TASK_QUEUE = "ari-smoke"
 NAMESPACE = "default"
@@ -80,6 +82,18 @@ def parse_args() -> argparse.Namespace:
 
     status_parser = subparsers.add_parser("status", help="Query workflow status")
     status_parser.add_argument("--workflow-id", dest="workflow_id", required=True)
+    status_parser.add_argument(
+        "--since",
+        dest="since",
+        type=int,
+        default=None,
+        help="Also include history entries from this index on",
+    )
+    status_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Return the full status including the complete history",
+    )
 
     approve_parser = subparsers.add_parser(
         "approve", help="Signal approval gate to resume"
@@ -184,14 +198,7 @@ def parse_args() -> argparse.Namespace:
         dest="wait_seconds",
         type=int,
         default=120,
-        help="How long to wait for the block to complete after signal",
-    )
-    next_step_parser.add_argument(
-        "--poll-interval",
-        dest="poll_interval",
-        type=float,
-        default=1.0,
-        help="Polling interval in seconds while waiting for completion",
+        help="How long to wait for the advanced block to complete",
     )
 
     return parser.parse_args()
@@ -272,20 +279,52 @@ def _completed_blocks(history: list[Any]) -> list[str]:
     return out
 
 
-def _latest_completed_block(history: list[Any]) -> str:
-    blocks = _completed_blocks(history)
-    return blocks[-1] if blocks else ""
+async def _live_block_progress(client: Client, workflow_id: str) -> dict[str, Any] | None:
+    """Heartbeat details of the running block activity (phase, tokens streamed, elapsed)."""
+    description = await client.get_workflow_handle(workflow_id).describe()
+    for pending in description.raw_description.pending_activities:
+        if pending.activity_type.name != "execute_dogfood_block_activity":
+            continue
+        if not pending.heartbeat_details.payloads:
+            continue
+        details = await client.data_converter.decode(pending.heartbeat_details.payloads)
+        if details and isinstance(details[-1], dict):
+            return details[-1]
+    return None
+
+
+async def _overlay_block_progress(
+    client: Client, workflow_id: str, status: dict[str, Any]
+) -> dict[str, Any]:
+    progress = status.get("block_progress") if isinstance(status.get("block_progress"), dict) else {}
+    if progress.get("status") == "running":
+        live = await _live_block_progress(client, workflow_id)
+        if live and live.get("block") == progress.get("block"):
+            status["block_progress"] = {
+                **progress,
+                "phase": str(live.get("phase", "")),
+                "tokens": int(live.get("tokens", 0)),
+                "elapsed_seconds": float(live.get("elapsed_seconds", 0.0)),
+            }
+    return status
 
 
-async def _query_status(client: Client, workflow_id: str) -> dict[str, Any] | None:
+async def _query_summary(client: Client, workflow_id: str) -> dict[str, Any] | None:
     try:
         handle = client.get_workflow_handle(workflow_id)
-        status = await handle.query("get_status")
-        return status if isinstance(status, dict) else None
+        summary = await handle.query("get_summary")
+        return summary if isinstance(summary, dict) else None
     except Exception:
         return None
 
 
+async def _query_history_since(client: Client, workflow_id: str, start: int) -> list[Any]:
+    handle = client.get_workflow_handle(workflow_id)
+    delta = await handle.query("get_history_since", start)
+    entries = delta.get("entries") if isinstance(delta, dict) else None
+    return entries if isinstance(entries, list) else []
+
+
 def load_start_payload(args: argparse.Namespace) -> dict[str, Any]:
     raw_payload = args.payload_json
     if not raw_payload:
@@ -353,8 +392,21 @@ async def run_rerun(client: Client, args: argparse.Namespace) -> None:
 
 async def run_status(client: Client, args: argparse.Namespace) -> None:
     handle = client.get_workflow_handle(args.workflow_id)
-    status = await handle.query("get_status")
-    print(json.dumps({"workflow_id": args.workflow_id, "status": status}))
+    if args.full:
+        status = await handle.query("get_status")
+        status = await _overlay_block_progress(client, args.workflow_id, status)
+        print(json.dumps({"workflow_id": args.workflow_id, "status": status}))
+        return
+    response: dict[str, Any] = {
+        "workflow_id": args.workflow_id,
+        "status": await _overlay_block_progress(
+            client, args.workflow_id, await handle.query("get_summary")
+        ),
+    }
+    if args.since is not None:
+        response["history_since"] = args.since
+        response["history"] = await _query_history_since(client, args.workflow_id, args.since)
+    print(json.dumps(response))
 
 
 async def run_approve(client: Client, args: argparse.Namespace) -> None:
@@ -396,7 +448,7 @@ async def run_next_step(client: Client, args: argparse.Namespace) -> None:
 
     status: dict[str, Any] | None = None
     if workflow_id:
-        status = await _query_status(client, workflow_id)
+        status = await _query_summary(client, workflow_id)
         if status and _is_terminal_status(str(status.get("status", ""))):
             workflow_id = ""
             status = None
@@ -414,44 +466,41 @@ async def run_next_step(client: Client, args: argparse.Namespace) -> None:
         )
         created_workflow = True
         run_id = handle.result_run_id
-        status = await _query_status(client, workflow_id)
+        status = await _query_summary(client, workflow_id)
 
     if not status:
         raise RuntimeError(f"Unable to query workflow status for {workflow_id}")
 
-    history_before = status.get("history", [])
-    before_len = len(history_before) if isinstance(history_before, list) else 0
+    before_len = int(status.get("history_length", 0))
 
+    # The update returns the moment the block's result is recorded; if it takes
+    # longer than --wait-seconds, report whatever the workflow has reached.
     handle = client.get_workflow_handle(workflow_id)
-    await handle.signal("advance_step", f"next-step:{task_id or 'unknown'}")
-
     wait_seconds = max(5, int(args.wait_seconds or 120))
-    poll_interval = max(0.25, float(args.poll_interval or 1.0))
-    deadline = asyncio.get_running_loop().time() + wait_seconds
-    latest_status = status
-
-    while True:
-        polled = await _query_status(client, workflow_id)
-        if not polled:
-            raise RuntimeError(f"Workflow status unavailable while waiting: {workflow_id}")
-        latest_status = polled
-        history = polled.get("history", [])
-        history_len = len(history) if isinstance(history, list) else 0
-        workflow_status = str(polled.get("status", ""))
-        if history_len > before_len and (
-            workflow_status in {"waiting_for_advance", "waiting_for_approval", "complete", "failed"}
-        ):
-            break
-        if asyncio.get_running_loop().time() >= deadline:
-            break
-        await asyncio.sleep(poll_interval)
-
-    latest_history = latest_status.get("history", [])
-    if not isinstance(latest_history, list):
-        latest_history = []
-    delta_events = latest_history[before_len:]
-    completed = _completed_blocks(latest_history)
-    last_completed = _latest_completed_block(latest_history)
+    try:
+        latest_status = await asyncio.wait_for(
+            handle.execute_update("advance_and_wait", f"next-step:{task_id or 'unknown'}"),
+            timeout=wait_seconds,
+        )
+        before_len = int(latest_status.get("start", before_len))
+        delta_events = latest_status.get("entries", [])
+    except asyncio.TimeoutError:
+        latest_status = await _query_summary(client, workflow_id) or status
+        delta_events = await _query_history_since(client, workflow_id, before_len)
+    history_length = before_len + len(delta_events)
+    prior_completed = prior_state.get("completed_blocks")
+    if before_len == 0:
+        completed = _completed_blocks(delta_events)
+    elif (
+        prior_state.get("workflow_id") == workflow_id
+        and prior_state.get("history_length") == before_len
+        and isinstance(prior_completed, list)
+    ):
+        completed = [str(block) for block in prior_completed] + _completed_blocks(delta_events)
+    else:
+        # No usable saved state for this run: rebuild from the whole history once.
+        completed = _completed_blocks(await _query_history_since(client, workflow_id, 0))
+    last_completed = completed[-1] if completed else ""
 
     state = {
         "version": "1",
@@ -461,7 +510,8 @@ async def run_next_step(client: Client, args: argparse.Namespace) -> None:
         "workflow_status": latest_status.get("status", "unknown"),
         "last_completed_block": last_completed,
         "completed_blocks": completed,
-        "history_length": len(latest_history),
+        "history_length": history_length,
+        "block_rollup": latest_status.get("block_rollup", {}),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     _save_state(state_path, state)
@@ -479,6 +529,7 @@ async def run_next_step(client: Client, args: argparse.Namespace) -> None:
                 "current_block": latest_status.get("current_block"),
                 "last_completed_block": last_completed or None,
                 "completed_blocks": completed,
+                "block_rollup": latest_status.get("block_rollup", {}),
                 "delta_event_count": len(delta_events),
                 "delta_events": delta_events,
             }
@@ -488,7 +539,11 @@ async def run_next_step(client: Client, args: argparse.Namespace) -> None:
 
 async def main() -> None:
     args = parse_args()
-    client = await Client.connect("localhost:7233", namespace=NAMESPACE)
+    client = await Client.connect(
+        "localhost:7233",
+        namespace=NAMESPACE,
+        data_converter=build_data_converter(),
+    )
 
     if args.command == "start":
         await run_start(client, args)
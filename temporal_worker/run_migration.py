@@ -8,6 +8,8 @@ from typing import Any
 
 from temporalio.client import Client
 
+from payload_codec import build_data_converter
+
 WORKFLOW_NAME = "MendixMigrationWorkflow"
 TASK_QUEUE = "ari-smoke"
 NAMESPACE = "default"
@@ -44,6 +46,12 @@ def parse_args() -> argparse.Namespace:
         choices=["extract", "transform", "load", "validate"],
         help="Optional resume checkpoint stage.",
     )
+    parser.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        help="Records per transform activity batch (workflow default: 100).",
+    )
     parser.add_argument(
         "--source-path",
         dest="source_path",
@@ -55,6 +63,51 @@ def parse_args() -> argparse.Namespace:
         choices=["json", "csv"],
         help="Optional explicit source format override for --source-path.",
     )
+    parser.add_argument(
+        "--extract-mode",
+        dest="extract_mode",
+        choices=["batch", "streaming"],
+        help="streaming reads --source-path in fixed-size chunks with a resumable cursor.",
+    )
+    parser.add_argument(
+        "--extract-chunk-size",
+        dest="extract_chunk_size",
+        type=int,
+        help="Rows per streaming extraction chunk (workflow default: 1000).",
+    )
+    parser.add_argument(
+        "--window-size",
+        dest="window_size",
+        type=int,
+        help=(
+            "Rows per workflow run before continuing as new from the extract cursor. "
+            "Keeps history bounded for unbounded sources; implies --extract-mode streaming."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help=(
+            "Skip rows that are already in the load target with the same content "
+            "(compared by the content hash stored with each target row)."
+        ),
+    )
+    parser.add_argument(
+        "--validation-mode",
+        dest="validation_mode",
+        choices=["sample", "checksum"],
+        help=(
+            "sample checks counts and a few rows (default); checksum compares per-bucket "
+            "row checksums of every row across extract, transform and load."
+        ),
+    )
+    parser.add_argument(
+        "--latency-profile",
+        dest="latency_profile",
+        choices=["none", "fixed", "realistic"],
+        help="Simulated activity latency for this run (worker default: fixed).",
+    )
     parser.add_argument(
         "--source-mode",
         dest="source_mode",
@@ -156,10 +209,25 @@ def load_payload(args: argparse.Namespace) -> dict[str, Any]:
         payload["resume_from_checkpoint"] = args.resume_from
     if args.migration_id:
         payload["migration_id"] = args.migration_id
+    if args.batch_size:
+        payload["batch_size"] = max(1, int(args.batch_size))
     if args.source_path:
         payload["source_path"] = args.source_path
         if args.source_format:
             payload["source_format"] = args.source_format
+    if args.extract_mode:
+        payload["extract_mode"] = args.extract_mode
+    if args.extract_chunk_size:
+        payload["extract_chunk_size"] = max(1, int(args.extract_chunk_size))
+    if args.window_size:
+        payload["window_size"] = max(1, int(args.window_size))
+        payload["extract_mode"] = "streaming"
+    if args.latency_profile:
+        payload["latency_profile"] = args.latency_profile
+    if args.incremental:
+        payload["incremental"] = True
+    if args.validation_mode:
+        payload["validation_mode"] = args.validation_mode
 
     mode = args.source_mode
     if not mode:
@@ -208,7 +276,11 @@ async def main() -> None:
     payload.setdefault("migration_id", migration_id)
 
     workflow_id = args.workflow_id or f"ari-migration-{migration_id}-{uuid.uuid4().hex[:8]}"
-    client = await Client.connect("localhost:7233", namespace=NAMESPACE)
+    client = await Client.connect(
+        "localhost:7233",
+        namespace=NAMESPACE,
+        data_converter=build_data_converter(),
+    )
 
     result = await client.execute_workflow(
         WORKFLOW_NAME,
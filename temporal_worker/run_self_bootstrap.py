@@ -16,6 +16,8 @@ from temporalio.client import (
     ScheduleSpec,
 )
 
+from payload_codec import build_data_converter
+
 WORKFLOW_NAME = "SelfBootstrapWorkflow"
 TASK_QUEUE = "ari-smoke"
 NAMESPACE = "default"
@@ -452,7 +454,11 @@ async def run_schedule_delete(client: Client, args: argparse.Namespace) -> None:
 
 async def main() -> None:
     args = parse_args()
-    client = await Client.connect("localhost:7233", namespace=NAMESPACE)
+    client = await Client.connect(
+        "localhost:7233",
+        namespace=NAMESPACE,
+        data_converter=build_data_converter(),
+    )
 
     if args.command == "start":
         await run_start(client, args)
@@ -5,7 +5,7 @@ import sys
 import uuid
 from typing import Any
 
-from temporalio.client import Client
+from gateway_client import GatewayUnavailable, execute_workflow
 
 
 def parse_args() -> argparse.Namespace:
@@ -43,19 +43,35 @@ def load_payload(args: argparse.Namespace) -> dict[str, Any]:
     return payload
 
 
-async def main() -> None:
-    args = parse_args()
-    payload = load_payload(args)
-    default_id = f"ari-sim-{payload['simulation_id']}-{uuid.uuid4().hex[:8]}"
-    workflow_id = args.workflow_id or default_id
+async def run_direct(payload: dict[str, Any], workflow_id: str) -> Any:
+    # Imported lazily so the gateway path never loads the Temporal SDK.
+    from temporalio.client import Client
+
+    from payload_codec import build_data_converter
 
-    client = await Client.connect("localhost:7233", namespace="default")
-    result = await client.execute_workflow(
+    client = await Client.connect(
+        "localhost:7233",
+        namespace="default",
+        data_converter=build_data_converter(),
+    )
+    return await client.execute_workflow(
         "SimulationWorkflow",
         payload,
         id=workflow_id,
         task_queue="ari-smoke",
     )
+
+
+async def main() -> None:
+    args = parse_args()
+    payload = load_payload(args)
+    default_id = f"ari-sim-{payload['simulation_id']}-{uuid.uuid4().hex[:8]}"
+    workflow_id = args.workflow_id or default_id
+
+    try:
+        result = execute_workflow("SimulationWorkflow", payload, workflow_id, "ari-smoke")
+    except GatewayUnavailable:
+        result = await run_direct(payload, workflow_id)
     print(json.dumps({"workflow_id": workflow_id, "result": result}))
 
 
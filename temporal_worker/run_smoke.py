@@ -4,6 +4,8 @@ import uuid
 
 from temporalio.client import Client
 
+from payload_codec import build_data_converter
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run Temporal smoke workflow")
@@ -20,7 +22,11 @@ async def main() -> None:
     workflow_id = args.workflow_id or f"ari-smoke-{uuid.uuid4().hex[:12]}"
     print(f"Starting SmokeWorkflow with workflow_id={workflow_id}")
 
-    client = await Client.connect("localhost:7233", namespace="default")
+    client = await Client.connect(
+        "localhost:7233",
+        namespace="default",
+        data_converter=build_data_converter(),
+    )
     result = await client.execute_workflow(
         "SmokeWorkflow",
         "ari",
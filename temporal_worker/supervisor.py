@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Children are started by path so `pgrep -f temporal_worker/worker.py`
+# (the preflight in lib/temporal-simulation.ts) still finds them.
+WORKER_PATH = Path(__file__).resolve().parent / "worker.py"
+
+DEFAULT_PROCESSES = os.cpu_count() or 1
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 45.0
+RESTART_BACKOFF_BASE_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 60.0
+# A child that stayed up this long resets its crash backoff.
+STABLE_RUN_SECONDS = 60.0
+# Exits this soon after start are usually config or argument errors (exit
+# code 2) that a restart won't fix; a slot gives up after this many in a row.
+STARTUP_FAILURE_SECONDS = 5.0
+MAX_STARTUP_FAILURES = 5
+
+
+def _log(event: str, **fields: object) -> None:
+    print(f"[Supervisor] {json.dumps({'event': event, **fields}, sort_keys=True)}", flush=True)
+
+
+def _offset_bind_address(address: str, offset: int) -> str:
+    host, _, port = address.rpartition(":")
+    return f"{host}:{int(port) + offset}"
+
+
+class WorkerSupervisor:
+    """Run N worker.py processes on one host and keep them running.
+
+    Every child polls the same task queue(s) under its own identity.
+    Crashed children are restarted with exponential backoff; a child that
+    exits cleanly is not, and a slot whose child keeps failing right after
+    startup is given up on. SIGTERM/SIGINT are forwarded so each child
+    drains, and stragglers are killed after `drain_timeout_seconds`.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        worker_args: list[str],
+        prometheus_bind_address: str = "",
+        drain_timeout_seconds: float = DEFAULT_DRAIN_TIMEOUT_SECONDS,
+    ) -> None:
+        self.processes = max(1, processes)
+        self.worker_args = worker_args
+        self.prometheus_bind_address = prometheus_bind_address
+        self.drain_timeout_seconds = drain_timeout_seconds
+        self._children: dict[int, asyncio.subprocess.Process] = {}
+        self._stopping = asyncio.Event()
+        self._abandoned_slots: list[int] = []
+
+    def _child_command(self, index: int) -> list[str]:
+        command = [
+            sys.executable,
+            str(WORKER_PATH),
+            *self.worker_args,
+            "--identity",
+            f"ari-worker-{index}@{socket.gethostname()}",
+        ]
+        if self.prometheus_bind_address:
+            # One scrape port per child: base port + index.
+            command += [
+                "--prometheus-bind-address",
+                _offset_bind_address(self.prometheus_bind_address, index),
+            ]
+        return command
+
+    async def _run_slot(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        env = {**os.environ}
+        env.pop("ARI_WORKER_PROMETHEUS_BIND_ADDRESS", None)
+        env.pop("ARI_WORKER_IDENTITY", None)
+        failures = 0
+        startup_failures = 0
+        while not self._stopping.is_set():
+            process = await asyncio.create_subprocess_exec(*self._child_command(index), env=env)
+            self._children[index] = process
+            started = loop.time()
+            _log("started", index=index, pid=process.pid)
+            if self._stopping.is_set():
+                # Spawned while the drain was already signalling the others.
+                process.send_signal(signal.SIGTERM)
+            returncode = await process.wait()
+            self._children.pop(index, None)
+            if self._stopping.is_set():
+                _log("exited", index=index, pid=process.pid, returncode=returncode)
+                return
+            if returncode == 0:
+                _log("exited", index=index, pid=process.pid, returncode=returncode)
+                return
+            run_seconds = loop.time() - started
+            startup_failures = startup_failures + 1 if run_seconds < STARTUP_FAILURE_SECONDS else 0
+            if startup_failures >= MAX_STARTUP_FAILURES:
+                _log(
+                    "giving_up",
+                    index=index,
+                    pid=process.pid,
+                    returncode=returncode,
+                    startup_failures=startup_failures,
+                )
+                self._abandoned_slots.append(index)
+                return
+            failures = 0 if run_seconds >= STABLE_RUN_SECONDS else failures + 1
+            delay = min(
+                RESTART_BACKOFF_MAX_SECONDS,
+                RESTART_BACKOFF_BASE_SECONDS * 2 ** max(0, failures - 1),
+            )
+            _log(
+                "crashed",
+                index=index,
+                pid=process.pid,
+                returncode=returncode,
+                restart_in_seconds=delay,
+            )
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _drain(self) -> None:
+        await self._stopping.wait()
+        children = list(self._children.values())
+        _log("draining", children=len(children))
+        if not children:
+            return
+        for process in children:
+            if process.returncode is None:
+                process.send_signal(signal.SIGTERM)
+        _, pending = await asyncio.wait(
+            [asyncio.ensure_future(process.wait()) for process in children],
+            timeout=self.drain_timeout_seconds,
+        )
+        for process in children:
+            if process.returncode is None:
+                _log("killed", pid=process.pid)
+                process.kill()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def run(self) -> int:
+        """Supervise until shutdown or until every slot has stopped.
+
+        Returns the process exit code: 1 if any slot was given up on.
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self._stopping.set)
+        _log("starting", processes=self.processes, worker_args=self.worker_args)
+        drain = asyncio.create_task(self._drain())
+        await asyncio.gather(*(self._run_slot(index) for index in range(self.processes)))
+        # Every slot returned without a shutdown signal; nothing left to drain.
+        self._stopping.set()
+        await drain
+        return 1 if self._abandoned_slots else 0
+
+
+def parse_args(argv: list[str] | None = None) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description="Run several worker.py processes on this host. Unrecognised flags "
+        "(e.g. --role, --task-queue) are passed through to every worker."
+    )
+    parser.add_argument(
+        "--processes",
+        dest="processes",
+        type=int,
+        default=int(os.environ.get("ARI_WORKER_PROCESSES", DEFAULT_PROCESSES)),
+        help=f"Worker processes to run; ARI_WORKER_PROCESSES (default: CPU count, {DEFAULT_PROCESSES})",
+    )
+    parser.add_argument(
+        "--prometheus-bind-address",
+        dest="prometheus_bind_address",
+        default=os.environ.get("ARI_WORKER_PROMETHEUS_BIND_ADDRESS", ""),
+        help="Base host:port for metrics; worker N serves on port+N. "
+        "ARI_WORKER_PROMETHEUS_BIND_ADDRESS (default: off)",
+    )
+    parser.add_argument(
+        "--drain-timeout-seconds",
+        dest="drain_timeout_seconds",
+        type=float,
+        default=float(
+            os.environ.get("ARI_SUPERVISOR_DRAIN_TIMEOUT_SECONDS", DEFAULT_DRAIN_TIMEOUT_SECONDS)
+        ),
+        help="After forwarding SIGTERM, how long to wait before killing workers; "
+        f"ARI_SUPERVISOR_DRAIN_TIMEOUT_SECONDS (default: {DEFAULT_DRAIN_TIMEOUT_SECONDS})",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main() -> None:
+    args, worker_args = parse_args()
+    supervisor = WorkerSupervisor(
+        processes=args.processes,
+        worker_args=worker_args,
+        prometheus_bind_address=args.prometheus_bind_address,
+        drain_timeout_seconds=args.drain_timeout_seconds,
+    )
+    sys.exit(asyncio.run(supervisor.run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import time
+import weakref
+from datetime import timedelta
+from typing import Any
+
+from temporalio import activity
+from temporalio.common import MetricHistogramFloat, MetricMeter
+from temporalio.runtime import OpenTelemetryConfig, PrometheusConfig, Runtime, TelemetryConfig
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+)
+
+# Custom histograms recorded next to the SDK's built-in worker metrics
+# (schedule-to-start latency, task slots, poll outcomes). Activity metrics go
+# through activity.metric_meter() and workflow ones through
+# workflow.metric_meter(), so they carry namespace/task_queue/type attributes
+# and workflow metrics are not re-emitted on replay.
+ACTIVITY_DURATION_METRIC = "ari_activity_duration_seconds"
+DOGFOOD_BLOCK_DURATION_METRIC = "ari_dogfood_block_duration_seconds"
+LLM_CALL_LATENCY_METRIC = "ari_llm_call_latency_seconds"
+MIGRATION_ROWS_PER_SECOND_METRIC = "ari_migration_rows_per_second"
+
+HISTOGRAMS = {
+    ACTIVITY_DURATION_METRIC: ("Activity execution time, by activity type and outcome", "s"),
+    DOGFOOD_BLOCK_DURATION_METRIC: ("Dogfood B1-B8 block duration including retries", "s"),
+    LLM_CALL_LATENCY_METRIC: ("LLM provider call latency (cache hits excluded)", "s"),
+    MIGRATION_ROWS_PER_SECOND_METRIC: ("Rows loaded per second by one migration load batch", "1"),
+}
+
+DURATION_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+ROWS_PER_SECOND_BUCKETS = [10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000]
+HISTOGRAM_BUCKETS = {
+    ACTIVITY_DURATION_METRIC: DURATION_BUCKETS,
+    DOGFOOD_BLOCK_DURATION_METRIC: DURATION_BUCKETS,
+    LLM_CALL_LATENCY_METRIC: DURATION_BUCKETS,
+    MIGRATION_ROWS_PER_SECOND_METRIC: ROWS_PER_SECOND_BUCKETS,
+}
+
+DEFAULT_OTLP_PERIOD_SECONDS = 10.0
+
+# Histograms already created, by meter and then by name. Each activity
+# execution and workflow run has its own meter carrying its attributes, so
+# instruments are cached per meter; the weak keys let finished ones go.
+_histograms: "weakref.WeakKeyDictionary[MetricMeter, dict[str, MetricHistogramFloat]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def record_histogram(
+    meter: MetricMeter, name: str, value: float, attributes: dict[str, Any] | None = None
+) -> None:
+    histograms = _histograms.setdefault(meter, {})
+    histogram = histograms.get(name)
+    if histogram is None:
+        description, unit = HISTOGRAMS[name]
+        histogram = histograms[name] = meter.create_histogram_float(name, description, unit)
+    histogram.record(value, attributes)
+
+
+def record_activity_histogram(name: str, value: float, attributes: dict[str, Any] | None = None) -> None:
+    """Record from activity code; a no-op outside an activity (e.g. local scripts)."""
+    if activity.in_activity():
+        record_histogram(activity.metric_meter(), name, value, attributes)
+
+
+def build_runtime(
+    prometheus_bind_address: str = "",
+    otlp_url: str = "",
+    otlp_http: bool = False,
+) -> Runtime:
+    """Build the Runtime the worker's client runs on, exporting metrics if configured.
+
+    Exactly one exporter is used: a Prometheus scrape endpoint on
+    `prometheus_bind_address` (host:port) or an OTLP push to `otlp_url`.
+    With neither set this is the SDK's default runtime (no export).
+    """
+    if prometheus_bind_address and otlp_url:
+        raise ValueError("Configure either a Prometheus bind address or an OTLP URL, not both")
+    if prometheus_bind_address:
+        metrics: PrometheusConfig | OpenTelemetryConfig = PrometheusConfig(
+            bind_address=prometheus_bind_address,
+            durations_as_seconds=True,
+            histogram_bucket_overrides=HISTOGRAM_BUCKETS,
+        )
+    elif otlp_url:
+        metrics = OpenTelemetryConfig(
+            url=otlp_url,
+            http=otlp_http,
+            metric_periodicity=timedelta(seconds=DEFAULT_OTLP_PERIOD_SECONDS),
+            durations_as_seconds=True,
+            histogram_bucket_overrides=HISTOGRAM_BUCKETS,
+        )
+    else:
+        return Runtime.default()
+    return Runtime(telemetry=TelemetryConfig(metrics=metrics))
+
+
+class ActivityMetricsInterceptor(Interceptor):
+    """Record ACTIVITY_DURATION_METRIC for every activity the worker runs."""
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _ActivityDurationInbound(next)
+
+
+class _ActivityDurationInbound(ActivityInboundInterceptor):
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        started = time.monotonic()
+        outcome = "failed"
+        try:
+            result = await self.next.execute_activity(input)
+            outcome = "completed"
+            return result
+        finally:
+            record_histogram(
+                activity.metric_meter(),
+                ACTIVITY_DURATION_METRIC,
+                time.monotonic() - started,
+                {"outcome": outcome},
+            )
@@ -0,0 +1,61 @@
+import asyncio
+import inspect
+import sys
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# The worker modules import each other as top-level siblings (`from
+# payload_codec import ...`), the same way worker.py runs them.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from temporalio import workflow  # noqa: E402
+from temporalio.common import MetricMeter  # noqa: E402
+
+
+class InlineWorkflowRuntime:
+    """Stands in for the workflow APIs the ari workflows call.
+
+    The Temporal test server is downloaded on first use, so workflow tests
+    run workflow bodies on plain asyncio instead: activities are called
+    inline (or through `fakes`, keyed by activity name) and every call is
+    recorded in `calls` as (activity name, payload).
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, object]] = []
+        self.fakes: dict[str, object] = {}
+
+    async def execute_activity(self, activity_fn, arg=None, *_args, **_kwargs):
+        name = activity_fn.__name__
+        self.calls.append((name, arg))
+        fn = self.fakes.get(name, activity_fn)
+        result = fn(arg) if arg is not None else fn()
+        return await result if inspect.isawaitable(result) else result
+
+    async def wait_condition(self, fn, *, timeout=None, timeout_summary=None):
+        while not fn():
+            await asyncio.sleep(0.001)
+
+    def activity_names(self) -> list[str]:
+        return [name for name, _ in self.calls]
+
+
+@pytest.fixture
+def workflow_runtime(monkeypatch):
+    runtime = InlineWorkflowRuntime()
+    monkeypatch.setattr(workflow, "execute_activity", runtime.execute_activity)
+    monkeypatch.setattr(workflow, "wait_condition", runtime.wait_condition)
+    monkeypatch.setattr(workflow, "all_handlers_finished", lambda: True)
+    monkeypatch.setattr(
+        workflow,
+        "info",
+        lambda: types.SimpleNamespace(
+            workflow_id="wf-test", run_id="run-test", attempt=1, task_queue="ari-test"
+        ),
+    )
+    monkeypatch.setattr(workflow, "now", lambda: datetime.now(timezone.utc))
+    monkeypatch.setattr(workflow, "metric_meter", lambda: MetricMeter.noop)
+    return runtime
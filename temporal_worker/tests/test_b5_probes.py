@@ -0,0 +1,111 @@
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from activities import _generate_block_output, _percentile, _resolve_probe_endpoints
+
+SLOW_PATH_SECONDS = 0.12
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(SLOW_PATH_SECONDS)
+        status = 404 if self.path == "/missing" else 200
+        body = b"x" * (100 if self.path == "/" else 10)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+
+    assert _percentile(values, 0.50) == 10.0
+    assert _percentile(values, 0.95) == 19.0
+    assert _percentile([7.0], 0.95) == 7.0
+
+
+def test_endpoint_specs_resolve_against_the_base_url():
+    endpoints = _resolve_probe_endpoints(
+        ["/health", {"name": "api", "url": "http://other:1/x", "p95_budget_ms": 20, "method": "head"}],
+        "http://localhost:3000",
+        100,
+    )
+
+    assert [(e["name"], e["url"], e["method"], e["budget_ms"]) for e in endpoints] == [
+        ("/health", "http://localhost:3000/health", "GET", 100.0),
+        ("api", "http://other:1/x", "HEAD", 20.0),
+    ]
+    with pytest.raises(ValueError, match="index 0"):
+        _resolve_probe_endpoints([42], "http://localhost:3000", None)
+
+
+def test_b5_probes_endpoints_concurrently_and_enforces_budgets(base_url):
+    block_input = {
+        "base_url": base_url,
+        "probe_endpoints": [
+            {"name": "app", "path": "/", "required": True},
+            "/missing",
+            {"name": "slow", "path": "/slow", "p95_budget_ms": 50},
+            {"name": "slow_again", "path": "/slow"},
+        ],
+        "probe_repeats": 3,
+    }
+
+    started = time.perf_counter()
+    output = asyncio.run(_generate_block_output("B5", block_input, {}))
+    elapsed = time.perf_counter() - started
+
+    # Two slow endpoints x 3 sequential repeats each; run concurrently they
+    # take about 3 x SLOW_PATH_SECONDS, not 6.
+    assert elapsed < 5 * SLOW_PATH_SECONDS
+    probes = {probe["name"]: probe for probe in output["probe_results"]}
+    assert probes["app"]["status_codes"] == {"200": 3}
+    assert probes["app"]["payload_bytes"] == {"min": 100, "max": 100}
+    assert probes["/missing"]["ok_count"] == 0
+    assert probes["/missing"]["errors"] == ["HTTP 404"] * 3
+    assert probes["slow"]["latency_ms"]["p50"] >= SLOW_PATH_SECONDS * 1000
+    assert probes["slow"]["budget_exceeded"] is True
+    assert probes["slow_again"]["budget_exceeded"] is False
+    assert output["verification_result"] == "fail"
+    assert output["app_status"] == "running"
+    assert output["test_results"] == {"total": 4, "passed": 3, "failed": 1, "skipped": 0}
+    assert {bug["type"] for bug in output["bugs_found"] if bug["severity"] != "info"} == {
+        "api_check",
+        "latency_budget",
+    }
+
+
+def test_b5_fails_when_the_required_app_is_down():
+    block_input = {"base_url": f"http://127.0.0.1:{_unused_port()}", "probe_repeats": 1}
+
+    output = asyncio.run(_generate_block_output("B5", block_input, {}))
+
+    assert output["verification_result"] == "fail"
+    assert output["app_status"] == "not_running"
+    assert [bug["type"] for bug in output["bugs_found"]] == ["app_not_running", "api_check"]
@@ -0,0 +1,98 @@
+import asyncio
+import time
+import types
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+import activities
+import llm_client
+
+
+def _chunk(text):
+    delta = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=delta)])
+
+
+class _FakeStream:
+    def __init__(self, texts, hang_after):
+        self.texts = texts
+        self.hang_after = hang_after
+        self.closed = False
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        for text in self.texts:
+            await asyncio.sleep(0.02)
+            yield _chunk(text)
+        if self.hang_after:
+            await asyncio.sleep(60)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def streaming_block(monkeypatch):
+    """Run block B3 against a fake LLM whose first stream hangs after three chunks."""
+    client = llm_client.RateLimitedLlmClient(
+        "key",
+        "http://llm.invalid",
+        backoff_base_seconds=0.01,
+        stream_idle_timeout_seconds=0.3,
+    )
+    streams = []
+
+    async def create(**_kwargs):
+        streams.append(_FakeStream(["a", "b", "c"], hang_after=not streams))
+        return streams[-1]
+
+    client._client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    )
+
+    async def generate(_block, _block_input, _agent_info):
+        await asyncio.sleep(0.12)
+        return {"text": await activities.call_llm("prompt", stream=True)}
+
+    monkeypatch.setattr(activities, "BLOCK_HEARTBEAT_INTERVAL_SECONDS", 0.05)
+    monkeypatch.setattr(activities, "_get_llm_client", lambda: client)
+    monkeypatch.setattr(activities, "_get_llm_cache", lambda: None)
+    monkeypatch.setattr(activities, "_generate_block_output", generate)
+    return streams
+
+
+def test_hung_stream_stops_heartbeating_and_is_retried(streaming_block):
+    env = ActivityEnvironment()
+    heartbeats = []
+    started = time.monotonic()
+    env.on_heartbeat = lambda *details: heartbeats.append(
+        (time.monotonic() - started, details[0])
+    )
+
+    result = asyncio.run(
+        env.run(
+            activities.execute_dogfood_block_activity,
+            {"block": "B3", "input": {}, "latency_profile": "none"},
+        )
+    )
+
+    assert result["output"] == {"text": "abc"}
+    assert result["llm_client"]["retries"] == 1
+    assert all(stream.closed for stream in streaming_block)
+    # The timer heartbeats before the call; while streaming, only chunks do.
+    assert heartbeats[0][1]["phase"] == "working"
+    streaming = [(at, details) for at, details in heartbeats if details["phase"] == "streaming"]
+    assert [details["tokens"] for _, details in streaming] == [1, 2, 3, 1, 2, 3]
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(streaming, streaming[1:])]
+    assert max(gaps) >= 0.3
+    assert "started_monotonic" not in heartbeats[-1][1]
+
+
+def test_stream_idle_timeout_is_shorter_than_the_block_heartbeat_timeout():
+    assert (
+        llm_client.DEFAULT_STREAM_IDLE_TIMEOUT_SECONDS
+        < activities.DEFAULT_BLOCK_HEARTBEAT_TIMEOUT_SECONDS
+    )
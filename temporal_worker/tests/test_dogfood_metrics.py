@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from workflows import DogfoodB1B8Workflow, _rollup_block_metrics
+
+BLOCKS = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8"]
+USAGE = {
+    "B3": {"prompt_tokens": 1200, "completion_tokens": 300, "estimated_cost_usd": 0.00072},
+    "B4": {"prompt_tokens": 2400, "completion_tokens": 900, "estimated_cost_usd": 0.0018},
+}
+
+
+@pytest.fixture
+def dogfood_activities(workflow_runtime):
+    async def block(payload):
+        name = payload["block"]
+        await asyncio.sleep(0.03 if name == "B4" else 0.001)
+        return {
+            "block": name,
+            "status": "complete",
+            "output": {f"{name.lower()}_done": True},
+            "timing": {"started_at": "2026-01-01T00:00:00+00:00", "attempt": 2 if name == "B5" else 1},
+            "llm_usage": {"calls": 1, **USAGE.get(name, {})},
+        }
+
+    async def pr_loop(_payload):
+        return {"status": "skipped", "timing": {"attempt": 1}}
+
+    workflow_runtime.fakes["execute_dogfood_block_activity"] = block
+    workflow_runtime.fakes["run_pr_agent_loop_activity"] = pr_loop
+    return workflow_runtime
+
+
+def test_every_block_records_timing_tokens_and_cost(dogfood_activities):
+    workflow = DogfoodB1B8Workflow({})
+    asyncio.run(workflow.approve_resume("ok"))
+
+    result = asyncio.run(workflow.run({}))
+
+    assert result["status"] == "complete"
+    metrics = {entry["block"]: entry["metrics"] for entry in result["history"] if "metrics" in entry}
+    assert list(metrics) == ["B1", "B2", "B3", "B4", "PR_LOOP", "B5", "B6", "B7", "B8"]
+    b4 = metrics["B4"]
+    assert b4["started_at"] == "2026-01-01T00:00:00+00:00"
+    assert b4["scheduled_at"] <= b4["completed_at"]
+    assert b4["duration_seconds"] >= 0.03
+    assert (b4["prompt_tokens"], b4["completion_tokens"]) == (2400, 900)
+    assert metrics["B5"]["attempts"] == 2
+
+    rollup = result["block_rollup"]
+    assert set(rollup["blocks"]) == {*BLOCKS, "PR_LOOP"}
+    assert rollup["totals"]["prompt_tokens"] == 3600
+    assert rollup["totals"]["completion_tokens"] == 1200
+    assert rollup["totals"]["estimated_cost_usd"] == pytest.approx(0.00252)
+    assert rollup["totals"]["attempts"] == 10
+    assert rollup["slowest_block"] == "B4"
+    assert rollup["most_expensive_block"] == "B4"
+    assert workflow.get_summary()["block_rollup"] == rollup
+
+
+def test_rollup_of_no_blocks_has_no_slowest_or_most_expensive_block():
+    rollup = _rollup_block_metrics({})
+
+    assert rollup["blocks"] == {}
+    assert rollup["totals"]["duration_seconds"] == 0
+    assert rollup["slowest_block"] is None
+    assert rollup["most_expensive_block"] is None
+
+
+def test_free_blocks_are_never_the_most_expensive():
+    metric = {
+        "duration_seconds": 1.0,
+        "attempts": 1,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "estimated_cost_usd": 0.0,
+    }
+
+    rollup = _rollup_block_metrics({"B1": metric, "B2": {**metric, "duration_seconds": 2.0}})
+
+    assert rollup["slowest_block"] == "B2"
+    assert rollup["most_expensive_block"] is None
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from workflows import DogfoodB1B8Workflow
+
+
+@pytest.fixture
+def fake_blocks(workflow_runtime):
+    async def block(payload):
+        return {"block": payload["block"], "status": "complete", "output": {}}
+
+    async def pr_loop(_payload):
+        return {"status": "skipped"}
+
+    workflow_runtime.fakes["execute_dogfood_block_activity"] = block
+    workflow_runtime.fakes["run_pr_agent_loop_activity"] = pr_loop
+    return workflow_runtime
+
+
+async def _until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+def test_validator_rejects_runs_that_are_not_in_step_mode():
+    workflow = DogfoodB1B8Workflow({})
+
+    with pytest.raises(ValueError, match="requires a step_mode run"):
+        workflow._validate_advance_and_wait("go")
+
+
+def test_validator_rejects_a_second_advance_while_one_is_pending():
+    workflow = DogfoodB1B8Workflow({"step_mode": True})
+
+    workflow._validate_advance_and_wait("first")
+    asyncio.run(workflow.advance_step("first"))
+
+    with pytest.raises(ValueError, match="already pending"):
+        workflow._validate_advance_and_wait("second")
+
+
+@pytest.mark.parametrize("status", ["complete", "failed"])
+def test_validator_rejects_finished_runs(status):
+    workflow = DogfoodB1B8Workflow({"step_mode": True})
+    workflow._status = status
+
+    with pytest.raises(ValueError, match=f"already {status}"):
+        workflow._validate_advance_and_wait("go")
+
+
+def test_advance_and_wait_returns_once_the_advanced_block_is_recorded(fake_blocks):
+    workflow = DogfoodB1B8Workflow({"step_mode": True})
+
+    async def scenario():
+        run = asyncio.ensure_future(workflow.run({"step_mode": True}))
+        await _until(lambda: workflow.get_summary()["status"] == "waiting_for_advance")
+        first = await workflow.advance_and_wait("go B1")
+        second = await workflow.advance_and_wait("go B2")
+        run.cancel()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first["status"] == "waiting_for_advance"
+    assert first["current_block"] == "B2"
+    assert [entry["block"] for entry in first["entries"]] == ["step_advance", "B1"]
+    assert first["entries"][0]["note"] == "go B1"
+    assert (second["start"], second["history_length"]) == (2, 4)
+    assert [entry["block"] for entry in second["entries"]] == ["step_advance", "B2"]
+    assert fake_blocks.activity_names() == ["execute_dogfood_block_activity"] * 2
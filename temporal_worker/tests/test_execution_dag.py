@@ -0,0 +1,82 @@
+import asyncio
+
+from workflows import ExecutionWorkflow, _break_dependency_cycles, _build_assignment_dependencies
+
+
+def _is_acyclic(dependencies):
+    remaining = {index: set(deps) for index, deps in enumerate(dependencies)}
+    while remaining:
+        ready = [index for index, deps in remaining.items() if not deps]
+        if not ready:
+            return False
+        for index in ready:
+            del remaining[index]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return True
+
+
+def test_dependencies_merge_plan_and_graph_edges_and_drop_unknown_ones():
+    plan = [
+        {"id": "a"},
+        {"id": "b", "dependencies": ["a", "missing", "b"]},
+        {"id": "c", "dependencies": ["a"]},
+    ]
+    graph = [{"id": "c", "dependencies": ["b", "a"]}, {"id": "zzz", "dependencies": ["a"]}]
+
+    assert _build_assignment_dependencies(plan, graph) == [[], [0], [0, 1]]
+
+
+def test_duplicate_and_empty_ids_keep_separate_entries():
+    plan = [
+        {"id": "a"},
+        {"id": "a"},
+        {"id": ""},
+        {},
+        {"id": "b", "dependencies": ["a", ""]},
+    ]
+    graph = [{"id": "", "dependencies": ["b"]}]
+
+    # "b" waits for both "a" assignments; empty ids are never depended on
+    # and don't pick up the graph node with an empty id.
+    assert _build_assignment_dependencies(plan, graph) == [[], [], [], [], [0, 1]]
+
+
+def test_acyclic_dependencies_are_left_alone():
+    dependencies = [[], [0], [0], [1, 2]]
+
+    assert _break_dependency_cycles(dependencies) == dependencies
+
+
+def test_cycles_are_broken_by_keeping_only_edges_to_earlier_assignments():
+    # 0 -> 2 -> 1 -> 0 is a cycle; 3 depends on everything.
+    dependencies = [[2], [0], [1], [0, 1, 2]]
+
+    broken = _break_dependency_cycles(dependencies)
+
+    assert broken == [[], [0], [1], [0, 1, 2]]
+    assert _is_acyclic(broken)
+
+
+def test_duplicate_ids_all_run_before_their_dependents(workflow_runtime):
+    events = []
+
+    async def execute(assignment):
+        events.append(("start", assignment["name"]))
+        await asyncio.sleep(assignment["estimated_duration"])
+        events.append(("end", assignment["name"]))
+        return {"id": assignment["id"], "actual_duration": assignment["estimated_duration"]}
+
+    workflow_runtime.fakes["execute_assignment_activity"] = execute
+    plan = [
+        {"id": "build", "name": "build-fast", "estimated_duration": 0.01},
+        {"id": "build", "name": "build-slow", "estimated_duration": 0.05},
+        {"id": "", "name": "no-id", "estimated_duration": 0.02},
+        {"id": "test", "name": "test", "estimated_duration": 0.01, "dependencies": ["build"]},
+    ]
+
+    result = asyncio.run(ExecutionWorkflow().run({"assignment_plan": plan, "max_parallelism": 4}))
+
+    assert result["task_count"] == 4
+    assert events.index(("start", "test")) > events.index(("end", "build-slow"))
+    assert result["critical_path_duration"] == 0.05 + 0.01
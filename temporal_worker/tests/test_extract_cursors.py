@@ -0,0 +1,157 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+import activities
+from activities import _read_csv_chunk, _read_json_chunk, extract_mendix_records_chunk_activity
+
+CSV_TEXT = (
+    "source_id,full_name,email,notes\n"
+    "mx-1,Alex Rivera,alex@example.com,plain\n"
+    'mx-2,Sam Jordan,sam@example.com,"spans\ntwo lines"\n'
+    'mx-3,"Lee, Kim",lee@example.com,"three\nline\nfield"\n'
+    "mx-4,Ana Ñúñez,ana@example.com,\"quoted \"\"quote\"\"\"\n"
+    "mx-5,Bo Li,bo@example.com,last\n"
+)
+
+
+def _read_all(reader, path, chunk_size):
+    rows, cursors, cursor = [], [], {}
+    while True:
+        result = reader(path, cursor, chunk_size)
+        chunk, next_cursor, done = result[0], result[1], result[2]
+        rows.extend(chunk)
+        cursors.append(next_cursor)
+        if done or not chunk:
+            return rows, cursors
+        cursor = next_cursor
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 10])
+def test_csv_cursor_resumes_across_multiline_quoted_fields(tmp_path, chunk_size):
+    path = tmp_path / "source.csv"
+    path.write_bytes(CSV_TEXT.encode("utf-8"))
+
+    rows, cursors = _read_all(_read_csv_chunk, path, chunk_size)
+
+    assert rows == list(csv.DictReader(io.StringIO(CSV_TEXT)))
+    assert rows[2]["notes"] == "three\nline\nfield"
+    offsets = [cursor["byte_offset"] for cursor in cursors]
+    assert offsets == sorted(offsets)
+    assert offsets[-1] == len(CSV_TEXT.encode("utf-8"))
+    assert cursors[-1]["row_index"] == 5
+    assert all(cursor["fieldnames"] == ["source_id", "full_name", "email", "notes"] for cursor in cursors)
+
+
+def test_csv_cursor_from_a_previous_run_continues_where_it_stopped(tmp_path):
+    path = tmp_path / "source.csv"
+    path.write_bytes(CSV_TEXT.encode("utf-8"))
+
+    first, cursor, done = _read_csv_chunk(path, {}, 2)
+    assert not done
+    # A fresh call with only the serialized cursor, as after continue-as-new.
+    rest, _, done = _read_csv_chunk(path, json.loads(json.dumps(cursor)), 10)
+
+    assert [row["source_id"] for row in first + rest] == ["mx-1", "mx-2", "mx-3", "mx-4", "mx-5"]
+    assert done
+
+
+RECORDS = [
+    {"source_id": "mx-1", "full_name": "Alex Rivera", "note": "has ] and , inside"},
+    {"source_id": "mx-2", "full_name": "Ana Ñúñez", "note": "multi-byte ✓ text"},
+    {"source_id": "mx-3", "full_name": "Sam Jordan", "nested": {"list": [1, 2, {"k": "]"}]}},
+    {"source_id": "mx-4", "full_name": "Bo Li", "note": ""},
+    {"source_id": "mx-5", "full_name": "Lee Kim", "note": "last"},
+]
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 10])
+def test_json_cursor_resumes_across_read_block_boundaries(tmp_path, monkeypatch, wrap, chunk_size):
+    # Tiny read blocks put block boundaries inside values and multi-byte characters.
+    monkeypatch.setattr(activities, "STREAM_READ_BLOCK_BYTES", 7)
+    path = tmp_path / "source.json"
+    document = {"meta": {"records": "not this one"}, "records": RECORDS} if wrap else RECORDS
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    rows, cursors = _read_all(_read_json_chunk, path, chunk_size)
+
+    assert rows == RECORDS
+    assert cursors[-1]["row_index"] == len(RECORDS)
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    [
+        '"meta": {"records": [1]}, ',
+        '"meta": [{"records": [{"source_id": "decoy"}]}], ',
+        '"note": "\\"records\\": [1]", ',
+        '"records\\"": [1], "x": "a\\\\", ',
+        '"recordsX": [1], ',
+    ],
+)
+def test_json_cursor_reads_the_top_level_records_key_like_batch_mode(tmp_path, monkeypatch, prefix):
+    monkeypatch.setattr(activities, "STREAM_READ_BLOCK_BYTES", 3)
+    path = tmp_path / "source.json"
+    text = "{" + prefix + '"records": ' + json.dumps(RECORDS, ensure_ascii=False) + "}"
+    path.write_text(text, encoding="utf-8")
+
+    rows, _ = _read_all(_read_json_chunk, path, 2)
+
+    assert rows == json.loads(text)["records"] == RECORDS
+
+
+def test_json_object_with_only_a_nested_records_key_reports_an_error(tmp_path):
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps({"meta": {"records": RECORDS}, "rows": []}), encoding="utf-8")
+
+    rows, _, done, errors = _read_json_chunk(path, {}, 10)
+
+    assert rows == [] and done
+    assert errors == ["JSON object is missing records array; defaulting to empty."]
+
+
+def test_json_object_without_records_array_reports_an_error(tmp_path):
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps({"rows": RECORDS}), encoding="utf-8")
+
+    rows, _, done, errors = _read_json_chunk(path, {}, 10)
+
+    assert rows == [] and done
+    assert errors == ["JSON object is missing records array; defaulting to empty."]
+
+
+def test_truncated_json_array_raises(tmp_path):
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(RECORDS)[:-20], encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Malformed JSON array"):
+        _read_all(_read_json_chunk, path, 2)
+
+
+def test_chunk_activity_keeps_row_identifiers_stable_across_chunks(tmp_path):
+    (tmp_path / "source.csv").write_text(
+        "source_id,full_name,email\nmx-1,A B,a@x.com\n,C D,c@x.com\n,E F,e@x.com\n",
+        encoding="utf-8",
+    )
+    identifiers, cursor = [], {}
+    while True:
+        result = asyncio.run(
+            extract_mendix_records_chunk_activity(
+                {
+                    "repo_root": str(tmp_path),
+                    "source_path": "source.csv",
+                    "extract_chunk_size": 2,
+                    "cursor": cursor,
+                }
+            )
+        )
+        identifiers.extend(record["source_identifier"] for record in result["records"])
+        if result["done"]:
+            break
+        cursor = result["next_cursor"]
+
+    assert identifiers == ["mx-1", "row-2", "row-3"]
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+
+import pytest
+
+import gateway_client
+from gateway import TemporalGateway, _gateway_answers
+
+
+class _FakeHandle:
+    def __init__(self, client, workflow_id):
+        self.client = client
+        self.workflow_id = workflow_id
+        self.result_run_id = f"run-{workflow_id}"
+
+    async def query(self, name, *args):
+        return {"query": name, "args": list(args)}
+
+    async def signal(self, name, *args):
+        self.client.signals.append((self.workflow_id, name, list(args)))
+
+    async def result(self):
+        return {"workflow_id": self.workflow_id, "status": "complete"}
+
+
+class _FakeClient:
+    """The slice of temporalio.client.Client the gateway uses."""
+
+    def __init__(self):
+        self.executed = []
+        self.signals = []
+
+    async def execute_workflow(self, workflow_name, payload, id, task_queue):
+        self.executed.append((workflow_name, payload, id, task_queue))
+        if workflow_name == "BrokenWorkflow":
+            raise RuntimeError("workflow failed")
+        return {"workflow": workflow_name, "echo": payload}
+
+    async def start_workflow(self, workflow_name, payload, id, task_queue):
+        return _FakeHandle(self, id)
+
+    def get_workflow_handle(self, workflow_id):
+        return _FakeHandle(self, workflow_id)
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    # Unix socket paths are limited to ~100 bytes, too short for pytest's tmp_path.
+    directory = tempfile.mkdtemp(prefix="ari-gw-")
+    path = os.path.join(directory, "gateway.sock")
+    monkeypatch.setenv("ARI_TEMPORAL_GATEWAY_SOCKET", path)
+    monkeypatch.delenv("ARI_TEMPORAL_GATEWAY_ADDR", raising=False)
+    monkeypatch.delenv("ARI_TEMPORAL_GATEWAY", raising=False)
+    yield path
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _with_gateway(socket_path, client, scenario):
+    """Serve `client` on `socket_path` while the blocking `scenario` runs in a thread."""
+
+    async def main():
+        gateway = TemporalGateway(client)
+        server = await asyncio.start_unix_server(gateway.serve_connection, path=socket_path)
+        async with server:
+            return await asyncio.to_thread(scenario)
+
+    return asyncio.run(main())
+
+
+def test_runner_requests_round_trip_through_the_gateway(socket_path):
+    client = _FakeClient()
+
+    def scenario():
+        return (
+            gateway_client.call_gateway({"op": "ping"}),
+            gateway_client.execute_workflow("ExecutionWorkflow", {"n": 1}, "wf-1", "ari-smoke"),
+            gateway_client.call_gateway(
+                {"op": "start", "workflow": "SimulationWorkflow", "workflow_id": "wf-2"}
+            ),
+            gateway_client.call_gateway(
+                {"op": "query", "workflow_id": "wf-2", "query": "get_status", "args": [3]}
+            ),
+            gateway_client.call_gateway(
+                {"op": "signal", "workflow_id": "wf-2", "signal": "approve_resume", "args": ["ok"]}
+            ),
+            gateway_client.call_gateway({"op": "result", "workflow_id": "wf-2"}),
+        )
+
+    ping, executed, started, queried, signalled, result = _with_gateway(socket_path, client, scenario)
+
+    assert ping == {"status": "ok"}
+    assert executed == {"workflow": "ExecutionWorkflow", "echo": {"n": 1}}
+    assert client.executed == [("ExecutionWorkflow", {"n": 1}, "wf-1", "ari-smoke")]
+    assert started == {"workflow_id": "wf-2", "run_id": "run-wf-2"}
+    assert queried == {"query": "get_status", "args": [3]}
+    assert signalled == {"workflow_id": "wf-2", "status": "signal_sent"}
+    assert client.signals == [("wf-2", "approve_resume", ["ok"])]
+    assert result == {"workflow_id": "wf-2", "status": "complete"}
+
+
+def test_failed_operations_come_back_as_gateway_errors(socket_path):
+    def scenario():
+        errors = []
+        for request in (
+            {"op": "execute", "workflow": "BrokenWorkflow", "workflow_id": "wf-3"},
+            {"op": "execute", "workflow": "ExecutionWorkflow"},
+            {"op": "nope", "workflow_id": "wf-3"},
+        ):
+            with pytest.raises(gateway_client.GatewayError) as caught:
+                gateway_client.call_gateway(request)
+            errors.append(str(caught.value))
+        # The connection-per-request server keeps serving after errors.
+        errors.append(gateway_client.call_gateway({"op": "ping"}))
+        return errors
+
+    errors = _with_gateway(socket_path, _FakeClient(), scenario)
+
+    assert errors == [
+        "workflow failed",
+        "execute requires workflow and workflow_id",
+        "Unsupported gateway op: nope",
+        {"status": "ok"},
+    ]
+
+
+def test_runners_fall_back_when_no_gateway_is_listening(socket_path, monkeypatch):
+    with pytest.raises(gateway_client.GatewayUnavailable):
+        gateway_client.call_gateway({"op": "ping"})
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    with pytest.raises(gateway_client.GatewayUnavailable):
+        gateway_client.call_gateway({"op": "ping"})
+
+    monkeypatch.setenv("ARI_TEMPORAL_GATEWAY", "0")
+    with pytest.raises(gateway_client.GatewayUnavailable, match="disabled"):
+        gateway_client.call_gateway({"op": "ping"})
+
+
+def test_only_a_live_gateway_counts_as_answering(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    assert asyncio.run(_gateway_answers(socket_path)) is False
+
+    os.unlink(socket_path)
+    assert _with_gateway(
+        socket_path,
+        _FakeClient(),
+        lambda: asyncio.run(_gateway_answers(socket_path)),
+    )
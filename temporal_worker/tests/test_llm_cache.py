@@ -0,0 +1,95 @@
+import asyncio
+import types
+
+import pytest
+
+import activities
+import llm_cache
+from llm_cache import LlmResponseCache, cache_key
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+def test_cache_key_covers_model_prompt_and_max_tokens():
+    key = cache_key("model-a", "prompt", 100)
+
+    variants = {
+        key,
+        cache_key("model-b", "prompt", 100),
+        cache_key("model-a", "prompt!", 100),
+        cache_key("model-a", "prompt", 101),
+    }
+
+    assert key == cache_key("model-a", "prompt", 100)
+    assert len(variants) == 4
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = LlmResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60, max_bytes=0)
+    cache.put_sync("k", "model", "response")
+
+    clock.now += 59
+    assert cache.get_sync("k") == "response"
+    clock.now += 2
+    assert cache.get_sync("k") is None
+    assert cache.stats_sync()["entries"] == 0
+
+
+def test_size_bound_evicts_least_recently_used_first(tmp_path, clock):
+    cache = LlmResponseCache(tmp_path / "cache.sqlite", ttl_seconds=0, max_bytes=30)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.put_sync(key, "model", key * 10)
+    clock.now += 1
+    # Reading "a" makes "b" the least recently used entry.
+    assert cache.get_sync("a") == "a" * 10
+
+    clock.now += 1
+    cache.put_sync("d", "model", "d" * 10)
+
+    assert cache.get_sync("b") is None
+    assert [cache.get_sync(key) for key in ("a", "c", "d")] == ["a" * 10, "c" * 10, "d" * 10]
+    assert cache.stats_sync() == {"entries": 3, "total_bytes": 30, "max_bytes": 30}
+
+
+def test_call_llm_counts_hits_and_only_calls_the_provider_on_a_miss(tmp_path, monkeypatch):
+    cache = LlmResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60, max_bytes=0)
+    calls = []
+
+    async def create_chat_completion(model, messages, max_tokens, stats=None):
+        calls.append(messages[0]["content"])
+        message = types.SimpleNamespace(content=f"answer {len(calls)}")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+    client = types.SimpleNamespace(create_chat_completion=create_chat_completion)
+    monkeypatch.setattr(activities, "_get_llm_client", lambda: client)
+    monkeypatch.setattr(activities, "_get_llm_cache", lambda: cache)
+
+    async def scenario():
+        stats = {"cache": {"hits": 0, "misses": 0}}
+        token = activities._llm_call_stats.set(stats)
+        try:
+            answers = [await activities.call_llm("same prompt") for _ in range(3)]
+            answers.append(await activities.call_llm("same prompt", max_tokens=10))
+        finally:
+            activities._llm_call_stats.reset(token)
+        return answers, stats["cache"]
+
+    answers, cache_stats = asyncio.run(scenario())
+
+    assert answers == ["answer 1", "answer 1", "answer 1", "answer 2"]
+    assert calls == ["same prompt", "same prompt"]
+    assert cache_stats == {"hits": 2, "misses": 2}
@@ -0,0 +1,173 @@
+import asyncio
+import time
+import types
+
+import httpx
+import openai
+import pytest
+
+import activities
+import llm_client
+from llm_client import RateLimitedLlmClient, TokenBucket
+
+
+def _response(status, headers=None):
+    return httpx.Response(status, headers=headers, request=httpx.Request("POST", "http://llm.invalid"))
+
+
+def _rate_limited(retry_after=None):
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else None
+    return openai.RateLimitError("slow down", response=_response(429, headers), body=None)
+
+
+def _server_error():
+    return openai.InternalServerError("boom", response=_response(503), body=None)
+
+
+def _bad_request():
+    return openai.BadRequestError("no", response=_response(400), body=None)
+
+
+def _client(outcomes, **kwargs):
+    """A client whose provider call pops `outcomes`: exceptions are raised, anything else returned."""
+    client = RateLimitedLlmClient("key", "http://llm.invalid", **kwargs)
+    calls = []
+
+    async def create(**request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        outcome = outcomes.pop(0) if outcomes else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client._client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    )
+    return client, calls
+
+
+def test_token_bucket_allows_a_burst_then_paces_at_the_rate():
+    bucket = TokenBucket(rate=100.0, burst=2)
+
+    async def acquire_all():
+        started = time.monotonic()
+        waits = [await bucket.acquire() for _ in range(5)]
+        return waits, time.monotonic() - started
+
+    waits, elapsed = asyncio.run(acquire_all())
+
+    assert waits[:2] == [0.0, 0.0]
+    assert all(wait > 0 for wait in waits[2:])
+    assert elapsed >= 0.025
+
+
+def test_zero_rate_disables_the_bucket():
+    assert asyncio.run(TokenBucket(rate=0, burst=1).acquire()) == 0.0
+
+
+def test_retryable_errors_back_off_with_jitter_under_the_exponential_ceiling(monkeypatch):
+    ceilings = []
+    monkeypatch.setattr(llm_client.random, "uniform", lambda low, high: ceilings.append(high) or high)
+    client, calls = _client(
+        [_rate_limited(), _server_error(), "done"], backoff_base_seconds=0.01, backoff_max_seconds=0.015
+    )
+    stats = {}
+
+    result = asyncio.run(client.create_chat_completion("model", [], 10, stats=stats))
+
+    assert result == "done"
+    assert len(calls) == 3
+    assert ceilings == [0.01, 0.015]
+    assert stats["retries"] == 2
+    assert stats["throttled"] == 1
+    assert stats["backoff_seconds"] == pytest.approx(0.025)
+
+
+def test_retry_after_header_overrides_the_backoff(monkeypatch):
+    monkeypatch.setattr(llm_client.random, "uniform", lambda *_: pytest.fail("jitter used"))
+    client, _ = _client([_rate_limited(retry_after=0.05), "done"])
+    stats = {}
+
+    started = time.monotonic()
+    asyncio.run(client.create_chat_completion("model", [], 10, stats=stats))
+
+    assert time.monotonic() - started >= 0.05
+    assert stats["backoff_seconds"] == pytest.approx(0.05)
+
+
+def test_exhausted_and_non_retryable_errors_are_raised(monkeypatch):
+    client, calls = _client([_server_error()] * 3, max_retries=2, backoff_base_seconds=0.001)
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(client.create_chat_completion("model", [], 10))
+    assert len(calls) == 3
+
+    client, calls = _client([_bad_request()])
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(client.create_chat_completion("model", [], 10))
+    assert len(calls) == 1
+    assert client.stats()["failed"] == 1
+    assert client.stats()["in_flight"] == 0
+
+
+def test_in_flight_cap_holds_across_concurrent_callers():
+    client, _ = _client([], max_in_flight=2, requests_per_minute=0)
+
+    async def run_all():
+        return await asyncio.gather(*(client.create_chat_completion("model", [], 10) for _ in range(6)))
+
+    assert asyncio.run(run_all()) == ["ok"] * 6
+    stats = client.stats()
+    assert stats["max_in_flight_seen"] == 2
+    assert (stats["requests"], stats["completed"]) == (6, 6)
+    assert stats["queued_seconds"] > 0
+
+
+def test_a_throttled_model_does_not_hold_slots_other_models_need():
+    client, _ = _client(
+        [], max_in_flight=1, requests_per_minute=6000, model_requests_per_minute={"slow": 60}, burst=1
+    )
+
+    async def scenario():
+        await client.create_chat_completion("slow", [], 10)
+        # The slow model's next token is ~1s away; the fast call must not queue behind it.
+        slow = asyncio.ensure_future(client.create_chat_completion("slow", [], 10))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        await client.create_chat_completion("fast", [], 10)
+        fast_seconds = time.monotonic() - started
+        slow.cancel()
+        return fast_seconds
+
+    assert asyncio.run(scenario()) < 0.5
+
+
+def test_call_llm_raises_provider_errors_instead_of_returning_them(monkeypatch):
+    async def failing(**_kwargs):
+        raise _server_error()
+
+    monkeypatch.setattr(
+        activities, "_get_llm_client", lambda: types.SimpleNamespace(create_chat_completion=failing)
+    )
+    monkeypatch.setattr(activities, "_get_llm_cache", lambda: None)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(activities.call_llm("prompt"))
+
+
+@pytest.mark.parametrize("error, raised", [(_server_error(), True), (_bad_request(), False)])
+def test_design_block_only_falls_back_on_non_retryable_llm_errors(monkeypatch, error, raised):
+    async def failing(*_args, **_kwargs):
+        raise error
+
+    monkeypatch.setattr(activities, "_openrouter_api_key", lambda: "key")
+    monkeypatch.setattr(activities, "call_llm", failing)
+    block = activities._generate_block_output("B3", {"roadmap_task": "Add search"}, {})
+
+    if raised:
+        with pytest.raises(type(error)):
+            asyncio.run(block)
+    else:
+        output = asyncio.run(block)
+        assert output["design_notes"] == "Mock plan - LLM not available"
+        assert output["implementation_plan"]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from temporalio import workflow
+
+from workflows import MendixMigrationWorkflow
+
+RECORD_COUNT = 25
+CHUNK_SIZE = 10
+
+
+class _ContinuedAsNew(Exception):
+    pass
+
+
+@pytest.fixture
+def source(tmp_path):
+    records = [
+        {"source_id": f"mx-{i}", "full_name": f"Person {i}", "email": f"P{i}@Example.com"}
+        for i in range(RECORD_COUNT)
+    ]
+    (tmp_path / "source.json").write_text(json.dumps({"records": records}), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def parked_parts(workflow_runtime):
+    """Row counts of every audit part the workflow parks on disk."""
+    return lambda: [
+        len(payload["record_audit_rows"])
+        for name, payload in workflow_runtime.calls
+        if name == "write_migration_audit_part_activity"
+    ]
+
+
+def _payload(source, **overrides):
+    return {
+        "migration_id": "streaming-test",
+        "repo_root": str(source),
+        "output_dir": "reports",
+        "source_path": "source.json",
+        "extract_mode": "streaming",
+        "extract_chunk_size": CHUNK_SIZE,
+        "batch_size": 4,
+        "latency_profile": "none",
+        **overrides,
+    }
+
+
+def _report_rows(result):
+    with open(result["report_path"], encoding="utf-8") as handle:
+        return json.load(handle)["record_audit_rows"]
+
+
+def test_streaming_keeps_only_counts_in_workflow_state(source, parked_parts):
+    migration = MendixMigrationWorkflow()
+
+    result = asyncio.run(migration.run(_payload(source)))
+
+    assert parked_parts() == [10, 10, 5]
+    assert result["record_audit_rows"] == []
+    assert migration._audit_index == {}
+    summary = result["summary"]
+    assert summary["extracted_count"] == summary["transformed_count"] == RECORD_COUNT
+    assert summary["skipped_loads"] == RECORD_COUNT
+    assert (summary["loaded_count"], summary["failed_loads"]) == (0, 0)
+    load = next(c for c in result["checkpoints"] if c["stage"] == "load")
+    assert load["record_count"] == RECORD_COUNT
+    rows = _report_rows(result)
+    assert [row["source_identifier"] for row in rows] == [f"mx-{i}" for i in range(RECORD_COUNT)]
+    assert {row["load_status"] for row in rows} == {"dry_run_skipped"}
+
+
+def test_windowed_streaming_carries_parts_across_generations(source, parked_parts, monkeypatch):
+    def continue_as_new(arg):
+        raise _ContinuedAsNew(arg)
+
+    monkeypatch.setattr(workflow, "continue_as_new", continue_as_new)
+    payload = _payload(source, window_size=12)
+    generations = 0
+    while True:
+        try:
+            result = asyncio.run(MendixMigrationWorkflow().run(payload))
+            break
+        except _ContinuedAsNew as continued:
+            payload = continued.args[0]
+            generations += 1
+
+    assert generations == 2
+    assert sum(parked_parts()) == RECORD_COUNT
+    assert len(payload["window_state"]["audit_part_paths"]) == len(parked_parts()) - 1
+    window = next(c for c in result["checkpoints"] if c["stage"] == "window")
+    assert window["audit_row_count"] == RECORD_COUNT
+    assert result["summary"]["skipped_loads"] == RECORD_COUNT
+    assert len(_report_rows(result)) == RECORD_COUNT
@@ -0,0 +1,84 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+
+import pytest
+from temporalio.api.common.v1 import Payload
+
+from payload_codec import CLAIM_CHECK_ENCODING, BlobStore, ClaimCheckCodec
+
+
+def _payload(size):
+    return Payload(metadata={"encoding": b"json/plain"}, data=b"x" * size)
+
+
+@pytest.fixture
+def codec(tmp_path):
+    return ClaimCheckCodec(BlobStore(tmp_path / "blobs"), threshold_bytes=1024)
+
+
+def test_large_payloads_round_trip_through_a_claim_check(codec):
+    small, large = _payload(10), _payload(200_000)
+
+    encoded = asyncio.run(codec.encode([small, large]))
+
+    assert encoded[0] == small
+    assert encoded[1].metadata["encoding"] == CLAIM_CHECK_ENCODING
+    assert encoded[1].ByteSize() < 300
+    assert asyncio.run(codec.decode(encoded)) == [small, large]
+
+
+def test_codec_disabled_with_zero_threshold(tmp_path):
+    codec = ClaimCheckCodec(BlobStore(tmp_path / "blobs"), threshold_bytes=0)
+    large = _payload(200_000)
+    assert asyncio.run(codec.encode([large])) == [large]
+
+
+def test_corrupted_blob_fails_the_integrity_check(codec):
+    (encoded,) = asyncio.run(codec.encode([_payload(5000)]))
+    digest = json.loads(encoded.data)["sha256"]
+    path = codec.store.path_for(digest)
+    path.write_bytes(path.read_bytes().split(b"\n", 1)[0] + b"\n" + gzip.compress(b"bad"))
+
+    with pytest.raises(ValueError, match="integrity"):
+        asyncio.run(codec.decode([encoded]))
+
+
+def test_concurrent_puts_of_one_payload_do_not_collide(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    data = os.urandom(100_000)
+    errors = []
+
+    def put():
+        try:
+            store.put(data)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=put) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert list((tmp_path / "blobs").glob("*/*.tmp")) == []
+    digest, _ = store.put(data)
+    assert store.get(digest) == data
+
+
+def test_gc_keeps_blobs_that_are_read_and_removes_stale_ones(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    read_digest, _ = store.put(b"read back later")
+    stale_digest, _ = store.put(b"never used again")
+    for digest in (read_digest, stale_digest):
+        os.utime(store.path_for(digest), (0, 0))
+
+    store.get(read_digest)
+    result = store.gc(max_age_seconds=3600)
+
+    assert result["removed"] == 1 and result["kept"] == 1
+    assert store.path_for(read_digest).exists()
+    assert not store.path_for(stale_digest).exists()
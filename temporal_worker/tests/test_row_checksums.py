@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+from activities import (
+    CHECKSUM_BUCKETS,
+    SqliteLoadTarget,
+    _add_to_row_checksum,
+    _checksum_bucket,
+    _load_idempotency_key,
+    _mismatched_buckets,
+    _record_content_hash,
+    _transform_source_record,
+    _validate_row_checksums,
+    empty_row_checksum,
+    merge_row_checksums,
+    narrow_checksum_mismatches_activity,
+)
+
+ROWS = [(f"mx-{index}", f"hash-{index}") for index in range(200)]
+
+
+def _checksum(rows):
+    checksum = empty_row_checksum()
+    for key, content_hash in rows:
+        _add_to_row_checksum(checksum, key, content_hash)
+    return checksum
+
+
+def test_merge_is_independent_of_order_and_chunking():
+    shuffled = ROWS[:]
+    random.Random(7).shuffle(shuffled)
+    chunks = [shuffled[start : start + 37] for start in range(0, len(shuffled), 37)]
+
+    merged = merge_row_checksums(*(_checksum(chunk) for chunk in chunks))
+
+    assert merged == _checksum(ROWS)
+    assert sum(count for count, _ in merged) == len(ROWS)
+    assert len(merged) == CHECKSUM_BUCKETS
+
+
+def test_merge_ignores_missing_stages():
+    assert merge_row_checksums(None, {}, _checksum(ROWS[:5])) == _checksum(ROWS[:5])
+    assert merge_row_checksums() == empty_row_checksum()
+
+
+def test_changed_and_missing_rows_mismatch_only_their_buckets():
+    changed = [(key, "other" if key == "mx-3" else value) for key, value in ROWS]
+    missing = [row for row in ROWS if row[0] != "mx-9"]
+
+    assert _mismatched_buckets(_checksum(ROWS), _checksum(ROWS)) == []
+    assert [item["bucket"] for item in _mismatched_buckets(_checksum(ROWS), _checksum(changed))] == [
+        _checksum_bucket("mx-3")
+    ]
+    (item,) = _mismatched_buckets(_checksum(ROWS), _checksum(missing))
+    assert item["bucket"] == _checksum_bucket("mx-9")
+    assert item["expected_count"] == item["actual_count"] + 1
+
+
+def _keys(rows):
+    return _checksum([(key, "") for key, _ in rows])
+
+
+def test_validation_reports_matching_and_mismatching_stages():
+    matching = {
+        "extract_keys": _keys(ROWS),
+        "transform_keys": _keys(ROWS),
+        "transform_rows": _checksum(ROWS),
+        "target": _checksum(ROWS),
+    }
+    result = _validate_row_checksums({"checksums": matching})
+    assert result["checksum_match"] is True
+    assert result["checksum_rows_covered"] == len(ROWS)
+    assert result["checksum_mismatched_bucket_ids"] == []
+
+    broken = {**matching, "target": _checksum(ROWS[1:])}
+    result = _validate_row_checksums({"checksums": broken})
+    assert result["checksum_match"] is False
+    assert result["checksum_mismatched_bucket_ids"] == [_checksum_bucket(ROWS[0][0])]
+
+
+def test_validation_skips_stages_without_checksums():
+    # Resumed from load: no extract or transform checksums, only the target's.
+    result = _validate_row_checksums({"checksums": {"target": _checksum(ROWS)}})
+    assert result["checksum_compared"] == []
+    assert result["checksum_match"] is False
+    assert result["checksum_unverified_reason"]
+
+    result = _validate_row_checksums({"checksums": {}})
+    assert result["checksum_match"] is False
+    assert result["checksum_rows_covered"] == 0
+
+
+SOURCE_CSV = "source_id,full_name,email\n" + "".join(
+    f"mx-{index},First Last{index},user{index}@example.com\n" for index in range(50)
+)
+
+
+def _source_record(index):
+    return {
+        "source_id": f"mx-{index}",
+        "source_identifier": f"mx-{index}",
+        "full_name": f"First Last{index}",
+        "email": f"user{index}@example.com",
+        "created_at": "",
+        "active": True,
+    }
+
+
+@pytest.fixture
+def loaded_target(tmp_path):
+    (tmp_path / "source.csv").write_text(SOURCE_CSV, encoding="utf-8")
+    target = SqliteLoadTarget(tmp_path / ".ari" / "target.sqlite", "migrated_records")
+    rows = []
+    for index in range(50):
+        record = _transform_source_record(_source_record(index))
+        rows.append(
+            {
+                "idempotency_key": _load_idempotency_key(record["target_id"]),
+                "target_id": record["target_id"],
+                "source_identifier": record["source_identifier"],
+                "record": record,
+            }
+        )
+    return tmp_path, target, rows
+
+
+def test_load_target_stores_content_hashes_and_skips_identical_retries(loaded_target):
+    _, target, rows = loaded_target
+
+    assert len(target.write_batch(rows)) == len(rows)
+    assert target.write_batch(rows) == set()
+    hashes = target.content_hashes([row["target_id"] for row in rows] + ["absent"])
+    assert hashes == {row["target_id"]: _record_content_hash(row["record"]) for row in rows}
+
+
+def test_narrowing_finds_missing_and_changed_rows(loaded_target):
+    repo_root, target, rows = loaded_target
+    changed = {**rows[3], "record": {**rows[3]["record"], "email": "tampered@example.com"}}
+    target.write_batch([row for row in rows if row["target_id"] != "mx-7"] + [changed])
+    buckets = sorted({_checksum_bucket("mx-3"), _checksum_bucket("mx-7")})
+
+    result = narrow_checksum_mismatches_activity(
+        {
+            "repo_root": str(repo_root),
+            "source_path": "source.csv",
+            "source_mode": "file",
+            "dry_run": False,
+            "load_target": {"path": ".ari/target.sqlite"},
+            "buckets": buckets,
+        }
+    )
+
+    issues = {row["target_id"]: row["issue"] for row in result["checksum_mismatched_rows"]}
+    assert issues == {"mx-3": "content_mismatch", "mx-7": "missing_in_target"}
+
+
+def test_narrowing_needs_a_file_source():
+    result = narrow_checksum_mismatches_activity({"buckets": [1], "source_mode": "inline"})
+    assert result["checksum_mismatched_rows"] == []
+    assert result["checksum_narrowing_skipped"]
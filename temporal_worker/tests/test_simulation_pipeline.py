@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from workflows import SimulationWorkflow
+
+
+@pytest.fixture
+def timeline(workflow_runtime):
+    """Fake simulation activities that log events and track the in-flight window."""
+    events = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def execute(assignment):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        events.append(("execute_start", assignment["id"]))
+        await asyncio.sleep(assignment["estimated_duration"])
+        events.append(("execute_end", assignment["id"]))
+        return {"id": assignment["id"], "status": "complete", "latency_profile": "none"}
+
+    async def artifact(payload):
+        task_id = payload["assignment"]["id"]
+        events.append(("artifact_start", task_id))
+        await asyncio.sleep(0.01)
+        events.append(("artifact_end", task_id))
+        in_flight["now"] -= 1
+        return {"task_id": task_id, "candidate": payload["artifact_candidate"]}
+
+    workflow_runtime.fakes["execute_assignment_activity"] = execute
+    workflow_runtime.fakes["generate_simulation_artifact_activity"] = artifact
+    return events, in_flight
+
+
+def _run(payload):
+    return asyncio.run(SimulationWorkflow().run(payload))
+
+
+def test_pipelined_results_keep_plan_order_when_tasks_finish_out_of_order(timeline):
+    events, _ = timeline
+    # Later tasks are faster, so they finish first.
+    plan = [{"id": f"t{i}", "estimated_duration": 0.05 - i * 0.01} for i in range(5)]
+    candidates = [{"name": f"artifact-{i}"} for i in range(5)]
+
+    result = _run(
+        {
+            "assignment_plan": plan,
+            "artifact_candidates": candidates,
+            "execution_mode": "pipelined",
+            "max_in_flight": 5,
+        }
+    )
+
+    assert [task["id"] for task in result["tasks"]] == ["t0", "t1", "t2", "t3", "t4"]
+    assert [artifact["candidate"] for artifact in result["artifacts"]] == candidates
+    finished = [task_id for kind, task_id in events if kind == "execute_end"]
+    assert finished == ["t4", "t3", "t2", "t1", "t0"]
+
+
+def test_pipelined_mode_overlaps_artifacts_with_execution_within_the_window(timeline):
+    events, in_flight = timeline
+    plan = [{"id": f"t{i}", "estimated_duration": 0.02} for i in range(6)]
+
+    result = _run({"assignment_plan": plan, "execution_mode": "pipelined", "max_in_flight": 2})
+
+    assert result["task_count"] == 6
+    assert in_flight["max"] == 2
+    # Some artifact is generated while another task is still executing.
+    executing = set()
+    overlapped = False
+    for kind, task_id in events:
+        if kind == "execute_start":
+            executing.add(task_id)
+        elif kind == "execute_end":
+            executing.discard(task_id)
+        elif kind == "artifact_start" and executing:
+            overlapped = True
+    assert overlapped
+
+
+def test_pipelined_tasks_wait_for_their_dependencies_to_execute(timeline):
+    events, _ = timeline
+    plan = [
+        {"id": "slow", "estimated_duration": 0.05},
+        {"id": "fast", "estimated_duration": 0.0},
+        {"id": "child", "estimated_duration": 0.0},
+    ]
+    graph = [{"id": "child", "dependencies": ["slow"]}]
+
+    _run(
+        {
+            "assignment_plan": plan,
+            "instruction_graph": graph,
+            "execution_mode": "pipelined",
+            "max_in_flight": 3,
+        }
+    )
+
+    assert events.index(("execute_start", "child")) > events.index(("execute_end", "slow"))
+    assert events.index(("execute_end", "fast")) < events.index(("execute_end", "slow"))
+
+
+def test_serial_mode_runs_execute_then_artifact_one_task_at_a_time(timeline, workflow_runtime):
+    _, in_flight = timeline
+    plan = [{"id": f"t{i}", "estimated_duration": 0.0} for i in range(3)]
+
+    result = _run({"assignment_plan": plan, "execution_mode": "unknown-mode"})
+
+    assert result["execution_mode"] == "serial"
+    assert in_flight["max"] == 1
+    assert workflow_runtime.activity_names() == [
+        "execute_assignment_activity",
+        "generate_simulation_artifact_activity",
+    ] * 3
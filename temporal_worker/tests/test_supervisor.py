@@ -0,0 +1,59 @@
+import asyncio
+import sys
+
+import pytest
+
+import supervisor
+from supervisor import WorkerSupervisor
+
+
+@pytest.fixture(autouse=True)
+def fast_restarts(monkeypatch):
+    monkeypatch.setattr(supervisor, "RESTART_BACKOFF_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(supervisor, "MAX_STARTUP_FAILURES", 3)
+
+
+def _supervise(monkeypatch, script, processes=1):
+    """Run a supervisor whose children run `script`; return (exit code, events)."""
+    monkeypatch.setattr(
+        WorkerSupervisor, "_child_command", lambda self, index: [sys.executable, "-c", script]
+    )
+    logged = []
+    monkeypatch.setattr(supervisor, "_log", lambda event, **fields: logged.append({"event": event, **fields}))
+    code = asyncio.run(WorkerSupervisor(processes, []).run())
+    return code, logged
+
+
+def _events(logged, event):
+    return [entry for entry in logged if entry["event"] == event]
+
+
+def test_a_clean_exit_is_not_restarted(monkeypatch):
+    code, logged = _supervise(monkeypatch, "pass", processes=2)
+
+    assert code == 0
+    assert len(_events(logged, "started")) == 2
+    assert [entry["returncode"] for entry in _events(logged, "exited")] == [0, 0]
+    assert _events(logged, "crashed") == []
+
+
+def test_a_crash_is_restarted_with_backoff(monkeypatch, tmp_path):
+    marker = tmp_path / "crashed-once"
+    script = f"import pathlib, sys; m = pathlib.Path({str(marker)!r}); sys.exit(0 if m.exists() else m.touch() or 1)"
+
+    code, logged = _supervise(monkeypatch, script)
+
+    assert code == 0
+    assert len(_events(logged, "started")) == 2
+    (crash,) = _events(logged, "crashed")
+    assert (crash["returncode"], crash["restart_in_seconds"]) == (1, 0.01)
+
+
+def test_a_slot_that_keeps_failing_at_startup_is_given_up(monkeypatch):
+    code, logged = _supervise(monkeypatch, "import sys; sys.exit(2)")
+
+    assert code == 1
+    assert len(_events(logged, "started")) == 3
+    assert [entry["restart_in_seconds"] for entry in _events(logged, "crashed")] == [0.01, 0.02]
+    (given_up,) = _events(logged, "giving_up")
+    assert (given_up["returncode"], given_up["startup_failures"]) == (2, 3)
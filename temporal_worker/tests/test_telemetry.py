@@ -0,0 +1,46 @@
+import gc
+
+import telemetry
+from telemetry import ACTIVITY_DURATION_METRIC, LLM_CALL_LATENCY_METRIC, record_histogram
+
+
+class _Histogram:
+    def __init__(self):
+        self.values = []
+
+    def record(self, value, attributes=None):
+        self.values.append((value, attributes))
+
+
+class _Meter:
+    def __init__(self):
+        self.created = {}
+
+    def create_histogram_float(self, name, description=None, unit=None):
+        self.created[name] = self.created.get(name, 0) + 1
+        return _Histogram()
+
+
+def test_histograms_are_created_once_per_meter_and_name():
+    meter, other = _Meter(), _Meter()
+
+    for value in (0.1, 0.2, 0.3):
+        record_histogram(meter, ACTIVITY_DURATION_METRIC, value, {"outcome": "completed"})
+    record_histogram(meter, LLM_CALL_LATENCY_METRIC, 1.0)
+    record_histogram(other, ACTIVITY_DURATION_METRIC, 0.4)
+
+    assert meter.created == {ACTIVITY_DURATION_METRIC: 1, LLM_CALL_LATENCY_METRIC: 1}
+    assert other.created == {ACTIVITY_DURATION_METRIC: 1}
+    histogram = telemetry._histograms[meter][ACTIVITY_DURATION_METRIC]
+    assert [value for value, _ in histogram.values] == [0.1, 0.2, 0.3]
+
+
+def test_cached_histograms_are_released_with_their_meter():
+    meter = _Meter()
+    record_histogram(meter, ACTIVITY_DURATION_METRIC, 0.1)
+    assert meter in telemetry._histograms
+
+    del meter
+    gc.collect()
+
+    assert not any(isinstance(key, _Meter) for key in telemetry._histograms.keys())
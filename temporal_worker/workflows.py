@@ -0,0 +1,1373 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+# Workflow definitions only. The sandbox re-imports this module for every
+# workflow run, so everything non-deterministic (activities, clients, I/O
+# helpers) comes in through passthrough imports, loaded once per process.
+with workflow.unsafe.imports_passed_through():
+    from activities import (
+        _ACTIVITY_POOL_BY_NAME,
+        DEFAULT_BLOCK_HEARTBEAT_TIMEOUT_SECONDS,
+        DEFAULT_EXTRACT_CHUNK_SIZE,
+        DOGFOOD_STREAMING_BLOCKS,
+        _default_migration_source_records,
+        _reported_latency_profile,
+        execute_assignment_activity,
+        execute_dogfood_block_activity,
+        extract_mendix_records_activity,
+        extract_mendix_records_chunk_activity,
+        generate_change_bundle_stub_activity,
+        generate_simulation_artifact_activity,
+        load_records_batch_activity,
+        merge_row_checksums,
+        narrow_checksum_mismatches_activity,
+        pool_task_queue,
+        run_pr_agent_loop_activity,
+        transform_records_batch_activity,
+        validate_migration_activity,
+        write_migration_audit_part_activity,
+        write_migration_report_activity,
+    )
+    from telemetry import DOGFOOD_BLOCK_DURATION_METRIC, record_histogram
+
+
+def _activity_task_queue(fn: Any) -> str:
+    """Task queue for `fn`, derived from the calling workflow's own queue."""
+    return pool_task_queue(workflow.info().task_queue, _ACTIVITY_POOL_BY_NAME[fn.__name__])
+
+
+@workflow.defn
+class SmokeWorkflow:
+    @workflow.run
+    async def run(self, name: str) -> str:
+        return f"hello {name}"
+
+
+DEFAULT_EXECUTION_MAX_PARALLELISM = 8
+
+
+def _build_assignment_dependencies(
+    assignment_plan: list[dict[str, Any]], instruction_graph: list[Any]
+) -> list[list[int]]:
+    """For each assignment, the plan indexes of the assignments it must wait for.
+
+    Edges come from the assignment's own ``dependencies`` list and from the
+    matching ``instruction_graph`` node. Assignments are keyed by position, not
+    id: a dependency on an id several assignments share waits for all of them,
+    and an assignment with an empty id cannot be depended on. Edges pointing
+    outside the plan are dropped so a partial graph never blocks dispatch.
+    """
+    indexes_by_id: dict[str, list[int]] = {}
+    for index, assignment in enumerate(assignment_plan):
+        task_id = str(assignment.get("id", ""))
+        if task_id:
+            indexes_by_id.setdefault(task_id, []).append(index)
+    graph_dependencies: dict[str, list[Any]] = {}
+    for node in instruction_graph:
+        if isinstance(node, dict) and isinstance(node.get("dependencies"), list):
+            graph_dependencies[str(node.get("id", ""))] = node["dependencies"]
+
+    dependencies: list[list[int]] = []
+    for index, assignment in enumerate(assignment_plan):
+        task_id = str(assignment.get("id", ""))
+        own = assignment.get("dependencies") if isinstance(assignment.get("dependencies"), list) else []
+        graph = graph_dependencies.get(task_id, []) if task_id else []
+        merged: list[int] = []
+        for dep in [*own, *graph]:
+            dep_id = str(dep)
+            if dep_id == task_id:
+                continue
+            for dep_index in indexes_by_id.get(dep_id, []):
+                if dep_index not in merged:
+                    merged.append(dep_index)
+        dependencies.append(merged)
+    return dependencies
+
+
+def _break_dependency_cycles(dependencies: list[list[int]]) -> list[list[int]]:
+    """Drop edges that point forward in plan order when the graph has a cycle.
+
+    Keeping only edges to earlier assignments always yields a DAG, and it
+    matches the serial order the workflow used before dependency-aware dispatch.
+    """
+    remaining = [set(deps) for deps in dependencies]
+    ready = [index for index, deps in enumerate(remaining) if not deps]
+    resolved: set[int] = set()
+    while ready:
+        current = ready.pop()
+        resolved.add(current)
+        for index, deps in enumerate(remaining):
+            if current in deps:
+                deps.discard(current)
+                if not deps and index not in resolved:
+                    ready.append(index)
+    if len(resolved) == len(dependencies):
+        return dependencies
+
+    return [[dep for dep in deps if dep < index] for index, deps in enumerate(dependencies)]
+
+
+@workflow.defn
+class ExecutionWorkflow:
+    @workflow.run
+    async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        assignment_plan = [
+            assignment
+            for assignment in payload.get("assignment_plan", [])
+            if isinstance(assignment, dict)
+        ]
+        instruction_graph = (
+            payload.get("instruction_graph")
+            if isinstance(payload.get("instruction_graph"), list)
+            else []
+        )
+        max_parallelism = max(
+            1, int(payload.get("max_parallelism", DEFAULT_EXECUTION_MAX_PARALLELISM) or 1)
+        )
+        latency_profile = str(payload.get("latency_profile") or "")
+
+        dependencies = _break_dependency_cycles(
+            _build_assignment_dependencies(assignment_plan, instruction_graph)
+        )
+
+        slots = asyncio.Semaphore(max_parallelism)
+        done = [asyncio.Event() for _ in assignment_plan]
+        finish_times = [0.0 for _ in assignment_plan]
+
+        async def run_assignment(index: int, assignment: dict[str, Any]) -> dict[str, Any]:
+            for dep_index in dependencies[index]:
+                await done[dep_index].wait()
+            timeout_seconds = max(
+                5,
+                int(float(assignment.get("estimated_duration", 0) or 0)) + 5,
+            )
+            async with slots:
+                result = await workflow.execute_activity(
+                    execute_assignment_activity,
+                    {**assignment, "latency_profile": latency_profile},
+                    task_queue=_activity_task_queue(execute_assignment_activity),
+                    start_to_close_timeout=timedelta(seconds=timeout_seconds),
+                    retry_policy=RetryPolicy(
+                        maximum_attempts=3,
+                        initial_interval=timedelta(seconds=1),
+                    ),
+                )
+            finish_times[index] = max(
+                [finish_times[dep_index] for dep_index in dependencies[index]],
+                default=0.0,
+            ) + float(result.get("actual_duration", 0) or 0)
+            done[index].set()
+            return result
+
+        completed_tasks: list[dict[str, Any]] = list(
+            await asyncio.gather(
+                *(run_assignment(index, assignment) for index, assignment in enumerate(assignment_plan))
+            )
+        )
+        total_cost = sum(float(result.get("actual_cost", 0) or 0) for result in completed_tasks)
+        total_duration = sum(
+            float(result.get("actual_duration", 0) or 0) for result in completed_tasks
+        )
+
+        return {
+            "execution_id": str(payload.get("execution_id", "unknown")),
+            "rule_set_id": str(payload.get("rule_set_id", "unknown")),
+            "status": "complete",
+            "tasks": completed_tasks,
+            "actual_cost": total_cost,
+            "actual_duration": total_duration,
+            "critical_path_duration": max(finish_times, default=0.0),
+            "max_parallelism": max_parallelism,
+            "latency_profile": _reported_latency_profile(completed_tasks) or latency_profile,
+            "task_count": len(completed_tasks),
+        }
+
+
+DEFAULT_SIMULATION_MAX_IN_FLIGHT = 4
+SIMULATION_EXECUTION_MODES = {"serial", "pipelined"}
+
+
+@workflow.defn
+class SimulationWorkflow:
+    @workflow.run
+    async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        assignment_plan = payload.get("assignment_plan", [])
+        graph = payload.get("instruction_graph", [])
+        artifact_candidates = (
+            payload.get("artifact_candidates")
+            if isinstance(payload.get("artifact_candidates"), list)
+            else []
+        )
+        execution_mode = str(payload.get("execution_mode", "serial")).strip().lower()
+        if execution_mode not in SIMULATION_EXECUTION_MODES:
+            execution_mode = "serial"
+        max_in_flight = max(
+            1, int(payload.get("max_in_flight", DEFAULT_SIMULATION_MAX_IN_FLIGHT) or 1)
+        )
+        latency_profile = str(payload.get("latency_profile") or "")
+        node_by_id: dict[str, dict[str, Any]] = {}
+        for node in graph:
+            if isinstance(node, dict):
+                node_id = str(node.get("id", ""))
+                if node_id:
+                    node_by_id[node_id] = node
+
+        async def execute_task(assignment: dict[str, Any]) -> dict[str, Any]:
+            timeout_seconds = max(
+                5,
+                int(float(assignment.get("estimated_duration", 0) or 0)) + 5,
+            )
+            return await workflow.execute_activity(
+                execute_assignment_activity,
+                {**assignment, "latency_profile": latency_profile},
+                task_queue=_activity_task_queue(execute_assignment_activity),
+                start_to_close_timeout=timedelta(seconds=timeout_seconds),
+                retry_policy=RetryPolicy(
+                    maximum_attempts=3,
+                    initial_interval=timedelta(seconds=1),
+                ),
+            )
+
+        async def generate_artifact(index: int, assignment: dict[str, Any]) -> dict[str, Any]:
+            task_id = str(assignment.get("id", ""))
+            return await workflow.execute_activity(
+                generate_simulation_artifact_activity,
+                {
+                    "assignment": assignment,
+                    "instruction_node": node_by_id.get(task_id, {}),
+                    "artifact_candidate": (
+                        artifact_candidates[index]
+                        if index < len(artifact_candidates)
+                        and isinstance(artifact_candidates[index], dict)
+                        else {}
+                    ),
+                    "latency_profile": latency_profile,
+                },
+                task_queue=_activity_task_queue(generate_simulation_artifact_activity),
+                start_to_close_timeout=timedelta(seconds=10),
+                retry_policy=RetryPolicy(
+                    maximum_attempts=3,
+                    initial_interval=timedelta(seconds=1),
+                ),
+            )
+
+        completed_tasks: list[dict[str, Any]] = []
+        artifacts: list[dict[str, Any]] = []
+
+        if execution_mode == "pipelined":
+            # Each assignment runs execute -> artifact on its own, so while task i
+            # is generating its artifact, task i+1 is already executing. Edges from
+            # the instruction graph gate a task until its dependencies executed.
+            indexed_plan = [
+                (index, assignment)
+                for index, assignment in enumerate(assignment_plan)
+                if isinstance(assignment, dict)
+            ]
+            dependencies = _break_dependency_cycles(
+                _build_assignment_dependencies([assignment for _, assignment in indexed_plan], graph)
+            )
+            window = asyncio.Semaphore(max_in_flight)
+            executed = [asyncio.Event() for _ in indexed_plan]
+
+            async def run_in_window(
+                position: int, index: int, assignment: dict[str, Any]
+            ) -> tuple[dict[str, Any], dict[str, Any]]:
+                for dep_position in dependencies[position]:
+                    await executed[dep_position].wait()
+                async with window:
+                    task_result = await execute_task(assignment)
+                    executed[position].set()
+                    artifact_result = await generate_artifact(index, assignment)
+                return task_result, artifact_result
+
+            outcomes = await asyncio.gather(
+                *(
+                    run_in_window(position, index, assignment)
+                    for position, (index, assignment) in enumerate(indexed_plan)
+                )
+            )
+            for task_result, artifact_result in outcomes:
+                completed_tasks.append(task_result)
+                artifacts.append(artifact_result)
+        else:
+            for index, assignment in enumerate(assignment_plan):
+                completed_tasks.append(await execute_task(assignment))
+                artifacts.append(await generate_artifact(index, assignment))
+
+        return {
+            "simulation_id": str(payload.get("simulation_id", "unknown")),
+            "rule_set_id": str(payload.get("rule_set_id", "unknown")),
+            "status": "complete",
+            "execution_mode": execution_mode,
+            "latency_profile": _reported_latency_profile(completed_tasks) or latency_profile,
+            "tasks": completed_tasks,
+            "artifacts": artifacts,
+            "task_count": len(completed_tasks),
+        }
+
+
+def _rollup_block_metrics(block_metrics: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Totals plus the slowest and most expensive block, for status and results."""
+    totals = {
+        "duration_seconds": round(sum(m["duration_seconds"] for m in block_metrics.values()), 3),
+        "attempts": sum(m["attempts"] for m in block_metrics.values()),
+        "prompt_tokens": sum(m["prompt_tokens"] for m in block_metrics.values()),
+        "completion_tokens": sum(m["completion_tokens"] for m in block_metrics.values()),
+        "estimated_cost_usd": round(
+            sum(m["estimated_cost_usd"] for m in block_metrics.values()), 6
+        ),
+    }
+    costed = {block: m for block, m in block_metrics.items() if m["estimated_cost_usd"] > 0}
+    return {
+        "blocks": {
+            block: {
+                key: m[key]
+                for key in (
+                    "duration_seconds",
+                    "attempts",
+                    "prompt_tokens",
+                    "completion_tokens",
+                    "estimated_cost_usd",
+                )
+            }
+            for block, m in block_metrics.items()
+        },
+        "totals": totals,
+        "slowest_block": max(
+            block_metrics, key=lambda block: block_metrics[block]["duration_seconds"], default=None
+        ),
+        "most_expensive_block": max(
+            costed, key=lambda block: costed[block]["estimated_cost_usd"], default=None
+        ),
+    }
+
+
+@workflow.defn
+class DogfoodB1B8Workflow:
+    # @workflow.init so step_mode is known before the first activation's
+    # handlers run: next-step may send advance_and_wait right after start.
+    @workflow.init
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._approval_granted = False
+        self._approval_note = ""
+        self._step_mode = bool(payload.get("step_mode", False))
+        self._advance_requested = False
+        self._advance_note = ""
+        self._current_block = "not-started"
+        self._status = "pending"
+        self._history: list[dict[str, Any]] = []
+        # Set at block boundaries only: a workflow cannot read its activities'
+        # heartbeats, so live tokens/elapsed for the running block come from the
+        # activity's heartbeat details (`run_dogfood.py status` overlays them).
+        self._block_progress: dict[str, Any] = {}
+        self._block_metrics: dict[str, dict[str, Any]] = {}
+
+    @workflow.signal
+    async def approve_resume(self, note: str = "") -> None:
+        self._approval_granted = True
+        self._approval_note = note
+
+    @workflow.signal
+    async def advance_step(self, note: str = "") -> None:
+        self._advance_requested = True
+        self._advance_note = note
+
+    @workflow.update
+    async def advance_and_wait(self, note: str = "") -> dict[str, Any]:
+        """Advance one step-mode block and return once its result is recorded.
+
+        Returns when the workflow next stops (waiting for advance or
+        approval) or finishes, with the history entries added meanwhile.
+        """
+        start = len(self._history)
+        self._advance_requested = True
+        self._advance_note = note
+        await workflow.wait_condition(
+            lambda: not self._advance_requested
+            and self._status in {"waiting_for_advance", "waiting_for_approval", "complete", "failed"}
+        )
+        return {
+            "status": self._status,
+            "current_block": self._current_block,
+            "block_rollup": _rollup_block_metrics(self._block_metrics),
+            "start": start,
+            "history_length": len(self._history),
+            "entries": self._history[start:],
+        }
+
+    @advance_and_wait.validator
+    def _validate_advance_and_wait(self, note: str = "") -> None:
+        if not self._step_mode:
+            raise ValueError("advance_and_wait requires a step_mode run")
+        if self._status in {"complete", "failed"}:
+            raise ValueError(f"Workflow is already {self._status}")
+        if self._advance_requested:
+            raise ValueError("An advance is already pending")
+
+    @workflow.query
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "status": self._status,
+            "current_block": self._current_block,
+            "approval_granted": self._approval_granted,
+            "approval_note": self._approval_note,
+            "step_mode": self._step_mode,
+            "advance_requested": self._advance_requested,
+            "block_progress": self._block_progress,
+            "block_rollup": _rollup_block_metrics(self._block_metrics),
+            "history": self._history,
+        }
+
+    @workflow.query
+    def get_summary(self) -> dict[str, Any]:
+        """get_status without the history: constant size however long the run."""
+        return {
+            "status": self._status,
+            "current_block": self._current_block,
+            "approval_granted": self._approval_granted,
+            "step_mode": self._step_mode,
+            "advance_requested": self._advance_requested,
+            "block_progress": self._block_progress,
+            "block_rollup": _rollup_block_metrics(self._block_metrics),
+            "history_length": len(self._history),
+        }
+
+    @workflow.query
+    def get_history_since(self, start: int = 0) -> dict[str, Any]:
+        """History entries from index `start` on, for clients that already hold the rest."""
+        start = max(0, int(start))
+        return {
+            "start": start,
+            "history_length": len(self._history),
+            "entries": self._history[start:],
+        }
+
+    @workflow.run
+    async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        # F03-MH-08 scaffold: represent B1-B8 as durable activity executions.
+        self._status = "running"
+        blocks = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8"]
+        block_inputs = payload.get("block_inputs", {})
+        pr_loop_cfg = payload.get("pr_loop") if isinstance(payload.get("pr_loop"), dict) else {}
+        repo_root = str(payload.get("repo_root") or ".")
+        latency_profile = str(payload.get("latency_profile") or "")
+        heartbeat_timeout = timedelta(
+            seconds=int(
+                payload.get("block_heartbeat_timeout_seconds", DEFAULT_BLOCK_HEARTBEAT_TIMEOUT_SECONDS)
+            )
+        )
+        
+        # Track outputs to pass between blocks
+        block_outputs = {}
+
+        for block in blocks:
+            self._current_block = block
+            if self._step_mode:
+                self._status = "waiting_for_advance"
+                await workflow.wait_condition(lambda: self._advance_requested)
+                self._advance_requested = False
+                self._status = "running"
+                self._history.append(
+                    {
+                        "block": "step_advance",
+                        "status": "approved",
+                        "target_block": block,
+                        "note": self._advance_note,
+                    }
+                )
+            if block == "B7" and not self._approval_granted:
+                self._status = "waiting_for_approval"
+                await workflow.wait_condition(lambda: self._approval_granted)
+                self._status = "running"
+                self._history.append(
+                    {
+                        "block": "approval_gate",
+                        "status": "approved",
+                        "note": self._approval_note,
+                    }
+                )
+
+            # Merge initial inputs with outputs from previous blocks
+            input_data = {**block_inputs.get(block, {}), **block_outputs}
+            
+            block_started = workflow.now()
+            self._block_progress = {
+                "block": block,
+                "status": "running",
+                "tokens": 0,
+                "elapsed_seconds": 0.0,
+                "started_at": block_started.isoformat(),
+            }
+            result = await workflow.execute_activity(
+                execute_dogfood_block_activity,
+                {"block": block, "input": input_data, "latency_profile": latency_profile},
+                task_queue=_activity_task_queue(execute_dogfood_block_activity),
+                start_to_close_timeout=timedelta(seconds=120),
+                heartbeat_timeout=heartbeat_timeout if block in DOGFOOD_STREAMING_BLOCKS else None,
+                retry_policy=RetryPolicy(
+                    maximum_attempts=2,
+                    initial_interval=timedelta(seconds=1),
+                ),
+            )
+            block_seconds = (workflow.now() - block_started).total_seconds()
+            self._block_progress.update(status="complete", elapsed_seconds=round(block_seconds, 2))
+            result["metrics"] = self._record_block_metrics(block, block_started, result)
+            record_histogram(
+                workflow.metric_meter(),
+                DOGFOOD_BLOCK_DURATION_METRIC,
+                block_seconds,
+                {"block": block, "status": str(result.get("status", ""))},
+            )
+            self._history.append(result)
+            
+            # Store output for next block
+            if "output" in result:
+                block_outputs.update(result["output"])
+
+            if block == "B4":
+                pr_loop_started = workflow.now()
+                pr_loop_result = await workflow.execute_activity(
+                    run_pr_agent_loop_activity,
+                    {"repo_root": repo_root, "pr_loop": pr_loop_cfg},
+                    task_queue=_activity_task_queue(run_pr_agent_loop_activity),
+                    start_to_close_timeout=timedelta(seconds=240),
+                    heartbeat_timeout=timedelta(seconds=30),
+                    retry_policy=RetryPolicy(
+                        maximum_attempts=1,
+                        initial_interval=timedelta(seconds=1),
+                    ),
+                )
+                self._history.append(
+                    {
+                        "block": "PR_LOOP",
+                        "status": pr_loop_result.get("status"),
+                        "output": pr_loop_result,
+                        "metrics": self._record_block_metrics("PR_LOOP", pr_loop_started, pr_loop_result),
+                    }
+                )
+                if pr_loop_result.get("status") != "complete" and pr_loop_result.get("status") != "skipped":
+                    self._status = "failed"
+                    await workflow.wait_condition(workflow.all_handlers_finished)
+                    return {
+                        "status": "failed",
+                        "workflow": "DogfoodB1B8Workflow",
+                        "failure_phase": "pr_loop",
+                        "block_rollup": _rollup_block_metrics(self._block_metrics),
+                        "history": self._history,
+                    }
+
+                block_outputs["pr_loop_passed"] = bool(pr_loop_result.get("pr_loop_passed", True))
+                block_outputs["review_status"] = pr_loop_result.get("review_status", block_outputs.get("review_status", "pass"))
+                if pr_loop_result.get("head_sha"):
+                    block_outputs["head_sha"] = pr_loop_result.get("head_sha")
+
+        self._status = "complete"
+        # Let a pending advance_and_wait return its final entries first.
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        return {
+            "status": "complete",
+            "workflow": "DogfoodB1B8Workflow",
+            "latency_profile": _reported_latency_profile(self._history) or latency_profile,
+            "block_rollup": _rollup_block_metrics(self._block_metrics),
+            "history": self._history,
+            "block_count": len(self._history),
+        }
+
+    def _record_block_metrics(
+        self, block: str, scheduled_at: datetime, result: dict[str, Any]
+    ) -> dict[str, Any]:
+        completed_at = workflow.now()
+        timing = result.get("timing") if isinstance(result.get("timing"), dict) else {}
+        usage = result.get("llm_usage") if isinstance(result.get("llm_usage"), dict) else {}
+        metrics = {
+            "scheduled_at": scheduled_at.isoformat(),
+            "started_at": timing.get("started_at"),
+            "completed_at": completed_at.isoformat(),
+            "duration_seconds": round((completed_at - scheduled_at).total_seconds(), 3),
+            "attempts": int(timing.get("attempt", 1)),
+            "prompt_tokens": int(usage.get("prompt_tokens", 0)),
+            "completion_tokens": int(usage.get("completion_tokens", 0)),
+            "estimated_cost_usd": round(float(usage.get("estimated_cost_usd", 0.0)), 6),
+        }
+        self._block_metrics[block] = metrics
+        return metrics
+
+
+@workflow.defn
+class SelfBootstrapWorkflow:
+    def __init__(self) -> None:
+        self._approval_granted = False
+        self._approval_note = ""
+        self._docs_parity_granted = False
+        self._docs_parity_evidence_path = ""
+        self._current_step = "not-started"
+        self._status = "pending"
+        self._history: list[dict[str, Any]] = []
+        self._bundle_paths: dict[str, str] = {}
+
+    @workflow.signal
+    async def approve_resume(self, note: str = "") -> None:
+        self._approval_granted = True
+        self._approval_note = note
+
+    @workflow.signal
+    async def provide_docs_parity(self, evidence_path: str) -> None:
+        self._docs_parity_granted = True
+        self._docs_parity_evidence_path = evidence_path
+
+    @workflow.query
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "status": self._status,
+            "current_step": self._current_step,
+            "approval_granted": self._approval_granted,
+            "approval_note": self._approval_note,
+            "docs_parity_granted": self._docs_parity_granted,
+            "docs_parity_evidence_path": self._docs_parity_evidence_path,
+            "bundle_paths": self._bundle_paths,
+            "history": self._history,
+        }
+
+    @workflow.run
+    async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        self._status = "running"
+        workflow_id = str(payload.get("workflow_id") or workflow.info().workflow_id)
+        repo_root = str(payload.get("repo_root") or ".")
+        output_dir = str(payload.get("output_dir") or "screehshots_evidence")
+
+        self._current_step = "approval_gate"
+        if not self._approval_granted:
+            self._status = "waiting_for_approval"
+            await workflow.wait_condition(lambda: self._approval_granted)
+            self._status = "running"
+            self._history.append(
+                {
+                    "step": "approval_gate",
+                    "status": "approved",
+                    "note": self._approval_note,
+                }
+            )
+
+        self._current_step = "generate_bundle"
+        bundle_result = await workflow.execute_activity(
+            generate_change_bundle_stub_activity,
+            {
+                "workflow_id": workflow_id,
+                "repo_root": repo_root,
+                "output_dir": output_dir,
+                "docs_parity_evidence_path": self._docs_parity_evidence_path,
+            },
+            task_queue=_activity_task_queue(generate_change_bundle_stub_activity),
+            start_to_close_timeout=timedelta(seconds=20),
+            retry_policy=RetryPolicy(
+                maximum_attempts=2,
+                initial_interval=timedelta(seconds=1),
+            ),
+        )
+        self._bundle_paths = {
+            "bundle_json_path": str(bundle_result.get("bundle_json_path", "")),
+            "bundle_patch_path": str(bundle_result.get("bundle_patch_path", "")),
+        }
+        self._history.append({"step": "generate_bundle", "result": bundle_result})
+
+        self._current_step = "docs_parity_gate"
+        if not self._docs_parity_granted:
+            self._status = "waiting_for_docs_parity"
+            await workflow.wait_condition(lambda: self._docs_parity_granted)
+            self._status = "running"
+            self._history.append(
+                {
+                    "step": "docs_parity_gate",
+                    "status": "docs_parity_provided",
+                    "evidence_path": self._docs_parity_evidence_path,
+                }
+            )
+
+        self._current_step = "complete"
+        self._status = "complete"
+        return {
+            "status": "complete",
+            "workflow": "SelfBootstrapWorkflow",
+            "workflow_id": workflow_id,
+            "repo_root": repo_root,
+            "output_dir": output_dir,
+            "bundle_paths": self._bundle_paths,
+            "docs_parity_evidence_path": self._docs_parity_evidence_path,
+            "history": self._history,
+        }
+
+
+DEFAULT_MIGRATION_BATCH_SIZE = 100
+DEFAULT_MIGRATION_MAX_CONCURRENT_BATCHES = 4
+MIGRATION_WINDOW_MAX_CARRIED_ERRORS = 100
+
+
+def _count_load_outcomes(loaded_results: list[Any]) -> tuple[int, int]:
+    """(loaded, dry_run_skipped) counts of one set of load results."""
+    statuses = [item.get("status") for item in loaded_results if isinstance(item, dict)]
+    return statuses.count("loaded"), statuses.count("dry_run_skipped")
+
+
+@workflow.defn
+class MendixMigrationWorkflow:
+    def __init__(self) -> None:
+        self._batch_size = DEFAULT_MIGRATION_BATCH_SIZE
+        self._chunk_slots = asyncio.Semaphore(DEFAULT_MIGRATION_MAX_CONCURRENT_BATCHES)
+        self._audit_index: dict[str, dict[str, Any]] = {}
+        # Per-stage row checksums, only filled in checksum validation mode.
+        self._checksums: dict[str, Any] = {}
+
+    def _merge_checksum(self, stage: str, checksum: Any) -> None:
+        if checksum is not None:
+            self._checksums[stage] = merge_row_checksums(self._checksums.get(stage), checksum)
+
+    def _add_audit_rows(
+        self, records: list[Any], record_audit_rows: list[dict[str, Any]]
+    ) -> None:
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            row = {
+                "source_identifier": str(record.get("source_identifier") or record.get("source_id", "")),
+                "transform_status": "pending",
+                "load_status": "pending",
+                "error": "",
+            }
+            record_audit_rows.append(row)
+            self._audit_index[row["source_identifier"]] = row
+
+    async def _park_audit_rows(
+        self,
+        record_audit_rows: list[dict[str, Any]],
+        part_options: dict[str, Any],
+    ) -> str:
+        """Write one streamed chunk's audit rows to a JSONL part; the caller drops them."""
+        audit_part = await workflow.execute_activity(
+            write_migration_audit_part_activity,
+            {**part_options, "record_audit_rows": record_audit_rows},
+            task_queue=_activity_task_queue(write_migration_audit_part_activity),
+            start_to_close_timeout=timedelta(seconds=30),
+            retry_policy=RetryPolicy(
+                maximum_attempts=3,
+                initial_interval=timedelta(seconds=1),
+            ),
+        )
+        self._audit_index.clear()
+        return str(audit_part.get("path", ""))
+
+    def _chunked(self, records: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        return [
+            records[start : start + self._batch_size]
+            for start in range(0, len(records), self._batch_size)
+        ]
+
+    async def _transform_records(
+        self, records: list[Any], transform_options: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], int, int]:
+        """Transform records in concurrent batches.
+
+        Returns (transformed, unchanged_count, batch_count); rows the key index
+        reports as already loaded unchanged are not in `transformed`.
+        """
+        chunks = self._chunked([record for record in records if isinstance(record, dict)])
+
+        async def transform_chunk(chunk: list[dict[str, Any]]) -> dict[str, Any]:
+            async with self._chunk_slots:
+                try:
+                    return await workflow.execute_activity(
+                        transform_records_batch_activity,
+                        {"records": chunk, **transform_options},
+                        task_queue=_activity_task_queue(transform_records_batch_activity),
+                        start_to_close_timeout=timedelta(seconds=10 + len(chunk) // 100),
+                        retry_policy=RetryPolicy(
+                            maximum_attempts=3,
+                            initial_interval=timedelta(seconds=1),
+                        ),
+                    )
+                except Exception as error:
+                    return {
+                        "records": [],
+                        "failures": [
+                            {
+                                "source_identifier": str(
+                                    record.get("source_identifier") or record.get("source_id", "")
+                                ),
+                                "error": str(error),
+                            }
+                            for record in chunk
+                        ],
+                    }
+
+        transformed_records: list[dict[str, Any]] = []
+        unchanged_count = 0
+        chunk_results = await asyncio.gather(*(transform_chunk(chunk) for chunk in chunks))
+        for chunk_result in chunk_results:
+            checksums = chunk_result.get("checksums") or {}
+            self._merge_checksum("transform_keys", checksums.get("keys"))
+            self._merge_checksum("transform_rows", checksums.get("rows"))
+            self._merge_checksum("target", checksums.get("target"))
+            for unchanged in chunk_result.get("unchanged", []):
+                unchanged_count += 1
+                source_identifier = str(unchanged.get("source_identifier", ""))
+                if source_identifier in self._audit_index:
+                    self._audit_index[source_identifier]["transform_status"] = "success"
+                    self._audit_index[source_identifier]["load_status"] = "unchanged"
+            for transformed in chunk_result.get("records", []):
+                transformed_records.append(transformed)
+                source_identifier = str(transformed.get("source_identifier", ""))
+                if source_identifier in self._audit_index:
+                    self._audit_index[source_identifier]["transform_status"] = "success"
+            for failure in chunk_result.get("failures", []):
+                source_identifier = str(failure.get("source_identifier", ""))
+                if source_identifier in self._audit_index:
+                    self._audit_index[source_identifier]["transform_status"] = "failed"
+                    self._audit_index[source_identifier]["error"] = str(failure.get("error", ""))
+        return transformed_records, unchanged_count, len(chunks)
+
+    async def _load_records(
+        self, records: list[dict[str, Any]], load_options: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Bulk-load records in concurrent batches; returns (non-failed results, batch_count)."""
+        chunks = self._chunked(records)
+
+        async def load_chunk(chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            async with self._chunk_slots:
+                try:
+                    loaded_batch = await workflow.execute_activity(
+                        load_records_batch_activity,
+                        {"records": chunk, **load_options},
+                        task_queue=_activity_task_queue(load_records_batch_activity),
+                        start_to_close_timeout=timedelta(seconds=10 + len(chunk) // 100),
+                        retry_policy=RetryPolicy(
+                            maximum_attempts=3,
+                            initial_interval=timedelta(seconds=1),
+                        ),
+                    )
+                    self._merge_checksum(
+                        "target", (loaded_batch.get("checksums") or {}).get("target")
+                    )
+                    return list(loaded_batch.get("results", []))
+                except Exception as error:
+                    return [
+                        {
+                            "source_identifier": str(record.get("source_identifier", "")),
+                            "target_id": str(record.get("target_id", "")),
+                            "status": "failed",
+                            "write_performed": False,
+                            "error": str(error),
+                        }
+                        for record in chunk
+                    ]
+
+        loaded_results: list[dict[str, Any]] = []
+        batch_results = await asyncio.gather(*(load_chunk(chunk) for chunk in chunks))
+        for results in batch_results:
+            for loaded in results:
+                source_identifier = str(loaded.get("source_identifier", ""))
+                if loaded.get("status") != "failed":
+                    loaded_results.append(loaded)
+                if source_identifier in self._audit_index:
+                    self._audit_index[source_identifier]["load_status"] = str(
+                        loaded.get("status", "unknown")
+                    )
+                    if loaded.get("error"):
+                        self._audit_index[source_identifier]["error"] = str(loaded.get("error"))
+        return loaded_results, len(chunks)
+
+    @workflow.run
+    async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        migration_id = str(
+            payload.get("migration_id")
+            or payload.get("workflow_id")
+            or workflow.info().workflow_id
+        )
+        dry_run = bool(payload.get("dry_run", True))
+        repo_root = str(payload.get("repo_root") or ".")
+        output_dir = str(payload.get("output_dir") or "screehshots_evidence")
+        sample_verify_count = int(payload.get("sample_verify_count", 2))
+        latency_profile = str(payload.get("latency_profile") or "")
+        self._batch_size = max(1, int(payload.get("batch_size", DEFAULT_MIGRATION_BATCH_SIZE)))
+        self._chunk_slots = asyncio.Semaphore(
+            max(1, int(payload.get("max_concurrent_batches", DEFAULT_MIGRATION_MAX_CONCURRENT_BATCHES)))
+        )
+        incremental = bool(payload.get("incremental", False))
+        validation_mode = str(payload.get("validation_mode") or "sample").strip().lower()
+        with_checksums = validation_mode == "checksum"
+        transform_options = {
+            "latency_profile": latency_profile,
+            "incremental": incremental,
+            "checksums": with_checksums,
+            "repo_root": repo_root,
+            "load_target": payload.get("load_target") if isinstance(payload.get("load_target"), dict) else {},
+        }
+        load_options = {"dry_run": dry_run, **transform_options}
+        resume_from = str(payload.get("resume_from_checkpoint", "extract"))
+        allowed_resume = {"extract", "transform", "load", "validate"}
+        if resume_from not in allowed_resume:
+            resume_from = "extract"
+        streaming = (
+            str(payload.get("extract_mode", "")).strip().lower() == "streaming"
+            and resume_from == "extract"
+            and str(payload.get("source_mode", "")).strip().lower() != "connector"
+            and bool(str(payload.get("source_path") or "").strip())
+        )
+
+        window_size = max(0, int(payload.get("window_size", 0) or 0)) if streaming else 0
+        window_state = (
+            payload.get("window_state")
+            if window_size and isinstance(payload.get("window_state"), dict)
+            else {}
+        )
+        generation = int(window_state.get("generation", 0)) + 1
+        if isinstance(window_state.get("checksums"), dict):
+            self._checksums = dict(window_state["checksums"])
+        extraction_done = True
+
+        checkpoints: list[dict[str, Any]] = []
+        extraction_errors: list[str] = []
+        record_audit_rows: list[dict[str, Any]] = []
+        # Only the head of the transformed rows is shipped to validation, which
+        # samples at most 10 of them.
+        validation_sample: list[dict[str, Any]] = []
+        extracted_count = 0
+        transformed_count = 0
+        unchanged_count = 0
+        load_result_count = 0
+        loaded_count = 0
+        skipped_loads = 0
+        failed_loads = 0
+        audit_row_count = 0
+        extraction_error_count = 0
+        audit_part_paths: list[str] = []
+
+        if streaming:
+            # Workflow state stays bounded by one chunk: each chunk's audit rows
+            # are parked in a JSONL part on disk and its load results folded into
+            # running counts, so neither grows with the total record count.
+            if window_size:
+                audit_part_paths = [
+                    str(path)
+                    for path in (
+                        window_state.get("audit_part_paths")
+                        if isinstance(window_state.get("audit_part_paths"), list)
+                        else []
+                    )
+                ]
+            cursor = payload.get("extract_cursor") if isinstance(payload.get("extract_cursor"), dict) else {}
+            extract_request = {
+                key: payload[key]
+                for key in ("repo_root", "source_path", "source_format", "extract_chunk_size")
+                if key in payload
+            }
+            extract_request["checksums"] = with_checksums
+            extract_chunks = 0
+            transform_batches = 0
+            load_batches = 0
+            chunk_size = max(1, int(payload.get("extract_chunk_size", DEFAULT_EXTRACT_CHUNK_SIZE)))
+            while True:
+                if window_size:
+                    extract_request["extract_chunk_size"] = min(
+                        chunk_size, window_size - extracted_count
+                    )
+                extracted = await workflow.execute_activity(
+                    extract_mendix_records_chunk_activity,
+                    {**extract_request, "cursor": cursor},
+                    task_queue=_activity_task_queue(extract_mendix_records_chunk_activity),
+                    start_to_close_timeout=timedelta(seconds=60),
+                    retry_policy=RetryPolicy(
+                        maximum_attempts=3,
+                        initial_interval=timedelta(seconds=1),
+                    ),
+                )
+                chunk_records = (
+                    extracted.get("records")
+                    if isinstance(extracted.get("records"), list)
+                    else []
+                )
+                extract_chunks += 1
+                extracted_count += len(chunk_records)
+                self._merge_checksum("extract_keys", (extracted.get("checksums") or {}).get("keys"))
+                chunk_errors = extracted.get("errors") if isinstance(extracted.get("errors"), list) else []
+                extraction_error_count += len(chunk_errors)
+                extraction_errors = [*extraction_errors, *chunk_errors][:MIGRATION_WINDOW_MAX_CARRIED_ERRORS]
+                self._add_audit_rows(chunk_records, record_audit_rows)
+
+                transformed_chunk, chunk_unchanged, batch_count = await self._transform_records(
+                    chunk_records, transform_options
+                )
+                transform_batches += batch_count
+                transformed_count += len(transformed_chunk) + chunk_unchanged
+                unchanged_count += chunk_unchanged
+                validation_sample.extend(transformed_chunk[: 10 - len(validation_sample)])
+
+                loaded_chunk, batch_count = await self._load_records(transformed_chunk, load_options)
+                load_batches += batch_count
+                load_result_count += len(loaded_chunk)
+                chunk_loaded, chunk_skipped = _count_load_outcomes(loaded_chunk)
+                loaded_count += chunk_loaded
+                skipped_loads += chunk_skipped
+                failed_loads += len(
+                    [row for row in record_audit_rows if row.get("load_status") == "failed"]
+                )
+                audit_row_count += len(record_audit_rows)
+                if record_audit_rows:
+                    audit_part_paths.append(
+                        await self._park_audit_rows(
+                            record_audit_rows,
+                            {
+                                "migration_id": migration_id,
+                                "repo_root": repo_root,
+                                "output_dir": output_dir,
+                                "generation": generation,
+                                "part": extract_chunks,
+                            },
+                        )
+                    )
+                    record_audit_rows = []
+
+                cursor = extracted.get("next_cursor") if isinstance(extracted.get("next_cursor"), dict) else {}
+                extraction_done = bool(extracted.get("done")) or not chunk_records
+                if extraction_done or (window_size and extracted_count >= window_size):
+                    break
+
+            checkpoints.extend(
+                [
+                    {
+                        "stage": "extract",
+                        "status": "complete",
+                        "mode": "streaming",
+                        "record_count": extracted_count,
+                        "error_count": extraction_error_count,
+                        "chunk_count": extract_chunks,
+                        "cursor": cursor,
+                    },
+                    {
+                        "stage": "transform",
+                        "status": "complete",
+                        "record_count": transformed_count,
+                        "unchanged_count": unchanged_count,
+                        "batch_size": self._batch_size,
+                        "batch_count": transform_batches,
+                    },
+                    {
+                        "stage": "load",
+                        "status": "complete",
+                        "record_count": load_result_count,
+                        "batch_count": load_batches,
+                        "dry_run": dry_run,
+                    },
+                ]
+            )
+        else:
+            extracted_records: list[dict[str, Any]] = []
+            transformed_records: list[dict[str, Any]] = []
+            if resume_from == "extract":
+                extracted = await workflow.execute_activity(
+                    extract_mendix_records_activity,
+                    {**payload, "checksums": with_checksums},
+                    task_queue=_activity_task_queue(extract_mendix_records_activity),
+                    start_to_close_timeout=timedelta(seconds=20),
+                    retry_policy=RetryPolicy(
+                        maximum_attempts=3,
+                        initial_interval=timedelta(seconds=1),
+                    ),
+                )
+                extracted_records = (
+                    extracted.get("records")
+                    if isinstance(extracted.get("records"), list)
+                    else []
+                )
+                extraction_errors = (
+                    extracted.get("errors")
+                    if isinstance(extracted.get("errors"), list)
+                    else []
+                )
+                self._merge_checksum("extract_keys", (extracted.get("checksums") or {}).get("keys"))
+                checkpoints.append(
+                    {
+                        "stage": "extract",
+                        "status": "complete",
+                        "record_count": len(extracted_records),
+                        "error_count": len(extraction_errors),
+                    }
+                )
+            else:
+                checkpoints.append(
+                    {
+                        "stage": "extract",
+                        "status": "resumed",
+                        "resume_from_checkpoint": resume_from,
+                    }
+                )
+                source = payload.get("source") if isinstance(payload.get("source"), dict) else {}
+                records = source.get("records")
+                extracted_records = records if isinstance(records, list) else _default_migration_source_records()
+                extraction_errors = []
+
+            self._add_audit_rows(extracted_records, record_audit_rows)
+            extracted_count = len(extracted_records)
+
+            if resume_from in {"extract", "transform"}:
+                transformed_records, unchanged_count, batch_count = await self._transform_records(
+                    extracted_records, transform_options
+                )
+                checkpoints.append(
+                    {
+                        "stage": "transform",
+                        "status": "complete",
+                        "record_count": len(transformed_records) + unchanged_count,
+                        "unchanged_count": unchanged_count,
+                        "batch_size": self._batch_size,
+                        "batch_count": batch_count,
+                    }
+                )
+            else:
+                checkpoints.append(
+                    {
+                        "stage": "transform",
+                        "status": "resumed",
+                        "resume_from_checkpoint": resume_from,
+                    }
+                )
+                for record in extracted_records:
+                    if not isinstance(record, dict):
+                        continue
+                    transformed_records.append(
+                        {
+                            "source_identifier": str(record.get("source_identifier") or record.get("source_id", "")),
+                            "target_id": str(record.get("source_id", "")),
+                            "first_name": str(record.get("full_name", "")).split(" ")[0]
+                            if str(record.get("full_name", "")).strip()
+                            else "",
+                            "last_name": " ".join(str(record.get("full_name", "")).split(" ")[1:]),
+                            "email": str(record.get("email", "")).strip().lower(),
+                            "created_at": str(record.get("created_at", "")),
+                            "is_active": bool(record.get("active", True)),
+                        }
+                    )
+            transformed_count = len(transformed_records) + unchanged_count
+            validation_sample = transformed_records[:10]
+
+            if resume_from in {"extract", "transform", "load"}:
+                loaded_results, batch_count = await self._load_records(transformed_records, load_options)
+                loaded_count, skipped_loads = _count_load_outcomes(loaded_results)
+                checkpoints.append(
+                    {
+                        "stage": "load",
+                        "status": "complete",
+                        "record_count": len(loaded_results),
+                        "batch_count": batch_count,
+                        "dry_run": dry_run,
+                    }
+                )
+            else:
+                checkpoints.append(
+                    {
+                        "stage": "load",
+                        "status": "resumed",
+                        "resume_from_checkpoint": resume_from,
+                        "dry_run": dry_run,
+                    }
+                )
+
+            failed_loads = len(
+                [row for row in record_audit_rows if row.get("load_status") == "failed"]
+            )
+            audit_row_count = len(record_audit_rows)
+            extraction_error_count = len(extraction_errors)
+
+        if window_size:
+            # Windowed mode: fold this generation's counters into a compact
+            # running summary, and either continue as new from the cursor or
+            # fall through to validate/report over the totals.
+            counters = window_state.get("counters") if isinstance(window_state.get("counters"), dict) else {}
+            generation_counts = {
+                "extracted_count": extracted_count,
+                "transformed_count": transformed_count,
+                "loaded_count": loaded_count,
+                "skipped_loads": skipped_loads,
+                "unchanged_count": unchanged_count,
+                "failed_loads": failed_loads,
+                "extraction_error_count": extraction_error_count,
+                "audit_row_count": audit_row_count,
+            }
+            counters = {
+                key: int(counters.get(key, 0)) + value for key, value in generation_counts.items()
+            }
+            generations = [
+                *(window_state.get("generations") if isinstance(window_state.get("generations"), list) else []),
+                {"generation": generation, "record_count": extracted_count, "cursor": cursor},
+            ]
+            carried_errors = (
+                window_state.get("extraction_errors")
+                if isinstance(window_state.get("extraction_errors"), list)
+                else []
+            )
+            extraction_errors = [*carried_errors, *extraction_errors][:MIGRATION_WINDOW_MAX_CARRIED_ERRORS]
+            carried_sample = (
+                window_state.get("validation_sample")
+                if isinstance(window_state.get("validation_sample"), list)
+                else []
+            )
+            validation_sample = [*carried_sample, *validation_sample][:10]
+
+            if not extraction_done:
+                workflow.continue_as_new(
+                    {
+                        **payload,
+                        "migration_id": migration_id,
+                        "extract_cursor": cursor,
+                        "window_state": {
+                            "generation": generation,
+                            "counters": counters,
+                            "generations": generations,
+                            "audit_part_paths": audit_part_paths,
+                            "extraction_errors": extraction_errors,
+                            "validation_sample": validation_sample,
+                            "checksums": self._checksums,
+                        },
+                    }
+                )
+
+            extracted_count = counters["extracted_count"]
+            transformed_count = counters["transformed_count"]
+            loaded_count = counters["loaded_count"]
+            skipped_loads = counters["skipped_loads"]
+            unchanged_count = counters["unchanged_count"]
+            failed_loads = counters["failed_loads"]
+            extraction_error_count = counters["extraction_error_count"]
+            checkpoints.append(
+                {
+                    "stage": "window",
+                    "status": "complete",
+                    "window_size": window_size,
+                    "generation_count": generation,
+                    "generations": generations,
+                    "audit_row_count": counters["audit_row_count"],
+                    "extraction_error_count": counters["extraction_error_count"],
+                }
+            )
+
+        dry_run_guard_ok = (not dry_run) or loaded_count == 0
+
+        validation = await workflow.execute_activity(
+            validate_migration_activity,
+            {
+                "extracted_count": extracted_count,
+                "transformed_count": transformed_count,
+                "loaded_count": loaded_count,
+                "transformed_records": validation_sample,
+                "sample_verify_count": sample_verify_count,
+                "latency_profile": latency_profile,
+                "validation_mode": validation_mode,
+                **({"checksums": self._checksums} if with_checksums else {}),
+            },
+            task_queue=_activity_task_queue(validate_migration_activity),
+            start_to_close_timeout=timedelta(seconds=10),
+            retry_policy=RetryPolicy(
+                maximum_attempts=3,
+                initial_interval=timedelta(seconds=1),
+            ),
+        )
+        if validation.get("checksum_mismatched_bucket_ids"):
+            # Narrowing rescans the source, so it gets its own long, heartbeating activity.
+            narrowed = await workflow.execute_activity(
+                narrow_checksum_mismatches_activity,
+                {
+                    **transform_options,
+                    **{
+                        key: payload[key]
+                        for key in ("source_path", "source_format", "source_mode")
+                        if key in payload
+                    },
+                    "dry_run": dry_run,
+                    "buckets": validation["checksum_mismatched_bucket_ids"],
+                },
+                task_queue=_activity_task_queue(narrow_checksum_mismatches_activity),
+                start_to_close_timeout=timedelta(minutes=30),
+                heartbeat_timeout=timedelta(seconds=60),
+                retry_policy=RetryPolicy(
+                    maximum_attempts=2,
+                    initial_interval=timedelta(seconds=1),
+                ),
+            )
+            validation = {**validation, **narrowed}
+        checkpoints.append(
+            {
+                "stage": "validate",
+                "status": "complete",
+                "validation_mode": validation_mode,
+                "row_count_match": bool(validation.get("row_count_match", False)),
+            }
+        )
+
+        report_payload = {
+            "migration_id": migration_id,
+            "workflow": "MendixMigrationWorkflow",
+            "dry_run": dry_run,
+            "repo_root": repo_root,
+            "output_dir": output_dir,
+            "resume_from_checkpoint": resume_from,
+            "latency_profile": str(validation.get("latency_profile") or latency_profile),
+            "summary": {
+                "extracted_count": extracted_count,
+                "transformed_count": transformed_count,
+                "loaded_count": loaded_count,
+                "skipped_loads": skipped_loads,
+                "unchanged_count": unchanged_count,
+                "failed_loads": failed_loads,
+                "extraction_error_count": extraction_error_count,
+                "write_performed": not dry_run and loaded_count > 0,
+                "dry_run_guard_ok": dry_run_guard_ok,
+                "row_count_match": bool(validation.get("row_count_match", False)),
+                "sample_verified_count": int(validation.get("sample_verified_count", 0)),
+                **(
+                    {"checksum_match": bool(validation.get("checksum_match", False))}
+                    if with_checksums
+                    else {}
+                ),
+            },
+            "validation": validation,
+            "checkpoints": checkpoints,
+            "record_audit_rows": record_audit_rows,
+            "audit_part_paths": audit_part_paths,
+            "extraction_errors": extraction_errors,
+        }
+
+        report_result = await workflow.execute_activity(
+            write_migration_report_activity,
+            report_payload,
+            task_queue=_activity_task_queue(write_migration_report_activity),
+            start_to_close_timeout=timedelta(seconds=10),
+            retry_policy=RetryPolicy(
+                maximum_attempts=2,
+                initial_interval=timedelta(seconds=1),
+            ),
+        )
+        report_path = str(report_result.get("report_path", ""))
+
+        return {
+            "status": "complete",
+            "workflow": "MendixMigrationWorkflow",
+            "migration_id": migration_id,
+            "dry_run": dry_run,
+            "report_path": report_path,
+            "summary": report_payload["summary"],
+            "latency_profile": report_payload["latency_profile"],
+            "checkpoints": checkpoints,
+            "record_audit_rows": record_audit_rows,
+        }
+
+
+WORKFLOWS = [
+    SmokeWorkflow,
+    ExecutionWorkflow,
+    SimulationWorkflow,
+    DogfoodB1B8Workflow,
+    SelfBootstrapWorkflow,
+    MendixMigrationWorkflow,
+]